@@ -0,0 +1,31 @@
+"""
+Qt-freier Berechnungskern des BAK-Kalkulators
+
+- inputs: Normalisierte Eingaben und Cache-Schlüssel
+- parameters: Modell-Registry und Modellparameter je Person
+- curve: Vektorisierte Kurvenauswertung
+- summary: Kennzahlen einer Kurve
+- engine: Vollständige Berechnung je Modell und Stapelberechnung mehrerer Fälle
+- async_engine: Asynchrone Schnittstelle (Executor, begrenzte Parallelität)
+- server: Lokaler HTTP/JSON-Dienst (python -m bak_core.server)
+"""
+
+from .inputs import CalculationCase, cache_key, make_case
+from .parameters import (CompiledParameters, ModelParameters, ResorptionProfile, compile_parameters,
+                         register_model, registered_models, resolve_parameters)
+from .curve import contribution_arrays, evaluate_bac_window, single_drink_bac
+from .summary import CurveSummary, next_curve_point, summarize_curve
+from .engine import (calculate, calculate_cases, calculate_data, calculate_model, calculate_models,
+                     model_curve, refresh_results, results_valid_until)
+from .async_engine import AsyncEngine
+
+__all__ = [
+    "CalculationCase", "cache_key", "make_case",
+    "CompiledParameters", "ModelParameters", "ResorptionProfile", "compile_parameters",
+    "register_model", "registered_models", "resolve_parameters",
+    "contribution_arrays", "evaluate_bac_window", "single_drink_bac",
+    "CurveSummary", "next_curve_point", "summarize_curve",
+    "AsyncEngine",
+    "calculate", "calculate_cases", "calculate_data", "calculate_model", "calculate_models", "model_curve",
+    "refresh_results", "results_valid_until",
+]
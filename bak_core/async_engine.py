@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from bak_core.inputs import CalculationCase
+from bak_core.engine import calculate, calculate_cases
+
+# Asynchrone Schnittstelle zum Berechnungskern ohne Qt: Berechnungen laufen in
+# einem Executor (standardmäßig ein Prozesspool), die Event-Loop bleibt frei
+# für I/O. Höchstens max_concurrency Aufträge sind gleichzeitig im Executor;
+# calculate_many holt neue Fälle erst aus der Eingabe, wenn ein Platz frei
+# wird und der Aufrufer die bisherigen Ergebnisse abnimmt (Backpressure).
+# Mit dem eigenen Prozesspool muss das aufrufende Skript seinen Einstieg wie
+# üblich mit if __name__ == '__main__' schützen.
+#
+#     async with AsyncEngine() as engine:
+#         results = await engine.calculate(case)
+#         async for index, results in engine.calculate_many(cases):
+#             ...
+
+# Fälle, die calculate_many pro Auftrag gemeinsam auswertet
+DEFAULT_BATCH_SIZE = 8
+
+CaseSource = Union[Iterable[CalculationCase], AsyncIterable[CalculationCase]]
+
+async def _iterate(cases: CaseSource) -> AsyncIterator[CalculationCase]:
+    """Liest synchrone und asynchrone Quellen gleichermaßen"""
+    if hasattr(cases, '__aiter__'):
+        async for case in cases:
+            yield case
+    else:
+        for case in cases:
+            yield case
+
+class AsyncEngine:
+    """Berechnet Fälle asynchron in einem Executor mit begrenzter Parallelität
+
+    Ohne executor wird beim ersten Auftrag ein eigener Prozesspool mit
+    max_concurrency Workern angelegt und von close() wieder beendet; ein
+    übergebener Executor gehört dem Aufrufer.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncEngine':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # spawn statt fork: der aufrufende Prozess kann Threads haben
+            self._executor = ProcessPoolExecutor(max_workers=self.max_concurrency,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    async def _run(self, function, *args):
+        """Führt einen Auftrag im Executor aus, sobald ein Platz frei ist"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), function, *args)
+
+    async def calculate(self, case: CalculationCase, now: Optional[datetime] = None) -> Dict[str, Dict]:
+        """Berechnet alle Modelle eines Falls (Ergebnis wie bak_core.calculate)"""
+        return await self._run(calculate, case, now)
+
+    async def _calculate_chunk(self, first_index: int, cases: List[CalculationCase],
+                               now: Optional[datetime]) -> List[Tuple[int, Dict[str, Dict]]]:
+        results = await self._run(calculate_cases, cases, now)
+        return list(enumerate(results, first_index))
+
+    async def calculate_many(self, cases: CaseSource, now: Optional[datetime] = None,
+                             batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[Tuple[int, Dict[str, Dict]]]:
+        """Liefert (Index in der Eingabe, Ergebnis) in der Reihenfolge der Fertigstellung
+
+        Jeweils batch_size Fälle werden gemeinsam ausgewertet. Es laufen
+        höchstens max_concurrency Aufträge; weitere Fälle werden erst gelesen,
+        wenn ein Auftrag fertig ist und seine Ergebnisse abgenommen wurden.
+        Ein Fehler bricht die Iteration ab und verwirft offene Aufträge.
+        """
+        batch_size = max(1, batch_size)
+        source = _iterate(cases)
+        pending = set()
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_concurrency:
+                    chunk = []
+                    async for case in source:
+                        chunk.append(case)
+                        if len(chunk) >= batch_size:
+                            break
+                    else:
+                        exhausted = True
+                    if chunk:
+                        pending.add(asyncio.ensure_future(self._calculate_chunk(next_index, chunk, now)))
+                        next_index += len(chunk)
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for entry in task.result():
+                        yield entry
+        finally:
+            for task in pending:
+                task.cancel()
+            await source.aclose()
+
+    async def close(self):
+        """Beendet den eigenen Prozesspool"""
+        if self._owns_executor and self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+from models import Drink
+from bak_core.parameters import DEFAULT_RESORPTION, CompiledParameters, ResorptionProfile
+
+# Kurvenauswertung: Jedes Getränk steigt bis zu seinem Peak linear an und wird
+# danach linear mit der Abbaurate abgebaut; die Gesamtkurve ist die Summe der
+# Einzelkurven. Alle Auswertungen laufen vektorisiert über die Matrix
+# Getränke × Zeitpunkte, bei mehreren Modellen über Modelle × Getränke ×
+# Zeitpunkte.
+
+# Raster und Zeitraum der Ergebniskurve
+CURVE_STEP = timedelta(minutes=10)
+CURVE_LEAD = timedelta(hours=1)  # vor dem ersten Getränk
+CURVE_TAIL = timedelta(hours=12)  # nach dem letzten Getränk
+CURVE_MIN_AHEAD = timedelta(hours=6)  # mindestens bis jetzt + 6 h
+# Die Kurve endet beim ersten Punkt <= SOBER_BAC, der mehr als STOP_AFTER nach
+# dem letzten Getränk liegt
+SOBER_BAC = 0.001
+STOP_AFTER = timedelta(hours=2)
+
+# Zeitpunkte, die pro Block ausgewertet werden (bis zum Abbruchpunkt); bei
+# vielen Zeilen und Getränken wird der Block bis auf CURVE_MIN_CHUNK_POINTS
+# verkürzt, damit er höchstens CURVE_BLOCK_ELEMENTS Werte umfasst
+CURVE_CHUNK_POINTS = 256
+CURVE_MIN_CHUNK_POINTS = 16
+CURVE_BLOCK_ELEMENTS = 1 << 21
+
+def single_drink_bac(t: np.ndarray, consumption: np.ndarray, peak: np.ndarray, peak_bac: np.ndarray,
+                     resorption: np.ndarray, elimination_rate: float) -> np.ndarray:
+    """Vektorisierte Einzelgetränk-Kinetik (alle Zeiten in Stunden, Arrays broadcastbar)
+
+    Linearer Anstieg bis zur Peak-Zeit, danach linearer Abbau mit
+    elimination_rate.
+    """
+    since_consumption = t - consumption
+    since_peak = t - peak
+    rising = peak_bac * np.clip(since_consumption / resorption, 0.0, 1.0)
+    falling = np.maximum(0.0, peak_bac - elimination_rate * since_peak)
+    return np.where(since_consumption < 0, 0.0, np.where(since_peak <= 0, rising, falling))
+
+def contribution_arrays(drink_contributions: List[Dict], reference: datetime) -> Dict[str, np.ndarray]:
+    """Wandelt die Einzelgetränk-Daten in Spalten-Arrays (Zeiten in Stunden ab reference)"""
+    return {
+        'consumption': np.array([(c['consumption_time'] - reference).total_seconds() / 3600.0
+                                 for c in drink_contributions], dtype=float),
+        'peak': np.array([(c['peak_time'] - reference).total_seconds() / 3600.0
+                          for c in drink_contributions], dtype=float),
+        'peak_bac': np.array([c['peak_bac'] for c in drink_contributions], dtype=float),
+        'resorption': np.array([c['resorption_hours'] for c in drink_contributions], dtype=float),
+    }
+
+def _summed_bac(arrays: Dict[str, np.ndarray], t: np.ndarray, elimination_rate: float) -> np.ndarray:
+    """Summenkurve an den Zeitpunkten t (Stunden, relativ wie arrays)"""
+    contribution = single_drink_bac(
+        t[np.newaxis, :],
+        arrays['consumption'][:, np.newaxis],
+        arrays['peak'][:, np.newaxis],
+        arrays['peak_bac'][:, np.newaxis],
+        arrays['resorption'][:, np.newaxis],
+        elimination_rate
+    )
+    return contribution.sum(axis=0)
+
+def evaluate_bac_window(drink_contributions: List[Dict], elimination_rate: float,
+                        start: datetime, end: datetime, num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Wertet die Summenkurve vektorisiert nur im Zeitfenster [start, end] aus
+
+    Mit frei wählbarer Auflösung (z.B. passend zur Pixelbreite eines
+    gezoomten Diagramms). Gibt (Zeitpunkte als datetime64-Array, BAK-Werte)
+    zurück.
+    """
+    num_points = max(2, int(num_points))
+    span_seconds = max((end - start).total_seconds(), 0.0)
+    offsets = np.linspace(0.0, span_seconds, num_points)
+    times = np.datetime64(start, 'ms') + (offsets * 1000).astype('timedelta64[ms]')
+
+    if not drink_contributions:
+        return times, np.zeros(num_points)
+
+    # Zeiten in Stunden relativ zum Fensterbeginn
+    arrays = contribution_arrays(drink_contributions, start)
+    return times, _summed_bac(arrays, offsets / 3600.0, elimination_rate)
+
+def drink_contributions(drinks: Sequence[Drink], person_weight: float, r_factor: float,
+                        resorption: ResorptionProfile = DEFAULT_RESORPTION) -> List[Dict]:
+    """Peak-BAK, Peak-Zeit und Resorptionszeit jedes Getränks"""
+    contributions = []
+    for i, drink in enumerate(drinks):
+        alcohol_grams = drink.get_alcohol_grams()
+        hours = resorption.hours_for(alcohol_grams)
+        contributions.append({
+            'drink_index': i,
+            'alcohol_grams': alcohol_grams,
+            'consumption_time': drink.time,
+            'peak_bac': alcohol_grams / (person_weight * r_factor),
+            'peak_time': drink.time + timedelta(hours=hours),
+            'resorption_hours': hours
+        })
+    return contributions
+
+def model_arrays(drinks: Sequence[Drink], person_weight: float, compiled: CompiledParameters,
+                 reference: datetime) -> Dict[str, np.ndarray]:
+    """Einzelgetränk-Daten aller Modelle als Matrizen Modelle × Getränke (Stunden ab reference)"""
+    alcohol_grams = np.array([drink.get_alcohol_grams() for drink in drinks], dtype=float)
+    consumption = np.array([(drink.time - reference).total_seconds() / 3600.0 for drink in drinks], dtype=float)
+    resorption = compiled.resorption_hours(alcohol_grams)
+    consumption = np.broadcast_to(consumption, resorption.shape)
+    return {
+        'alcohol_grams': alcohol_grams,
+        'consumption': consumption,
+        'peak': consumption + resorption,
+        'peak_bac': alcohol_grams[np.newaxis, :] / (person_weight * compiled.r_factor[:, np.newaxis]),
+        'resorption': resorption,
+    }
+
+def model_contributions(drinks: Sequence[Drink], arrays: Dict[str, np.ndarray], row: int) -> List[Dict]:
+    """Einzelgetränk-Daten eines Modells (Zeile row) im Format von drink_contributions"""
+    alcohol_grams = arrays['alcohol_grams'].tolist()
+    peak_bacs = arrays['peak_bac'][row].tolist()
+    resorption = arrays['resorption'][row].tolist()
+    # Ein Profil hat nur wenige Resorptionszeiten
+    delays = {hours: timedelta(hours=hours) for hours in set(resorption)}
+    return [{
+        'drink_index': i,
+        'alcohol_grams': alcohol_grams[i],
+        'consumption_time': drink.time,
+        'peak_bac': peak_bacs[i],
+        'peak_time': drink.time + delays[resorption[i]],
+        'resorption_hours': resorption[i]
+    } for i, drink in enumerate(drinks)]
+
+def curve_range(drinks: Sequence[Drink], now: datetime) -> Tuple[datetime, datetime]:
+    """Zeitraum der Ergebniskurve (1 h vor dem ersten bis 12 h nach dem letzten Getränk)"""
+    first_drink_time = min(drink.time for drink in drinks)
+    last_drink_time = max(drink.time for drink in drinks)
+    return first_drink_time - CURVE_LEAD, max(now + CURVE_MIN_AHEAD, last_drink_time + CURVE_TAIL)
+
+def grid_points(start: datetime, end: datetime, step: timedelta = CURVE_STEP) -> int:
+    """Anzahl der Rasterpunkte von start bis end (einschließlich)"""
+    return int((end - start) // step) + 1 if end >= start else 0
+
+def first_stop_index(start: datetime, stop_after: datetime, step: timedelta = CURVE_STEP) -> int:
+    """Erster Rasterpunkt nach stop_after (ganzzahlig, ohne Rundungsfehler)"""
+    return (stop_after - start) // step + 1 if stop_after >= start else 0
+
+def stack_model_arrays(arrays_list: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Stapelt die Matrizen mehrerer Fälle zeilenweise
+
+    Fälle mit weniger Getränken werden mit leeren Getränken aufgefüllt
+    (Peak-BAK 0), die zu keinem Zeitpunkt etwas beitragen.
+    """
+    width = max((arrays['peak_bac'].shape[1] for arrays in arrays_list), default=0)
+    padding = {'consumption': 0.0, 'peak': 0.0, 'peak_bac': 0.0, 'resorption': 1.0}
+    stacked = {}
+    for name, fill in padding.items():
+        blocks = []
+        for arrays in arrays_list:
+            block = arrays[name]
+            if block.shape[1] < width:
+                block = np.hstack([block, np.full((block.shape[0], width - block.shape[1]), fill)])
+            blocks.append(block)
+        stacked[name] = np.vstack(blocks) if blocks else np.zeros((0, width))
+    return stacked
+
+def sample_curve(contributions: List[Dict], elimination_rate: float, start: datetime, end: datetime,
+                 stop_after: datetime, step: timedelta = CURVE_STEP) -> List[Tuple[datetime, float]]:
+    """Summenkurve eines Modells im festen Raster (siehe sample_model_curves)"""
+    arrays = {name: values[np.newaxis, :] for name, values in contribution_arrays(contributions, start).items()}
+    return sample_model_curves(arrays, np.array([elimination_rate], dtype=float), start, end, stop_after, step)[0]
+
+def sample_model_curves(arrays: Dict[str, np.ndarray], elimination_rates: np.ndarray, start: datetime,
+                        end: datetime, stop_after: datetime,
+                        step: timedelta = CURVE_STEP) -> List[List[Tuple[datetime, float]]]:
+    """Summenkurven aller Modelle im festen Raster von start bis end als (Zeit, BAK)-Paare
+
+    arrays enthält Matrizen Modelle × Getränke mit Zeiten in Stunden ab
+    start. Jede Kurve bricht nach ihrem ersten Punkt ab, der nach stop_after
+    liegt und höchstens SOBER_BAC beträgt.
+    """
+    rows = len(elimination_rates)
+    values = sample_rows(arrays, elimination_rates, np.full(rows, grid_points(start, end, step)),
+                         np.full(rows, first_stop_index(start, stop_after, step)), step)
+    return [[(start + k * step, value) for k, value in enumerate(row_values)] for row_values in values]
+
+def sample_rows(arrays: Dict[str, np.ndarray], elimination_rates: np.ndarray, total_points: np.ndarray,
+                first_stop: np.ndarray, step: timedelta = CURVE_STEP) -> List[List[float]]:
+    """Wertet jede Zeile (Modell eines Falls) in ihrem eigenen Raster aus
+
+    Zeile i hat total_points[i] Rasterpunkte k * step ab ihrem eigenen
+    Bezugszeitpunkt und endet nach dem ersten Punkt k >= first_stop[i] mit
+    höchstens SOBER_BAC. Ausgewertet wird blockweise und nur für Zeilen,
+    deren Kurve noch läuft, damit weit zurückliegende Getränke kein unnötig
+    langes Raster erzeugen.
+    """
+    values = [[] for _ in range(len(elimination_rates))]
+    drink_count = arrays['peak_bac'].shape[1]
+    active = np.flatnonzero(np.asarray(total_points) > 0)
+    if not drink_count:
+        return [[0.0] * int(points) for points in total_points]
+
+    step_hours = step.total_seconds() / 3600.0
+    columns = {name: arrays[name][:, :, np.newaxis] for name in ('consumption', 'peak', 'peak_bac', 'resorption')}
+    rates = np.asarray(elimination_rates, dtype=float)[:, np.newaxis, np.newaxis]
+    first = 0
+    while active.size:
+        # Blocklänge so wählen, dass der Block Zeilen × Getränke × Zeitpunkte begrenzt bleibt
+        chunk = max(CURVE_MIN_CHUNK_POINTS, min(CURVE_CHUNK_POINTS, CURVE_BLOCK_ELEMENTS // (active.size * drink_count)))
+        last = min(first + chunk, int(np.max(total_points[active])))
+        k = np.arange(first, last)
+        t = (k * step_hours)[np.newaxis, np.newaxis, :]
+        block = single_drink_bac(t, columns['consumption'][active], columns['peak'][active],
+                                 columns['peak_bac'][active], columns['resorption'][active],
+                                 rates[active]).sum(axis=1)
+        running = []
+        for row, index in enumerate(active):
+            available = int(total_points[index]) - first
+            stops = np.flatnonzero((block[row, :available] <= SOBER_BAC) & (k[:available] >= first_stop[index]))
+            if stops.size:
+                values[index].extend(block[row, :stops[0] + 1].tolist())
+            else:
+                values[index].extend(block[row, :available].tolist())
+                if available > len(k):
+                    running.append(index)
+        active = np.array(running, dtype=int)
+        first = last
+    return values
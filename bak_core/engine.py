@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from models import BAKModel, Drink, Person
+from bak_core.inputs import CalculationCase, make_case
+from bak_core.parameters import ModelParameters, compile_parameters, resolve_parameters
+from bak_core.curve import (CURVE_STEP, STOP_AFTER, curve_range, drink_contributions, first_stop_index,
+                            grid_points, model_arrays, model_contributions, sample_curve, sample_rows,
+                            stack_model_arrays)
+from bak_core.summary import CurveSummary, next_curve_point, summarize_curve
+
+def _time_fields(summary: CurveSummary, elimination_rate: float) -> Dict:
+    """Kennzahlen, die von der Uhrzeit abhängen (aktuelle BAK, Abbauzeit, Schwellenzeiten)"""
+    current_bac = summary.current_bac
+    return {
+        'current_bac': round(current_bac, 3),
+        'elimination_time': f"{(current_bac / elimination_rate):.1f} Stunden" if current_bac > 0 else "Bereits nüchtern",
+        'time_to_03': summary.time_to_05,
+        'time_to_00': summary.time_to_00,
+    }
+
+def _model_result(person: Person, drinks: Sequence[Drink], model: BAKModel, params: ModelParameters,
+                  contributions: List[Dict], bac_values: List[Tuple[datetime, float]], now: datetime) -> Dict:
+    """Ergebnis eines Modells: Kennzahlen, Kurve und Einzelgetränk-Beiträge"""
+    r_factor = params.r_factor
+    elimination_rate = params.elimination_rate
+    total_alcohol = sum(drink.get_alcohol_grams() for drink in drinks)
+    summary = summarize_curve(bac_values, now)
+    time_fields = _time_fields(summary, elimination_rate)
+    body_fat_factor = round(params.body_fat_factor, 3)
+
+    return {
+        'peak_bac': round(summary.peak_bac, 3),
+        'current_bac': time_fields['current_bac'],
+        'model': model.value,
+        'alcohol_grams': round(total_alcohol, 1),
+        'elimination_time': time_fields['elimination_time'],
+        'peak_time': summary.peak_time.strftime('%H:%M') if summary.peak_time else "N/A",
+        'time_to_03': time_fields['time_to_03'],
+        'time_to_00': time_fields['time_to_00'],
+        'elimination_rate': elimination_rate,
+        'r_factor': round(r_factor, 3),
+        'person_weight': person.weight,
+        'body_fat_factor': body_fat_factor,
+        'bac_values': bac_values,  # Für Diagramm
+        'drink_contributions': contributions,  # Rohdaten für Einzelgetränk-Tabelle und Zoom
+        'total_drinks': len(drinks),
+        'calculation_details': {
+            'zwischenschritt_1': f"Verteilungsvolumen = {person.weight} kg × {r_factor:.3f} = {person.weight * r_factor:.1f} L",
+            'zwischenschritt_2': f"Gesamtalkohol = {total_alcohol:.1f} g (Summe aller Getränke)",
+            'individual_peaks': f"{len(drinks)} Einzelgetränke mit separaten Resorptionskurven",
+            'körperfett_korrektur': f"Körperfett-Faktor = {body_fat_factor}"
+        }
+    }
+
+def _calculate_batch(items: Sequence[Tuple[Person, Sequence[Drink], Sequence[BAKModel]]],
+                     now: datetime) -> List[Dict[str, Dict]]:
+    """Berechnet mehrere Fälle (Person, Getränke, Modelle) in einer gemeinsamen Auswertung
+
+    Die Parameter aller Modelle werden über die Registry aufgelöst. Jede
+    Zeile der gemeinsamen Matrix ist ein Modell eines Falls; die Kurven
+    werden zusammen über Zeilen × Getränke × Zeitpunkte ausgewertet.
+    """
+    prepared = []
+    rows = []
+    for person, drinks, models in items:
+        compiled = compile_parameters(person, list(models))
+        if not compiled.models or not drinks:
+            prepared.append(None)
+            continue
+        start, end = curve_range(drinks, now)
+        last_drink_time = max(drink.time for drink in drinks)
+        arrays = model_arrays(drinks, person.weight, compiled, start)
+        prepared.append((person, drinks, compiled, arrays, start, len(rows)))
+        for rate in compiled.elimination_rate:
+            rows.append((rate, grid_points(start, end), first_stop_index(start, last_drink_time + STOP_AFTER)))
+
+    if rows:
+        stacked = stack_model_arrays([entry[3] for entry in prepared if entry is not None])
+        rates, total_points, first_stop = (np.array(column) for column in zip(*rows))
+        curves = sample_rows(stacked, rates, total_points, first_stop)
+
+    batch_results = []
+    for entry in prepared:
+        results = {}
+        if entry is not None:
+            person, drinks, compiled, arrays, start, first_row = entry
+            model_curves = curves[first_row:first_row + len(compiled.models)]
+            # Alle Modelle eines Falls teilen sich das Zeitraster
+            times = [start + k * CURVE_STEP for k in range(max(len(values) for values in model_curves))]
+            for row, (model, params) in enumerate(zip(compiled.models, compiled.parameters)):
+                contributions = model_contributions(drinks, arrays, row)
+                bac_values = list(zip(times, model_curves[row]))
+                results[model.value] = _model_result(person, drinks, model, params, contributions, bac_values, now)
+        batch_results.append(results)
+    return batch_results
+
+def calculate_models(person: Person, drinks: Sequence[Drink], models: Iterable[BAKModel],
+                     now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """Ergebnisse je Modellname; fehlerhafte Modelle werden ausgelassen"""
+    return _calculate_batch([(person, drinks, list(models))], now or datetime.now())[0]
+
+def calculate_model(person: Person, drinks: Sequence[Drink], model: BAKModel,
+                    now: Optional[datetime] = None) -> Dict:
+    """Ergebnis eines einzelnen Modells (ValueError, falls es nicht berechnet werden kann)"""
+    result = calculate_models(person, drinks, [model], now).get(model.value)
+    if result is None:
+        raise ValueError(f"Modell {model.value} konnte nicht berechnet werden")
+    return result
+
+def model_curve(person: Person, drinks: Sequence[Drink], model: BAKModel, start: datetime, end: datetime,
+                step: timedelta = CURVE_STEP) -> List[Tuple[datetime, float]]:
+    """Vollständige Kurve eines Modells im Raster von start bis end (ohne vorzeitigen Abbruch)"""
+    params = resolve_parameters(person, model)
+    contributions = drink_contributions(drinks, person.weight, params.r_factor, params.resorption)
+    return sample_curve(contributions, params.elimination_rate, start, end, stop_after=end, step=step)
+
+def calculate(case: CalculationCase, now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """Berechnet alle Modelle eines Falls"""
+    return calculate_models(case.person, case.drinks, case.settings.models, now)
+
+def calculate_cases(cases: Sequence[CalculationCase], now: Optional[datetime] = None) -> List[Dict[str, Dict]]:
+    """Berechnet mehrere Fälle gemeinsam (eine vektorisierte Auswertung für alle)"""
+    return _calculate_batch([(case.person, case.drinks, case.settings.models) for case in cases],
+                            now or datetime.now())
+
+def calculate_data(person_data: Dict, drinks_data: Iterable[Dict], settings_data: Dict,
+                   now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """Berechnet direkt aus den Eingabe-Dictionaries (ValueError bei unvollständigen Daten)"""
+    return calculate(make_case(person_data, drinks_data, settings_data), now)
+
+def refresh_results(results: Dict[str, Dict], now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """Bezieht gespeicherte Ergebnisse auf now, ohne neu zu rechnen
+
+    Kurve und Einzelgetränk-Beiträge werden übernommen; nur aktuelle BAK,
+    Abbauzeit und Schwellenzeiten werden aus der Kurve neu bestimmt.
+    """
+    now = now or datetime.now()
+    return {model: {**result, **_time_fields(summarize_curve(result['bac_values'], now),
+                                             result['elimination_rate'])}
+            for model, result in results.items()}
+
+def results_valid_until(results: Dict[str, Dict], now: datetime) -> Optional[datetime]:
+    """Bis zu diesem Zeitpunkt liefert refresh_results dieselben Werte wie für now (None: unbegrenzt)"""
+    points = [point for point in (next_curve_point(result['bac_values'], now) for result in results.values())
+              if point is not None]
+    return min(points) if points else None
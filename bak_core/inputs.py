@@ -0,0 +1,106 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from models import BAKModel, CalculationSettings, Drink, Gender, Person, ResorptionMode
+
+# Normalisierte Eingaben: Aus den Dictionaries der Oberfläche (bzw. einer
+# Sitzungsdatei oder Anfrage) werden Person, Drink und CalculationSettings.
+# Der Cache-Schlüssel hängt nur von den Feldern ab, die das Ergebnis
+# beeinflussen, und ist in Desktop, Stapelberichten und Diensten gleich.
+
+# Felder, von denen das Berechnungsergebnis abhängt; Änderungen an anderen
+# Feldern (z.B. Trinkgewohnheit) lösen keine Neuberechnung aus
+CALCULATION_PERSON_FIELDS = ('gender', 'age', 'height', 'weight', 'body_fat')
+CALCULATION_SETTINGS_FIELDS = ('models', 'meal_status', 'elimination_rate', 'manual_elimination_rate')
+
+# Modellnamen der Einstellungen
+MODEL_NAMES = {model.value: model for model in BAKModel}
+
+@dataclass(frozen=True)
+class CalculationCase:
+    """Normalisierte Eingaben einer Berechnung"""
+    person: Person
+    drinks: Tuple[Drink, ...]
+    settings: CalculationSettings
+
+def make_person(person_data: Dict) -> Person:
+    """Person aus den Personendaten"""
+    gender = Gender.MALE if person_data['gender'] == 'Männlich' else Gender.FEMALE
+    return Person(
+        gender=gender,
+        age=person_data['age'],
+        height=person_data['height'],
+        weight=person_data['weight'],
+        body_fat=person_data.get('body_fat', 20)
+    )
+
+def make_drink(drink_data: Dict) -> Drink:
+    """Drink aus den Getränkedaten"""
+    return Drink(
+        name=drink_data['name'],
+        volume=drink_data['volume'],
+        alcohol_content=drink_data['alcohol_content'],
+        time=drink_data['time']
+    )
+
+def selected_models(settings_data: Dict) -> List[BAKModel]:
+    """Ausgewählte Modelle (unbekannte Namen werden ignoriert)"""
+    return [MODEL_NAMES[name] for name in settings_data.get('models') or () if name in MODEL_NAMES]
+
+def make_settings(settings_data: Dict, gender: Gender) -> CalculationSettings:
+    """CalculationSettings aus den Einstellungen"""
+    resorption_mode = (ResorptionMode.FASTING if settings_data.get('meal_status') == 'Nüchtern'
+                       else ResorptionMode.WITH_FOOD)
+    elimination_rate = 0.15  # Standard
+    if settings_data.get('elimination_rate') == 'Auto (geschlechtsabhängig)':
+        elimination_rate = 0.17 if gender == Gender.MALE else 0.15
+    elif settings_data.get('manual_elimination_rate'):
+        elimination_rate = float(settings_data['manual_elimination_rate'])
+    return CalculationSettings(
+        models=selected_models(settings_data),
+        resorption_mode=resorption_mode,
+        elimination_rate=elimination_rate
+    )
+
+def inputs_complete(person_data: Dict, drinks_data: List[Dict], settings_data: Dict) -> bool:
+    """Prüft, ob Person, Getränke und mindestens ein Modell vorliegen"""
+    return bool(person_data and drinks_data and settings_data and settings_data.get('models'))
+
+def make_case(person_data: Dict, drinks_data: Iterable[Dict], settings_data: Dict) -> CalculationCase:
+    """Normalisiert die Eingaben (ValueError bei unvollständigen Daten)"""
+    drinks_data = list(drinks_data)
+    if not inputs_complete(person_data, drinks_data, settings_data):
+        raise ValueError("Unvollständige Daten: Person, Getränke und Modelle werden benötigt.")
+    person = make_person(person_data)
+    return CalculationCase(
+        person=person,
+        drinks=tuple(make_drink(d) for d in drinks_data),
+        settings=make_settings(settings_data, person.gender)
+    )
+
+def person_key(person_data: Dict) -> str:
+    """Teilschlüssel der Personendaten"""
+    return json.dumps({field: person_data.get(field) for field in CALCULATION_PERSON_FIELDS}, sort_keys=True)
+
+def settings_key(settings_data: Dict) -> str:
+    """Teilschlüssel der Einstellungen"""
+    return json.dumps({field: settings_data.get(field) for field in CALCULATION_SETTINGS_FIELDS}, sort_keys=True)
+
+def drink_key(drink_data: Dict) -> str:
+    """Schlüssel eines Getränks"""
+    return f"{drink_data['name']}|{drink_data['volume']}|{drink_data['alcohol_content']}|{drink_data['time'].isoformat()}"
+
+def drinks_key(drink_keys: Iterable[str]) -> str:
+    """Teilschlüssel der Getränkeliste aus den Getränkeschlüsseln"""
+    return hashlib.md5('\n'.join(drink_keys).encode()).hexdigest()
+
+def combine_key(person_part: str, settings_part: str, drinks_part: str) -> str:
+    """Cache-Schlüssel aus den drei Teilschlüsseln"""
+    return hashlib.md5(f"{person_part}#{settings_part}#{drinks_part}".encode()).hexdigest()
+
+def cache_key(person_data: Dict, drinks_data: Iterable[Dict], settings_data: Dict) -> str:
+    """Cache-Schlüssel einer Berechnung"""
+    return combine_key(person_key(person_data), settings_key(settings_data),
+                       drinks_key(drink_key(d) for d in drinks_data))
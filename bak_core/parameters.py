@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+
+from models import BAKModel, Gender, Person
+
+# Modell-Registry: Jedes BAKModel trägt eine Funktion bei, die eine Person auf
+# ihre Parameter abbildet (Verteilungsfaktor r, Abbaurate, Resorptionsprofil).
+# Der Auswerter kennt keine Modelle, sondern verarbeitet nur diese Parameter;
+# compile_parameters legt sie für mehrere Modelle als Arrays ab, sodass alle
+# Modelle gemeinsam vektorisiert berechnet werden. Ein neues Modell braucht
+# nur eine registrierte Parameterfunktion.
+
+@dataclass(frozen=True)
+class ResorptionProfile:
+    """Resorptionszeit eines Getränks in Abhängigkeit von seiner Alkoholmenge
+
+    Ein Getränk mit höchstens limits[i] Gramm braucht hours[i] Stunden bis
+    zum Peak; oberhalb des letzten Grenzwerts gilt hours[-1].
+    """
+    limits: Tuple[float, ...] = (10.0, 20.0)  # g
+    hours: Tuple[float, ...] = (0.5, 0.75, 1.0)  # 30, 45 und 60 Minuten
+
+    def hours_for(self, alcohol_grams: float) -> float:
+        for limit, hours in zip(self.limits, self.hours):
+            if alcohol_grams <= limit:
+                return hours
+        return self.hours[-1]
+
+    def hours_array(self, alcohol_grams: np.ndarray) -> np.ndarray:
+        """Resorptionszeiten für ein Array von Alkoholmengen"""
+        return np.asarray(self.hours, dtype=float)[np.searchsorted(self.limits, alcohol_grams, side='left')]
+
+DEFAULT_RESORPTION = ResorptionProfile()
+
+@dataclass(frozen=True)
+class ModelParameters:
+    """Aufgelöste Parameter eines Modells für eine Person"""
+    r_factor: float
+    elimination_rate: float  # in ‰/h
+    body_fat_factor: float
+    resorption: ResorptionProfile = DEFAULT_RESORPTION
+
+ParameterFunction = Callable[[Person], ModelParameters]
+
+_registry: Dict[BAKModel, ParameterFunction] = {}
+
+def register_model(model: BAKModel):
+    """Dekorator: registriert die Parameterfunktion eines Modells"""
+    def decorator(function: ParameterFunction) -> ParameterFunction:
+        _registry[model] = function
+        return function
+    return decorator
+
+def registered_models() -> List[BAKModel]:
+    """Modelle mit registrierter Parameterfunktion (in Registrierungsreihenfolge)"""
+    return list(_registry)
+
+def body_fat_factor(person: Person) -> float:
+    """Körperfett-Korrektur (1.0 bei 20 % Körperfett)"""
+    return 1.0 - (person.body_fat - 20) * 0.01
+
+def _by_gender(person: Person, male: float, female: float) -> float:
+    return male if person.gender == Gender.MALE else female
+
+@register_model(BAKModel.WIDMARK)
+def widmark_parameters(person: Person) -> ModelParameters:
+    """Klassische Widmark-Formel"""
+    return ModelParameters(_by_gender(person, 0.68, 0.55), _by_gender(person, 0.15, 0.13), body_fat_factor(person))
+
+@register_model(BAKModel.WATSON)
+def watson_parameters(person: Person) -> ModelParameters:
+    """Watson-Modell mit Total Body Water"""
+    if person.gender == Gender.MALE:
+        tbw = 2.447 - (0.09516 * person.age) + (0.1074 * person.height) + (0.3362 * person.weight)
+    else:
+        tbw = -2.097 + (0.1069 * person.height) + (0.2466 * person.weight)
+    return ModelParameters(tbw / person.weight, _by_gender(person, 0.16, 0.14), body_fat_factor(person))
+
+@register_model(BAKModel.FORREST)
+def forrest_parameters(person: Person) -> ModelParameters:
+    """Forrest-Modell mit Alterskorrektur"""
+    age_factor = max(0.5, 1 - 0.01 * max(0, person.age - 20))  # 1% Reduktion pro Jahr ab 20
+    return ModelParameters(_by_gender(person, 0.68, 0.55) * age_factor, _by_gender(person, 0.17, 0.15),
+                           body_fat_factor(person))
+
+@register_model(BAKModel.SEIDL)
+def seidl_parameters(person: Person) -> ModelParameters:
+    """Seidl-Modell mit BMI und Körperfett-Korrektur"""
+    bmi = person.weight / ((person.height / 100) ** 2)
+    bmi_factor = 1.0 + (bmi - 25) * 0.005  # Leichte BMI-Korrektur
+    fat_factor = body_fat_factor(person)
+    return ModelParameters(_by_gender(person, 0.70, 0.58) * bmi_factor * fat_factor, _by_gender(person, 0.18, 0.16),
+                           fat_factor)
+
+def resolve_parameters(person: Person, model: BAKModel) -> ModelParameters:
+    """Parameter eines Modells (nicht registrierte Modelle rechnen wie Widmark)"""
+    return _registry.get(model, widmark_parameters)(person)
+
+@dataclass(frozen=True)
+class CompiledParameters:
+    """Parameter mehrerer Modelle als Arrays (eine Zeile je Modell)"""
+    models: Tuple[BAKModel, ...]
+    parameters: Tuple[ModelParameters, ...]
+    r_factor: np.ndarray
+    elimination_rate: np.ndarray
+
+    def resorption_hours(self, alcohol_grams: np.ndarray) -> np.ndarray:
+        """Resorptionszeiten als Matrix Modelle × Getränke"""
+        if not self.models:
+            return np.zeros((0, len(alcohol_grams)))
+        return np.vstack([params.resorption.hours_array(alcohol_grams) for params in self.parameters])
+
+def compile_parameters(person: Person, models: Sequence[BAKModel]) -> CompiledParameters:
+    """Löst die Parameter aller Modelle auf; fehlerhafte Modelle werden ausgelassen"""
+    resolved = []
+    for model in models:
+        try:
+            params = resolve_parameters(person, model)
+            if not person.weight * params.r_factor > 0:
+                raise ValueError(f"Ungültiges Verteilungsvolumen ({person.weight} kg × {params.r_factor})")
+            resolved.append((model, params))
+        except Exception as e:
+            print(f"Fehler bei Modell {model}: {e}")
+    return CompiledParameters(
+        models=tuple(model for model, _ in resolved),
+        parameters=tuple(params for _, params in resolved),
+        r_factor=np.array([params.r_factor for _, params in resolved], dtype=float),
+        elimination_rate=np.array([params.elimination_rate for _, params in resolved], dtype=float),
+    )
+
+def resorption_hours(alcohol_grams: float) -> float:
+    """Resorptionszeit eines Getränks nach dem Standardprofil"""
+    return DEFAULT_RESORPTION.hours_for(alcohol_grams)
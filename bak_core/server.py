@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Lokaler HTTP/JSON-Dienst für BAK-Berechnungen
+
+Nimmt Berechnungen per POST /calculate entgegen und beantwortet sie mit den
+Ergebnissen von bak_core. Anfragen, die innerhalb weniger Millisekunden
+eintreffen, werden zu einem Stapel gebündelt und in einem Prozesspool in
+einer gemeinsamen vektorisierten Auswertung berechnet. Ergebnisse werden
+unter demselben Cache-Schlüssel wie im Desktop-Cache zwischengespeichert;
+die zeitabhängigen Kennzahlen (aktuelle BAK, Schwellenzeiten) einer
+gecachten Antwort werden bezogen auf die aktuelle Uhrzeit erneuert.
+
+Verwendung:
+    python -m bak_core.server --port 8765 --workers 2
+
+Anfrage:
+    POST /calculate
+    {"person_data": {...}, "drinks_data": [{"name": ..., "volume": ...,
+     "alcohol_content": ..., "time": "2024-01-01T20:00:00"}, ...],
+     "settings_data": {"models": ["Widmark", ...], ...}}
+
+Weitere Endpunkte: GET /health, GET /stats
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from bak_core.inputs import CALCULATION_PERSON_FIELDS, CalculationCase, cache_key, make_case
+from bak_core.engine import calculate_cases, refresh_results, results_valid_until
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Sammelfenster und maximale Größe eines Stapels
+BATCH_WINDOW = 0.005  # Sekunden
+BATCH_MAX = 64
+
+# Anzahl zwischengespeicherter Antworten (FIFO wie im Desktop-Cache)
+CACHE_LIMIT = 1000
+
+# Maximale Größe eines Anfrage-Rumpfs
+MAX_BODY_BYTES = 1 << 20
+
+# Personenfelder, die als Zahl vorliegen müssen
+NUMERIC_PERSON_FIELDS = tuple(field for field in CALCULATION_PERSON_FIELDS if field != 'gender')
+
+# Personenfelder, die größer als 0 sein müssen (sonst entfallen Modelle stillschweigend)
+POSITIVE_PERSON_FIELDS = ('height', 'weight')
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error',
+}
+
+def _json_default(value: Any) -> Any:
+    """Zeitpunkte als ISO-Text, numpy-Skalare als Python-Zahlen"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+def _encode(payload: Dict) -> bytes:
+    return json.dumps(payload, default=_json_default, ensure_ascii=False).encode('utf-8')
+
+def _parse_time(value: Any) -> datetime:
+    """Zeitpunkt eines Getränks (ISO-Format oder TT.MM.JJJJ HH:MM)"""
+    if not isinstance(value, str):
+        raise ValueError(f"Ungültiger Zeitpunkt: {value!r}")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            return datetime.strptime(value, '%d.%m.%Y %H:%M')
+        except ValueError:
+            raise ValueError(f"Ungültiger Zeitpunkt: {value!r}") from None
+
+def parse_request(payload: Any) -> Tuple[str, CalculationCase]:
+    """Normalisiert eine Anfrage zu (Cache-Schlüssel, Fall); ValueError bei ungültigen Daten"""
+    if not isinstance(payload, dict):
+        raise ValueError("Anfrage muss ein JSON-Objekt sein")
+    person_data = payload.get('person_data')
+    settings_data = payload.get('settings_data')
+    drinks = payload.get('drinks_data')
+    if not isinstance(person_data, dict) or not isinstance(settings_data, dict) or not isinstance(drinks, list):
+        raise ValueError("person_data, drinks_data und settings_data werden benötigt")
+    for field in NUMERIC_PERSON_FIELDS:
+        value = person_data.get(field, 20 if field == 'body_fat' else None)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"person_data.{field} muss eine Zahl sein")
+        if field in POSITIVE_PERSON_FIELDS and value <= 0:
+            raise ValueError(f"person_data.{field} muss größer als 0 sein")
+    try:
+        # Getränke wie im Desktop normalisieren, damit die Schlüssel übereinstimmen
+        drinks_data = [{
+            'name': str(drink.get('name', '')),
+            'volume': float(drink['volume']),
+            'alcohol_content': float(drink['alcohol_content']),
+            'time': _parse_time(drink.get('time')),
+        } for drink in drinks]
+        case = make_case(person_data, drinks_data, settings_data)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Ungültige Anfrage: {e}") from None
+    return cache_key(person_data, drinks_data, settings_data), case
+
+def evaluate_batch(cases: Sequence[CalculationCase], now: datetime) -> List[Tuple[bool, Any]]:
+    """Berechnet einen Stapel gemeinsam und kodiert jede Antwort (läuft im Worker)
+
+    Schlägt die gemeinsame Auswertung fehl, werden die Fälle einzeln
+    berechnet, damit ein fehlerhafter Fall nicht den ganzen Stapel trifft.
+    Gibt je Fall (True, (Ergebnisse, JSON-Antwort)) bzw. (False, Fehlermeldung) zurück.
+    """
+    try:
+        return [(True, (results, _encode({'results': results}))) for results in calculate_cases(cases, now)]
+    except Exception:
+        if len(cases) == 1:
+            raise
+    outcomes = []
+    for case in cases:
+        try:
+            results = calculate_cases([case], now)[0]
+            outcomes.append((True, (results, _encode({'results': results}))))
+        except Exception as e:
+            outcomes.append((False, str(e).encode('utf-8')))
+    return outcomes
+
+def _init_worker():
+    """Lädt den Berechnungskern einmal pro Worker-Prozess"""
+    import bak_core  # noqa: F401
+
+class CalculationService:
+    """Bündelt Anfragen zu Stapeln, berechnet sie im Executor und cacht die Antworten
+
+    Gleichzeitige Anfragen mit demselben Schlüssel warten auf dieselbe
+    Berechnung. Höchstens max_batches Stapel laufen gleichzeitig; weitere
+    Anfragen sammeln sich solange im nächsten Stapel.
+
+    Der Cache hält je Schlüssel die Ergebnisse, die kodierte Antwort und
+    den nächsten Kurvenpunkt, bis zu dem die zeitabhängigen Kennzahlen der
+    Antwort gelten. Danach wird die Antwort aus der gespeicherten Kurve neu
+    kodiert, ohne zu rechnen.
+    """
+
+    def __init__(self, executor: Optional[Executor], max_batches: int = 1, batch_window: float = BATCH_WINDOW,
+                 batch_max: int = BATCH_MAX, cache_limit: int = CACHE_LIMIT):
+        self.executor = executor
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.cache_limit = cache_limit
+        self.cache: Dict[str, Tuple[Dict, bytes, Optional[datetime]]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._batch: List[Tuple[str, CalculationCase]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._slots = asyncio.Semaphore(max(1, max_batches))
+        self._tasks = set()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'shared': 0, 'batches': 0, 'batched_cases': 0,
+                      'errors': 0, 'compute_seconds': 0.0}
+
+    async def calculate(self, payload: Any) -> Tuple[bytes, str]:
+        """Antwort einer Anfrage als (JSON-Bytes, Cache-Status hit/shared/miss)"""
+        self.stats['requests'] += 1
+        key, case = parse_request(payload)
+        if key in self.cache:
+            self.stats['cache_hits'] += 1
+            return self._cached_response(key), 'hit'
+        if key in self._in_flight:
+            self.stats['shared'] += 1
+            return await asyncio.shield(self._in_flight[key]), 'shared'
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self._batch.append((key, case))
+        if len(self._batch) >= self.batch_max:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future), 'miss'
+
+    def _cached_response(self, key: str) -> bytes:
+        """Gecachte Antwort, bei Bedarf auf die aktuelle Uhrzeit bezogen"""
+        results, body, valid_until = self.cache[key]
+        now = datetime.now()
+        if valid_until is None or now < valid_until:
+            return body
+        body = _encode({'results': refresh_results(results, now)})
+        self.cache[key] = (results, body, results_valid_until(results, now))
+        return body
+
+    def _flush(self):
+        """Startet die Berechnung des gesammelten Stapels"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, CalculationCase]]):
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            started = time.perf_counter()
+            now = datetime.now()
+            try:
+                outcomes = await loop.run_in_executor(self.executor, evaluate_batch,
+                                                    [case for _, case in batch], now)
+            except Exception as e:
+                self.stats['errors'] += len(batch)
+                for key, _ in batch:
+                    future = self._in_flight.pop(key)
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            finally:
+                self.stats['compute_seconds'] += time.perf_counter() - started
+        self.stats['batches'] += 1
+        self.stats['batched_cases'] += len(batch)
+        for (key, _), (success, outcome) in zip(batch, outcomes):
+            future = self._in_flight.pop(key)
+            if success:
+                results, body = outcome
+                self._update_cache(key, (results, body, results_valid_until(results, now)))
+                if not future.done():
+                    future.set_result(body)
+            else:
+                self.stats['errors'] += 1
+                if not future.done():
+                    future.set_exception(RuntimeError(outcome.decode('utf-8')))
+
+    def _update_cache(self, key: str, entry: Tuple[Dict, bytes, Optional[datetime]]):
+        """Aktualisiert den Cache (FIFO: älteste Antwort fliegt zuerst)"""
+        if len(self.cache) >= self.cache_limit:
+            del self.cache[next(iter(self.cache))]
+        self.cache[key] = entry
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats['cache_size'] = len(self.cache)
+        stats['mean_batch_size'] = stats['batched_cases'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Liest eine HTTP/1.1-Anfrage (None bei geschlossener Verbindung)"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise ValueError("Ungültige Anfragezeile")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_BYTES:
+        raise OverflowError
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+def _response(status: int, body: bytes, keep_alive: bool, extra_headers: Optional[Dict[str, str]] = None) -> bytes:
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+        **(extra_headers or {}),
+    }
+    head = f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return head.encode('latin-1') + b'\r\n' + body
+
+def _error(message: str) -> bytes:
+    return _encode({'error': message})
+
+async def _dispatch(service: CalculationService, method: str, path: str, body: bytes) -> Tuple[int, bytes, Dict]:
+    """Ordnet eine Anfrage ihrem Endpunkt zu: (Status, Rumpf, zusätzliche Header)"""
+    if path == '/calculate':
+        if method != 'POST':
+            return 405, _error("Nur POST erlaubt"), {}
+        try:
+            payload = json.loads(body)
+            response, cache_state = await service.calculate(payload)
+        except ValueError as e:  # auch json.JSONDecodeError
+            return 400, _error(str(e)), {}
+        except Exception as e:
+            return 500, _error(f"Berechnung fehlgeschlagen: {e}"), {}
+        return 200, response, {'X-Cache': cache_state}
+    if path == '/health':
+        return 200, _encode({'status': 'ok'}), {}
+    if path == '/stats':
+        return 200, _encode(service.get_stats()), {}
+    return 404, _error(f"Unbekannter Pfad: {path}"), {}
+
+async def handle_connection(service: CalculationService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+    """Beantwortet die Anfragen einer (keep-alive) Verbindung nacheinander"""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except OverflowError:
+                writer.write(_response(413, _error("Anfrage zu groß"), keep_alive=False))
+                break
+            except (ValueError, asyncio.IncompleteReadError):
+                writer.write(_response(400, _error("Ungültige HTTP-Anfrage"), keep_alive=False))
+                break
+            if request is None:
+                break
+            method, path, headers, body = request
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            status, response, extra_headers = await _dispatch(service, method, path, body)
+            writer.write(_response(status, response, keep_alive, extra_headers))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                batch_window: float = BATCH_WINDOW, batch_max: int = BATCH_MAX, cache_limit: int = CACHE_LIMIT):
+    """Startet den Dienst und läuft bis zum Abbruch
+
+    workers=0 berechnet im Thread-Pool des Prozesses statt in einem
+    Prozesspool (z.B. für Tests).
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    executor = None
+    if workers > 0:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker)
+    service = CalculationService(executor, max(1, workers), batch_window, batch_max, cache_limit)
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    print(f"BAK-Dienst läuft auf http://{host}:{port} ({workers or 'keine'} Worker-Prozesse)", flush=True)
+    # SIGTERM beendet den Dienst geordnet, damit auch die Worker-Prozesse enden
+    stopped = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows
+    try:
+        async with server:
+            await stopped.wait()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def main(argv=None) -> int:
+    """Einstiegspunkt des Dienstes"""
+    parser = argparse.ArgumentParser(description="Lokaler HTTP/JSON-Dienst für BAK-Berechnungen")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Adresse (Standard: nur lokal)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker-Prozesse für die Berechnung (Standard: Anzahl CPUs, 0 = im Prozess)")
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW * 1000,
+                        help="Sammelfenster eines Stapels in Millisekunden")
+    parser.add_argument('--batch-max', type=int, default=BATCH_MAX, help="Maximale Anzahl Fälle pro Stapel")
+    parser.add_argument('--cache-limit', type=int, default=CACHE_LIMIT, help="Anzahl zwischengespeicherter Antworten")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window / 1000.0,
+                          max(1, args.batch_max), max(1, args.cache_limit)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
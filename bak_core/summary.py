@@ -0,0 +1,47 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+import numpy as np
+
+# Schwellen der Zeitangaben (‰)
+DRIVING_LIMIT_BAC = 0.5
+PRACTICALLY_SOBER_BAC = 0.05
+
+@dataclass(frozen=True)
+class CurveSummary:
+    """Kennzahlen einer BAK-Kurve bezogen auf den Zeitpunkt now"""
+    current_bac: float
+    peak_bac: float
+    peak_time: Optional[datetime]
+    time_to_05: Optional[datetime]  # erster Zeitpunkt nach now mit <= 0.5 ‰
+    time_to_00: Optional[datetime]  # erster Zeitpunkt nach now mit <= 0.05 ‰
+
+def summarize_curve(bac_values: List[Tuple[datetime, float]], now: datetime) -> CurveSummary:
+    """Aktuelle BAK, Peak und Zeiten bis 0.5 ‰ bzw. praktisch nüchtern"""
+    if not bac_values:
+        return CurveSummary(0.0, 0.0, None, None, None)
+    times = [t for t, _ in bac_values]
+    values = np.fromiter((v for _, v in bac_values), dtype=float, count=len(bac_values))
+
+    # Die Kurve ist zeitlich sortiert: Punkte bis now liegen vor future
+    future = bisect_right(times, now)
+    current_bac = float(values[future - 1]) if future else 0.0
+
+    # argmax liefert das erste Maximum
+    peak_index = int(np.argmax(values))
+    peak_bac = float(values[peak_index])
+    peak_time = times[peak_index] if peak_bac > 0.0 else None
+    peak_bac = max(peak_bac, 0.0)
+
+    def first_future(threshold: float) -> Optional[datetime]:
+        below = np.flatnonzero(values[future:] <= threshold)
+        return times[future + int(below[0])] if below.size else None
+
+    return CurveSummary(current_bac, peak_bac, peak_time,
+                        first_future(DRIVING_LIMIT_BAC), first_future(PRACTICALLY_SOBER_BAC))
+
+def next_curve_point(bac_values: List[Tuple[datetime, float]], now: datetime) -> Optional[datetime]:
+    """Erster Kurvenpunkt nach now; bis dahin liefert summarize_curve dieselben Werte"""
+    future = bisect_right([t for t, _ in bac_values], now)
+    return bac_values[future][0] if future < len(bac_values) else None
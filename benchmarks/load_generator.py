@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Lastgenerator für den lokalen BAK-Dienst (bak_core.server)
+
+Schickt über mehrere gleichzeitige keep-alive-Verbindungen Berechnungen an
+POST /calculate und misst Durchsatz und Latenzen. Mit --spawn-server wird
+der Dienst für die Messung selbst gestartet und danach beendet.
+
+Verwendung:
+    python benchmarks/load_generator.py --spawn-server --requests 2000 --concurrency 32
+    python benchmarks/load_generator.py --port 8765 --distinct 50 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+REPORT_VERSION = 1
+
+# Wartezeit auf einen selbst gestarteten Dienst
+STARTUP_TIMEOUT = 30.0
+
+def _scripted_case(rng: random.Random, drink_count: int, now: datetime) -> Dict:
+    """Erzeugt eine reproduzierbare Anfrage mit zufälliger Person und Getränken"""
+    presets = [
+        ('Bier (Pils)', 500.0, 4.8),
+        ('Wein (Rot)', 200.0, 12.5),
+        ('Wodka', 40.0, 40.0),
+        ('Sekt', 100.0, 11.0),
+    ]
+    start = now - timedelta(hours=6)
+    drinks = []
+    for i in range(drink_count):
+        name, volume, alcohol = rng.choice(presets)
+        drinks.append({
+            'name': name,
+            'volume': volume,
+            'alcohol_content': alcohol,
+            'time': (start + timedelta(minutes=rng.randint(0, 300))).isoformat(),
+        })
+    return {
+        'person_data': {
+            'gender': rng.choice(['Männlich', 'Weiblich']),
+            'age': rng.randint(18, 80),
+            'height': rng.randint(150, 200),
+            'weight': float(rng.randint(50, 120)),
+            'body_fat': rng.randint(10, 35),
+        },
+        'drinks_data': drinks,
+        'settings_data': {
+            'models': ['Widmark', 'Watson', 'Forrest', 'Seidl'],
+            'meal_status': 'Nüchtern',
+            'elimination_rate': 'Auto (geschlechtsabhängig)',
+            'manual_elimination_rate': None,
+        },
+    }
+
+def build_payloads(count: int, distinct: int, drink_count: int, seed: int) -> List[bytes]:
+    """count Anfragen aus distinct verschiedenen Fällen (Wiederholungen treffen den Cache)"""
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    cases = [json.dumps(_scripted_case(rng, drink_count, now)).encode('utf-8') for _ in range(max(1, distinct))]
+    return [cases[i % len(cases)] for i in range(count)]
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, method: str,
+                   path: str, body: bytes = b'') -> Tuple[int, Dict[str, str], bytes]:
+    """Eine HTTP/1.1-Anfrage über eine bestehende Verbindung"""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Verbindung geschlossen")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    response = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, response
+
+async def _get_json(host: str, port: int, path: str) -> Dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, _, body = await _request(reader, writer, host, 'GET', path)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+async def _client(host: str, port: int, payloads: List[bytes], next_index, latencies: List[float],
+                  outcome: Dict[str, int]):
+    """Eine Verbindung, die Anfragen abarbeitet, bis alle verteilt sind"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            index = next_index()
+            if index is None:
+                break
+            started = time.perf_counter()
+            status, headers, _ = await _request(reader, writer, host, 'POST', '/calculate', payloads[index])
+            latencies.append(time.perf_counter() - started)
+            if status == 200:
+                cache_state = headers.get('x-cache', 'miss')
+                outcome[cache_state] = outcome.get(cache_state, 0) + 1
+            else:
+                outcome['errors'] += 1
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, payloads: List[bytes], concurrency: int) -> Dict:
+    """Verteilt alle Anfragen auf concurrency Verbindungen und misst die Laufzeit"""
+    counter = iter(range(len(payloads)))
+    latencies: List[float] = []
+    outcome = {'errors': 0}
+
+    def next_index() -> Optional[int]:
+        return next(counter, None)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, payloads, next_index, latencies, outcome)
+        for _ in range(max(1, min(concurrency, len(payloads))))
+    ))
+    seconds = time.perf_counter() - started
+    server_stats = await _get_json(host, port, '/stats')
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000.0 if latencies else 0.0
+
+    return {
+        'requests': len(payloads),
+        'seconds': seconds,
+        'throughput_rps': len(payloads) / seconds if seconds else 0.0,
+        'responses': outcome,
+        'latency_ms': {
+            'mean': statistics.mean(latencies) * 1000.0 if latencies else 0.0,
+            'p50': percentile(0.50),
+            'p90': percentile(0.90),
+            'p99': percentile(0.99),
+            'max': latencies[-1] * 1000.0 if latencies else 0.0,
+        },
+        'server': server_stats,
+    }
+
+async def _wait_for_server(host: str, port: int, process: subprocess.Popen):
+    """Wartet, bis der gestartete Dienst auf /health antwortet"""
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Dienst wurde beim Start beendet")
+        try:
+            await _get_json(host, port, '/health')
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Dienst antwortet nicht")
+
+def main(argv=None) -> int:
+    """Einstiegspunkt des Lastgenerators"""
+    parser = argparse.ArgumentParser(description="Lastgenerator für den lokalen BAK-Dienst")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Adresse des Dienstes")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port des Dienstes")
+    parser.add_argument('--requests', type=int, default=1000, help="Anzahl Anfragen")
+    parser.add_argument('--concurrency', type=int, default=32, help="Gleichzeitige Verbindungen")
+    parser.add_argument('--distinct', type=int, default=None,
+                        help="Anzahl verschiedener Fälle (Standard: jede Anfrage verschieden)")
+    parser.add_argument('--drinks', type=int, default=5, help="Getränke pro Anfrage")
+    parser.add_argument('--seed', type=int, default=1, help="Startwert des Zufallsgenerators")
+    parser.add_argument('--spawn-server', action='store_true', help="Dienst für die Messung selbst starten")
+    parser.add_argument('--workers', type=int, default=None, help="Worker-Prozesse des gestarteten Dienstes")
+    parser.add_argument('--batch-window', type=float, default=None,
+                        help="Sammelfenster des gestarteten Dienstes in Millisekunden")
+    parser.add_argument('--output', help="Pfad für den JSON-Bericht (Standard: stdout)")
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.requests, args.distinct or args.requests, args.drinks, args.seed)
+
+    process = None
+    if args.spawn_server:
+        command = [sys.executable, '-m', 'bak_core.server', '--host', args.host, '--port', str(args.port)]
+        if args.workers is not None:
+            command += ['--workers', str(args.workers)]
+        if args.batch_window is not None:
+            command += ['--batch-window', str(args.batch_window)]
+        process = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+
+    try:
+        if process is not None:
+            asyncio.run(_wait_for_server(args.host, args.port, process))
+        measurement = asyncio.run(run_load(args.host, args.port, payloads, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        'version': REPORT_VERSION,
+        'created': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parameters': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'distinct': args.distinct or args.requests,
+            'drinks': args.drinks,
+        },
+        **measurement,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return 1 if measurement['responses']['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Headless Benchmark-Suite für BAK-Kalkulator v2.0
+
+Baut das Hauptfenster unter QT_QPA_PLATFORM=offscreen auf, spielt skriptgesteuerte
+Interaktionen ab und misst die Wall-Clock-Zeit jeder Stufe. Der Bericht wird als
+JSON geschrieben und optional mit einer gespeicherten Baseline verglichen.
+
+Verwendung:
+    python benchmarks/run_benchmarks.py --drinks 200 --output report.json
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Offscreen-Plattform muss vor dem ersten Qt-Import gesetzt sein
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+REPORT_VERSION = 1
+
+
+class BenchmarkRecorder:
+    """Sammelt Zeitmessungen pro Stufe"""
+
+    def __init__(self, app):
+        self.app = app
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Misst eine Stufe inkl. Abarbeitung der anstehenden Qt-Events"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.app.processEvents()
+            elapsed = time.perf_counter() - start
+            self.stages.setdefault(name, []).append(elapsed)
+
+    def summary(self) -> dict:
+        """Fasst alle Messungen zusammen (Sekunden)"""
+        result = {}
+        for name, samples in self.stages.items():
+            result[name] = {
+                'runs': len(samples),
+                'total': sum(samples),
+                'mean': statistics.mean(samples),
+                'median': statistics.median(samples),
+                'min': min(samples),
+                'max': max(samples),
+            }
+        return result
+
+
+def _scripted_drinks(count: int) -> list:
+    """Erzeugt eine reproduzierbare Getränkeliste"""
+    presets = [
+        ('Bier (Pils)', 500, 4.8),
+        ('Wein (Rot)', 200, 12.5),
+        ('Wodka', 40, 40.0),
+        ('Sekt', 100, 11.0),
+    ]
+    start = datetime.now() - timedelta(hours=6)
+    drinks = []
+    for i in range(count):
+        name, volume, alcohol = presets[i % len(presets)]
+        drinks.append({
+            'name': name,
+            'volume': volume,
+            'alcohol_content': alcohol,
+            'time': start + timedelta(minutes=5 * i)
+        })
+    return drinks
+
+
+def run_benchmarks(drink_count: int, repeats: int, export_dir: str) -> dict:
+    """Führt alle Benchmark-Stufen aus und gibt die Zusammenfassung zurück"""
+    import_start = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    from ui.styles.theme_manager import theme_manager, Theme
+    from utils.export_manager import ExportThread
+    import_seconds = time.perf_counter() - import_start
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    recorder = BenchmarkRecorder(app)
+    recorder.stages['import'] = [import_seconds]
+
+    with recorder.stage('startup'):
+        theme_manager.apply_theme()
+        window = MainWindow()
+        window.show()
+
+    controller = window.calculation_controller
+
+    # Getränke über das DrinksWidget hinzufügen (ohne modalen Dialog)
+    with recorder.stage('add_drinks'):
+        for drink in _scripted_drinks(drink_count):
+            window.drinks_widget.add_drink_data(drink)
+
+    # Debounce umgehen und Berechnung direkt messen
+    with recorder.stage('calculation_cold'):
+        controller.clear_cache()
+        controller.force_calculation()
+
+    for _ in range(repeats):
+        with recorder.stage('calculation_cached'):
+            controller.force_calculation()
+
+    # Slider bewegen: jede Änderung löst eine volle Neuberechnung aus
+    deficit_slider = window.settings_widget.resorption_deficit_slider
+    weight_spin = window.person_widget.weight_spin
+    for step in range(repeats):
+        with recorder.stage('settings_slider'):
+            deficit_slider.setValue(5 + step % 20)
+            controller.force_calculation()
+        with recorder.stage('person_weight'):
+            weight_spin.setValue(60 + step % 40)
+            controller.force_calculation()
+
+    # Theme-Wechsel
+    original_theme = theme_manager.current_theme
+    for step in range(repeats):
+        with recorder.stage('theme_switch'):
+            theme_manager.set_theme(Theme.DARK if step % 2 == 0 else Theme.LIGHT)
+    theme_manager.set_theme(original_theme)
+
+    # Exporte synchron im Benchmark-Thread ausführen
+    data = window.gather_export_data()
+    export_types = {'csv': 'csv', 'json': 'json', 'pdf': 'pdf', 'excel': 'xlsx'}
+    export_status = {}
+    for export_type, extension in export_types.items():
+        target = os.path.join(export_dir, f"benchmark.{extension}")
+        thread = ExportThread(export_type, target, data)
+        outcome = {}
+        thread.export_finished.connect(lambda ok, msg, o=outcome: o.update(ok=ok, message=msg))
+        with recorder.stage(f'export_{export_type}'):
+            thread.run()
+        export_status[export_type] = {
+            'ok': outcome.get('ok', False),
+            'message': outcome.get('message', ''),
+        }
+        if not outcome.get('ok', False):
+            # Fehlgeschlagene Exporte (z.B. fehlendes openpyxl) nicht als Timing werten
+            recorder.stages.pop(f'export_{export_type}', None)
+
+    window.close()
+
+    return {
+        'stages': recorder.summary(),
+        'exports': export_status,
+    }
+
+
+def compare_with_baseline(stages: dict, baseline: dict, tolerance: float) -> dict:
+    """Vergleicht die Median-Zeiten mit der Baseline"""
+    comparison = {}
+    baseline_stages = baseline.get('stages', {})
+    for name, stats in stages.items():
+        if name not in baseline_stages:
+            continue
+        reference = baseline_stages[name]['median']
+        ratio = stats['median'] / reference if reference > 0 else None
+        comparison[name] = {
+            'baseline_median': reference,
+            'median': stats['median'],
+            'ratio': ratio,
+            'regression': ratio is not None and ratio > 1.0 + tolerance,
+        }
+    return comparison
+
+
+def main(argv=None) -> int:
+    """Einstiegspunkt der Benchmark-Suite"""
+    parser = argparse.ArgumentParser(description="Headless Benchmarks für den BAK-Kalkulator")
+    parser.add_argument('--drinks', type=int, default=100, help="Anzahl skriptgesteuert hinzugefügter Getränke")
+    parser.add_argument('--repeats', type=int, default=5, help="Wiederholungen pro Interaktions-Stufe")
+    parser.add_argument('--output', help="Pfad für den JSON-Bericht (Standard: stdout)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Pfad der Baseline-Datei")
+    parser.add_argument('--update-baseline', action='store_true', help="Aktuelle Messung als Baseline speichern")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Erlaubte relative Verschlechterung gegenüber der Baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bak_benchmark_") as export_dir:
+        measurement = run_benchmarks(args.drinks, args.repeats, export_dir)
+
+    report = {
+        'version': REPORT_VERSION,
+        'created': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qpa_platform': os.environ.get('QT_QPA_PLATFORM'),
+        },
+        'parameters': {'drinks': args.drinks, 'repeats': args.repeats},
+        **measurement,
+    }
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_with_baseline(report['stages'], baseline, args.tolerance)
+        if any(entry['regression'] for entry in report['comparison'].values()):
+            exit_code = 1
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
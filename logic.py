@@ -1,107 +1,62 @@
 from datetime import datetime, timedelta
 from typing import List
-from models import Person, Drink, CalculationSettings, BACResult, BAKModel, Gender, ResorptionMode
+from models import Person, Drink, CalculationSettings, BACResult, BAKModel
+from bak_core.engine import calculate_models, model_curve
+from bak_core.summary import summarize_curve
 
 class BACCalculator:
+    """BAK-Ergebnisse je ausgewähltem Modell
+
+    Rechnet über bak_core (Modell-Registry und vektorisierte Auswertung) und
+    liefert damit dieselben Werte wie die Anwendung.
+    """
     def __init__(self):
         self.person = None
         self.drinks: List[Drink] = []
         self.settings = None
-    
+
     def set_person(self, person: Person):
         """Setzt die Personendaten"""
         self.person = person
-    
+
     def add_drink(self, drink: Drink):
         """Fügt ein Getränk hinzu"""
         self.drinks.append(drink)
-    
+
     def set_settings(self, settings: CalculationSettings):
         """Setzt die Berechnungseinstellungen"""
         self.settings = settings
-    
-    def calculate_bac(self) -> List[BACResult]:
+
+    def calculate_bac(self, now: datetime = None) -> List[BACResult]:
         """Berechnet die BAK nach allen ausgewählten Modellen"""
         if not all([self.person, self.drinks, self.settings]):
             raise ValueError("Nicht alle erforderlichen Daten sind vorhanden")
-        
-        results = []
-        for model in self.settings.models:
-            result = self._calculate_single_model(model)
-            results.append(result)
-        
-        return results
-    
-    def _calculate_single_model(self, model: BAKModel) -> BACResult:
-        """Berechnet die BAK nach einem spezifischen Modell"""
-        # Widmark-Formel als Basis
-        total_alcohol = sum(drink.get_alcohol_grams() for drink in self.drinks)
-        
-        # Verteilungsfaktor r nach Widmark
-        r = 0.7 if self.person.gender == Gender.MALE else 0.6
-        
-        # Körpergewicht in kg
-        weight = self.person.weight
-        
-        # Maximale BAK
-        peak_bac = (total_alcohol / (weight * r)) * 100
-        
-        # Zeitpunkt des Maximums (abhängig vom Resorptionsmodus)
-        if self.settings.resorption_mode == "Nüchtern":
-            peak_time = min(drink.time for drink in self.drinks) + timedelta(minutes=30)
-        else:
-            peak_time = min(drink.time for drink in self.drinks) + timedelta(minutes=60)
-        
-        # Berechnung der Rückkehrzeiten
-        elimination_rate = self.settings.elimination_rate / 100  # Umrechnung in ‰/h
-        
-        # Zeit bis unter 0.3‰
-        time_to_sober = peak_time + timedelta(hours=peak_bac / elimination_rate)
-        
-        # Zeit bis 0.0‰
-        time_to_zero = peak_time + timedelta(hours=(peak_bac + 0.1) / elimination_rate)
-        
+
+        now = now or datetime.now()
+        results = calculate_models(self.person, self.drinks, self.settings.models, now)
+        return [self._to_result(model, results[model.value], now)
+                for model in self.settings.models if model.value in results]
+
+    def _to_result(self, model: BAKModel, result: dict, now: datetime) -> BACResult:
+        """Überführt ein Modellergebnis von bak_core in ein BACResult"""
+        bac_values = result['bac_values']
+        summary = summarize_curve(bac_values, now)
+        last_time = bac_values[-1][0]
+
         return BACResult(
-            peak_bac=peak_bac,
-            peak_time=peak_time,
-            time_to_sober=time_to_sober,
-            time_to_zero=time_to_zero,
+            peak_bac=summary.peak_bac,
+            peak_time=summary.peak_time or min(drink.time for drink in self.drinks),
+            time_to_sober=summary.time_to_05 or last_time,  # Zeit bis unter 0.5‰
+            time_to_zero=summary.time_to_00 or last_time,  # Zeit bis praktisch nüchtern
             model=model
         )
-    
-    def get_bac_over_time(self, start_time: datetime, end_time: datetime, 
+
+    def get_bac_over_time(self, start_time: datetime, end_time: datetime,
                          interval_minutes: int = 15) -> List[tuple]:
-        """Berechnet den BAK-Verlauf über die Zeit"""
+        """Berechnet den BAK-Verlauf über die Zeit (nach dem ersten ausgewählten Modell)"""
         if not all([self.person, self.drinks, self.settings]):
             raise ValueError("Nicht alle erforderlichen Daten sind vorhanden")
-        
-        time_points = []
-        current_time = start_time
-        while current_time <= end_time:
-            time_points.append(current_time)
-            current_time += timedelta(minutes=interval_minutes)
-        
-        bac_values = []
-        for time_point in time_points:
-            # Berechne BAK für jeden Zeitpunkt
-            # (vereinfachte Berechnung, sollte je nach Modell angepasst werden)
-            total_alcohol = sum(
-                drink.get_alcohol_grams() 
-                for drink in self.drinks 
-                if drink.time <= time_point
-            )
-            
-            r = 0.7 if self.person.gender == "männlich" else 0.6
-            weight = self.person.weight
-            
-            bac = (total_alcohol / (weight * r)) * 100
-            
-            # Berücksichtige Abbau
-            if time_point > min(drink.time for drink in self.drinks):
-                hours_passed = (time_point - min(drink.time for drink in self.drinks)).total_seconds() / 3600
-                elimination = hours_passed * (self.settings.elimination_rate / 100)
-                bac = max(0, bac - elimination)
-            
-            bac_values.append((time_point, bac))
-        
-        return bac_values 
\ No newline at end of file
+
+        model = self.settings.models[0] if self.settings.models else BAKModel.WIDMARK
+        return model_curve(self.person, self.drinks, model, start_time, end_time,
+                           timedelta(minutes=interval_minutes))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
 class Gender(Enum):
     MALE = "männlich"
@@ -65,4 +66,35 @@ class CalculationResults:
     results: dict[BAKModel, BACResult]  # Ergebnisse pro Modell
     person: Person
     drinks: list[Drink]
-    settings: CalculationSettings 
\ No newline at end of file
+    settings: CalculationSettings 
+
+class ChangeKind(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    UPDATED = "updated"
+    RESET = "reset"
+
+@dataclass(frozen=True)
+class DrinkChange:
+    """Änderung an der Getränkeliste
+
+    rows bezieht sich bei ADDED/UPDATED auf die Liste nach der Änderung,
+    bei REMOVED auf die Liste davor. drinks enthält die neuen Werte der
+    betroffenen Zeilen (bei RESET die komplette Liste).
+    """
+    kind: ChangeKind
+    rows: tuple[int, ...] = ()
+    fields: tuple[str, ...] = ()
+    drinks: tuple[dict, ...] = ()
+
+@dataclass(frozen=True)
+class PersonChange:
+    """Änderung eines einzelnen Felds der Personendaten"""
+    field: str
+    value: Any
+
+@dataclass(frozen=True)
+class SettingsChange:
+    """Änderung eines einzelnen Felds der Berechnungseinstellungen"""
+    field: str
+    value: Any
@@ -4,11 +4,14 @@ from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont
 from typing import Dict, List
 
+from models import SettingsChange
+
 class CalculationSettingsWidget(QWidget):
     """Widget für Berechnungseinstellungen"""
     
     # Signal für Datenänderungen
     data_changed = pyqtSignal()
+    field_changed = pyqtSignal(object)  # SettingsChange
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -369,6 +372,25 @@ Nahrung beeinflusst massiv die Alkoholresorption:<br>
         
         # Weitere Einstellungen
         self.meal_combo.currentTextChanged.connect(self.data_changed.emit)
+        
+        # Typisierte Feldänderungen
+        for checkbox in self.model_checkboxes.values():
+            checkbox.stateChanged.connect(
+                lambda _: self.field_changed.emit(SettingsChange('models', self.get_selected_models())))
+        self._connect_field(self.resorption_time_combo.currentTextChanged, 'resorption_time')
+        self._connect_field(self.resorption_deficit_slider.valueChanged, 'resorption_deficit')
+        self._connect_field(self.elimination_rate_combo.currentTextChanged, 'elimination_rate')
+        self.manual_elimination_slider.valueChanged.connect(
+            lambda value: self.field_changed.emit(SettingsChange('manual_elimination_rate', value / 100.0)))
+        self._connect_field(self.meal_combo.currentTextChanged, 'meal_status')
+    
+    def _connect_field(self, signal, field: str):
+        """Leitet ein Widget-Signal als SettingsChange weiter"""
+        signal.connect(lambda value, f=field: self.field_changed.emit(SettingsChange(f, value)))
+    
+    def get_selected_models(self) -> List[str]:
+        """Gibt die ausgewählten Modelle zurück"""
+        return [name for name, checkbox in self.model_checkboxes.items() if checkbox.isChecked()]
     
     def set_default_values(self):
         """Setzt Standardwerte"""
@@ -403,14 +425,8 @@ Nahrung beeinflusst massiv die Alkoholresorption:<br>
     
     def get_settings_data(self) -> Dict:
         """Gibt die aktuellen Einstellungen zurück"""
-        # Ausgewählte Modelle sammeln
-        selected_models = []
-        for model_name, checkbox in self.model_checkboxes.items():
-            if checkbox.isChecked():
-                selected_models.append(model_name)
-        
         return {
-            'models': selected_models,
+            'models': self.get_selected_models(),
             'resorption_time': self.resorption_time_combo.currentText(),
             'resorption_deficit': self.resorption_deficit_slider.value(),
             'elimination_rate': self.elimination_rate_combo.currentText(),
@@ -0,0 +1,163 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+
+from bak_core.curve import contribution_arrays, single_drink_bac
+
+class ContributionTableModel(QAbstractTableModel):
+    """Virtualisierte Einzelgetränk-Tabelle eines BAK-Modells
+
+    Die Rohdaten liegen als Spalten-Arrays vor. Texte und der aktuelle
+    Beitrag werden erst beim Anzeigen einer Zeile berechnet; Sortieren und
+    Filtern arbeiten vektorisiert auf den Arrays über eine Index-Abbildung.
+    """
+
+    HEADERS = ["Nr.", "Alkohol (g)", "Konsumzeit", "Peak-BAK", "Peak-Zeit", "Resorption", "Aktueller Beitrag"]
+    CURRENT_COLUMN = 6
+
+    # Zeilenfarben nach aktuellem Beitrag
+    SIGNIFICANT_BRUSH = QBrush(QColor('#ffebee'))  # Noch signifikant
+    LOW_BRUSH = QBrush(QColor('#fff3e0'))          # Gering
+    ELIMINATED_BRUSH = QBrush(QColor('#f1f8e9'))   # Praktisch eliminiert
+
+    # Ab diesem Beitrag gilt ein Getränk als noch wirksam (‰)
+    ACTIVE_THRESHOLD = 0.001
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._contributions: List[Dict] = []
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._grams = np.zeros(0)
+        self._elimination_rate = 0.15
+        self._reference = datetime.now()
+        self._current: Optional[np.ndarray] = None
+        self._row_cache: Dict[int, float] = {}
+        self._view = np.zeros(0, dtype=np.intp)
+        self._active_only = False
+        self._sort_column = 0
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_result(self, result: Optional[Dict], reference: Optional[datetime] = None):
+        """Übernimmt die Einzelgetränk-Daten eines Modell-Ergebnisses"""
+        self.beginResetModel()
+        result = result or {}
+        self._contributions = result.get('drink_contributions') or []
+        self._elimination_rate = result.get('elimination_rate', 0.15)
+        # Bezugszeitpunkt für "aktuell"; Zeiten in Stunden relativ dazu
+        self._reference = reference or datetime.now()
+        self._arrays = contribution_arrays(self._contributions, self._reference)
+        self._grams = np.array([c['alcohol_grams'] for c in self._contributions], dtype=float)
+        self._current = None
+        self._row_cache = {}
+        self._update_view()
+        self.endResetModel()
+
+    def _current_contribution(self, source_row: int) -> float:
+        """Aktueller Beitrag einer Zeile (bei Bedarf einzeln berechnet)"""
+        if self._current is not None:
+            return float(self._current[source_row])
+        value = self._row_cache.get(source_row)
+        if value is None:
+            arrays = self._arrays
+            value = float(single_drink_bac(0.0, arrays['consumption'][source_row], arrays['peak'][source_row],
+                                           arrays['peak_bac'][source_row], arrays['resorption'][source_row],
+                                           self._elimination_rate))
+            self._row_cache[source_row] = value
+        return value
+
+    def current_contributions(self) -> np.ndarray:
+        """Aktuelle Beiträge aller Getränke (vektorisiert, einmalig berechnet)"""
+        if self._current is None:
+            arrays = self._arrays
+            self._current = single_drink_bac(0.0, arrays['consumption'], arrays['peak'], arrays['peak_bac'],
+                                             arrays['resorption'], self._elimination_rate)
+        return self._current
+
+    def total_current_contribution(self) -> float:
+        """Summe aller aktuellen Einzelbeiträge"""
+        return float(self.current_contributions().sum()) if self._contributions else 0.0
+
+    def _sort_key(self, column: int) -> np.ndarray:
+        """Spalten-Array, nach dem sortiert wird"""
+        if column == 1:
+            return self._grams
+        if column in (2, 3, 4, 5):
+            return self._arrays[('consumption', 'peak_bac', 'peak', 'resorption')[column - 2]]
+        if column == self.CURRENT_COLUMN:
+            return self.current_contributions()
+        return np.arange(len(self._contributions))
+
+    def _update_view(self):
+        """Berechnet die Abbildung sichtbare Zeile -> Datenzeile"""
+        rows = np.arange(len(self._contributions))
+        if self._active_only and len(rows):
+            rows = rows[self.current_contributions() > self.ACTIVE_THRESHOLD]
+        if len(rows):
+            order = np.argsort(self._sort_key(self._sort_column)[rows], kind='stable')
+            if self._sort_order == Qt.SortOrder.DescendingOrder:
+                order = order[::-1]
+            rows = rows[order]
+        self._view = rows
+
+    def set_active_only(self, active_only: bool):
+        """Zeigt nur noch wirksame Getränke an"""
+        if active_only == self._active_only:
+            return
+        self.beginResetModel()
+        self._active_only = active_only
+        self._update_view()
+        self.endResetModel()
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._update_view()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._view)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        source_row = int(self._view[index.row()])
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            contrib = self._contributions[source_row]
+            if column == 0:
+                return str(contrib['drink_index'] + 1)
+            if column == 1:
+                return f"{contrib['alcohol_grams']:.1f} g"
+            if column == 2:
+                return contrib['consumption_time'].strftime('%H:%M')
+            if column == 3:
+                return f"{contrib['peak_bac']:.3f} ‰"
+            if column == 4:
+                return contrib['peak_time'].strftime('%H:%M')
+            if column == 5:
+                return f"{contrib['resorption_hours']:.1f}h"
+            return f"{self._current_contribution(source_row):.3f} ‰"
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            current = self._current_contribution(source_row)
+            if current > 0.1:
+                return self.SIGNIFICANT_BRUSH
+            if current > 0.01:
+                return self.LOW_BRUSH
+            return self.ELIMINATED_BRUSH
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
@@ -0,0 +1,185 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QBrush
+from datetime import datetime
+from typing import Dict, List
+
+from utils.drink_store import DrinkStore
+
+class DrinksTableModel(QAbstractTableModel):
+    """Table-Model über dem spaltenbasierten DrinkStore
+
+    Zellen werden nur bei Bedarf formatiert; eine Bearbeitung ändert genau
+    ein Feld im Store und meldet nur die betroffenen Zellen per dataChanged.
+    """
+
+    # Signal nach erfolgreicher Bearbeitung: Zeile, Feldname
+    drink_edited = pyqtSignal(int, str)
+    # Signal bei ungültiger Eingabe: Titel, Meldung
+    validation_failed = pyqtSignal(str, str)
+
+    HEADERS = ["Getränk", "Menge (ml)", "Alkohol (%)", "Datum", "Zeit", "Alkohol (g)"]
+    GRAMS_COLUMN = 5
+
+    TOOLTIPS = {
+        1: "Doppelklick zum Bearbeiten der Menge",
+        2: "Doppelklick zum Bearbeiten des Alkoholgehalts",
+        3: "Doppelklick zum Bearbeiten (Format: TT.MM.JJJJ)",
+        4: "Doppelklick zum Bearbeiten (Format: HH:MM)",
+        5: "Automatisch berechnet: Volumen × Alkohol% × 0.789",
+    }
+
+    GRAMS_BACKGROUND = QBrush(Qt.GlobalColor.lightGray)
+
+    def __init__(self, store: DrinkStore = None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else DrinkStore()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() != self.GRAMS_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._format_cell(row, column)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.TOOLTIPS.get(column)
+        if role == Qt.ItemDataRole.BackgroundRole and column == self.GRAMS_COLUMN:
+            return self.GRAMS_BACKGROUND
+        return None
+
+    def _format_cell(self, row: int, column: int) -> str:
+        """Formatiert eine Zelle direkt aus dem Store"""
+        store = self.store
+        if column == 0:
+            return store.names[row]
+        if column == 1:
+            return f"{store.volumes[row]:g}"
+        if column == 2:
+            return f"{store.alcohol_contents[row]:g}"
+        if column == 3:
+            return store.times[row].strftime('%d.%m.%Y')
+        if column == 4:
+            return store.times[row].strftime('%H:%M')
+        return f"{store.alcohol_grams(row):.1f} g"
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        text = str(value).strip()
+        drink_time = self.store.times[row]
+
+        if column == 0:  # Getränkename
+            if not text:
+                return False
+            field, new_value = 'name', text
+
+        elif column == 1:  # Menge
+            try:
+                new_volume = float(text.replace(',', '.'))
+                if not 0 < new_volume <= 5000:  # Sinnvolle Grenzen
+                    raise ValueError("Volumen außerhalb des gültigen Bereichs")
+            except ValueError:
+                self.validation_failed.emit("Ungültiger Wert",
+                                            "Bitte geben Sie ein gültiges Volumen zwischen 1 und 5000 ml ein.")
+                return False
+            field, new_value = 'volume', new_volume
+
+        elif column == 2:  # Alkoholgehalt
+            try:
+                new_alcohol = float(text.replace(',', '.'))
+                if not 0 <= new_alcohol <= 100:  # 0-100%
+                    raise ValueError("Alkoholgehalt außerhalb des gültigen Bereichs")
+            except ValueError:
+                self.validation_failed.emit("Ungültiger Wert",
+                                            "Bitte geben Sie einen gültigen Alkoholgehalt zwischen 0 und 100% ein.")
+                return False
+            field, new_value = 'alcohol_content', new_alcohol
+
+        elif column == 3:  # Datum, kombiniert mit bestehender Zeit
+            new_date = None
+            for date_format in ('%d.%m.%Y', '%d.%m.%y', '%d/%m/%Y'):
+                try:
+                    new_date = datetime.strptime(text, date_format).date()
+                    break
+                except ValueError:
+                    continue
+            if new_date is None:
+                self.validation_failed.emit("Ungültiges Datum",
+                                            "Bitte geben Sie ein gültiges Datum im Format TT.MM.JJJJ ein.")
+                return False
+            field, new_value = 'time', datetime.combine(new_date, drink_time.time())
+
+        elif column == 4:  # Zeit, kombiniert mit bestehendem Datum
+            try:
+                new_time = datetime.strptime(text, '%H:%M').time()
+            except ValueError:
+                self.validation_failed.emit("Ungültige Zeit",
+                                            "Bitte geben Sie eine gültige Zeit im Format HH:MM ein.")
+                return False
+            field, new_value = 'time', datetime.combine(drink_time.date(), new_time)
+
+        else:
+            return False
+
+        if self.store.get(row, field) == new_value:
+            return True
+        self.store.set(row, field, new_value)
+
+        # Nur die betroffenen Zellen melden
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        if field in ('volume', 'alcohol_content'):
+            grams_index = self.index(row, self.GRAMS_COLUMN)
+            self.dataChanged.emit(grams_index, grams_index, [Qt.ItemDataRole.DisplayRole])
+        self.drink_edited.emit(row, field)
+        return True
+
+    def append_drink(self, drink: Dict) -> int:
+        """Fügt ein Getränk als neue Zeile an"""
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.append(drink)
+        self.endInsertRows()
+        return row
+
+    def append_drinks(self, drinks: List[Dict]) -> range:
+        """Fügt mehrere Getränke in einem Schritt an"""
+        first = len(self.store)
+        if not drinks:
+            return range(first, first)
+        self.beginInsertRows(QModelIndex(), first, first + len(drinks) - 1)
+        self.store.extend(drinks)
+        self.endInsertRows()
+        return range(first, len(self.store))
+
+    def remove_drink(self, row: int):
+        """Entfernt eine Zeile"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.store.remove(row)
+        self.endRemoveRows()
+
+    def set_drinks(self, drinks: List[Dict]):
+        """Ersetzt alle Getränke"""
+        self.beginResetModel()
+        self.store.clear()
+        self.store.extend(drinks)
+        self.endResetModel()
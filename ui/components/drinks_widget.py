@@ -1,40 +1,44 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QPushButton, QTableView, QAbstractItemView, QHeaderView,
                             QComboBox, QSpinBox, QDoubleSpinBox, QTimeEdit, QDateEdit, QGroupBox,
-                            QMessageBox, QDialog, QDialogButtonBox)
-from PyQt6.QtCore import pyqtSignal, QTime, QDate, Qt
-from PyQt6.QtGui import QFont
+                            QMessageBox, QDialog, QDialogButtonBox, QMenu, QFileDialog,
+                            QApplication, QLineEdit)
+from PyQt6.QtCore import pyqtSignal, QTime, QDate, Qt, QThread
+from PyQt6.QtGui import QFont, QShortcut, QKeySequence
 from datetime import datetime, time, date, timedelta
 from typing import List, Dict
 
+from models import ChangeKind, DrinkChange
+from ui.components.drinks_table_model import DrinksTableModel
+from utils.beverage_catalog import Beverage, BeverageCatalog, get_catalog
+from utils.drink_import import DrinkImportError, parse_drinks
+
+class CatalogLoadThread(QThread):
+    """Thread zum Laden des Getränkekatalogs"""
+    
+    def __init__(self, catalog: BeverageCatalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+    
+    def run(self):
+        self.catalog.load()
+
 class AddDrinkDialog(QDialog):
     """Dialog zum Hinzufügen von Getränken"""
     
+    # Maximale Anzahl angezeigter Suchtreffer
+    SEARCH_LIMIT = 50
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Getränk hinzufügen - BAK Calculator v2.0")
         self.setModal(True)
-        self.setFixedSize(450, 400)  # Größer für besseres Layout
-        
-        # Getränke-Daten initialisieren
-        self.drink_data = {
-            "Bier (Pils)": {"volume": 500, "alcohol": 4.8},
-            "Bier (Weizen)": {"volume": 500, "alcohol": 5.4},
-            "Bier (Export)": {"volume": 500, "alcohol": 5.2},
-            "Wein (Rot)": {"volume": 200, "alcohol": 12.5},
-            "Wein (Weiß)": {"volume": 200, "alcohol": 11.5},
-            "Sekt": {"volume": 100, "alcohol": 11.0},
-            "Wodka": {"volume": 40, "alcohol": 40.0},
-            "Whisky": {"volume": 40, "alcohol": 40.0},
-            "Rum": {"volume": 40, "alcohol": 40.0},
-            "Gin": {"volume": 40, "alcohol": 40.0},
-            "Schnaps": {"volume": 20, "alcohol": 38.0},
-            "Likör": {"volume": 40, "alcohol": 20.0},
-            "Cocktail (Mojito)": {"volume": 250, "alcohol": 8.0},
-            "Cocktail (Caipirinha)": {"volume": 200, "alcohol": 12.0},
-            "Long Island Iced Tea": {"volume": 300, "alcohol": 18.0},
-            "Benutzerdefiniert": {"volume": 500, "alcohol": 5.0}
-        }
+        self.setFixedSize(450, 450)  # Größer für besseres Layout
+        
+        # Getränkekatalog (wird beim ersten Öffnen im Hintergrund geladen)
+        self.catalog = get_catalog()
+        self._beverages: Dict[str, Beverage] = {}
+        self._load_thread = None
         
         self.setup_ui()
         self.load_default_drinks()
@@ -51,6 +55,22 @@ class AddDrinkDialog(QDialog):
         drink_layout = QVBoxLayout(drink_group)
         drink_layout.setSpacing(10)  # Abstand zwischen Elementen
         
+        # Suche im Getränkekatalog
+        search_layout = QHBoxLayout()
+        search_layout.setSpacing(10)
+        search_label = QLabel("Suche:")
+        search_label.setFont(QFont("Inter", 12))
+        search_label.setMinimumWidth(120)
+        self.search_edit = QLineEdit()
+        self.search_edit.setFont(QFont("Inter", 12))
+        self.search_edit.setMinimumHeight(35)
+        self.search_edit.setPlaceholderText("z.B. weizen 0,5 oder gin")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.update_search_results)
+        search_layout.addWidget(search_label)
+        search_layout.addWidget(self.search_edit)
+        drink_layout.addLayout(search_layout)
+        
         # Vordefinierte Getränke
         predefined_layout = QHBoxLayout()
         predefined_layout.setSpacing(10)
@@ -271,6 +291,9 @@ Der Zeitpunkt des Alkoholkonsums beeinflusst die Pharmakodynamik:<br>
         ok_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
         ok_button.setText("Hinzufügen")
         ok_button.setMinimumHeight(40)
+        # Erst aktiv, wenn die Auswahl ein Getränk enthält
+        ok_button.setEnabled(False)
+        self.ok_button = ok_button
         ok_button.setStyleSheet("""
             QPushButton {
                 background-color: #4CAF50;
@@ -308,17 +331,50 @@ Der Zeitpunkt des Alkoholkonsums beeinflusst die Pharmakodynamik:<br>
         layout.addWidget(button_box)
     
     def load_default_drinks(self):
-        """Lädt vordefinierte Getränke"""
-        for name, data in self.drink_data.items():
-            self.drink_combo.addItem(name)
+        """Lädt die Getränkeauswahl (Katalog bei Bedarf im Hintergrund)"""
+        if self.catalog.is_loaded:
+            self.update_search_results(self.search_edit.text())
+            return
+        self._load_thread = CatalogLoadThread(self.catalog, self)
+        self._load_thread.finished.connect(lambda: self.update_search_results(self.search_edit.text()))
+        self._load_thread.start()
+    
+    def update_search_results(self, query: str):
+        """Zeigt die Katalog-Treffer zur Sucheingabe in der Auswahl an"""
+        results = self.catalog.search(query, limit=self.SEARCH_LIMIT)
+        self._beverages = {beverage.name: beverage for beverage in results}
+        
+        self.drink_combo.blockSignals(True)
+        self.drink_combo.clear()
+        for beverage in results:
+            self.drink_combo.addItem(beverage.name)
+            self.drink_combo.setItemData(self.drink_combo.count() - 1,
+                                         f"{beverage.category}: {beverage.volume:g} ml, {beverage.alcohol:g} %",
+                                         Qt.ItemDataRole.ToolTipRole)
+        self.drink_combo.blockSignals(False)
+        self.ok_button.setEnabled(self.drink_combo.count() > 0)
+        self.on_drink_changed()
     
     def on_drink_changed(self):
         """Reagiert auf Getränke-Auswahl"""
-        drink_name = self.drink_combo.currentText()
-        if drink_name in self.drink_data:
-            data = self.drink_data[drink_name]
-            self.volume_spin.setValue(data["volume"])
-            self.alcohol_spin.setValue(data["alcohol"])
+        beverage = self._beverages.get(self.drink_combo.currentText())
+        if beverage is not None:
+            self.volume_spin.setValue(int(round(beverage.volume)))
+            self.alcohol_spin.setValue(beverage.alcohol)
+    
+    def accept(self):
+        """Übernimmt das Getränk nur mit gültigem Namen"""
+        if not self.drink_combo.currentText().strip():
+            return
+        super().accept()
+    
+    def done(self, result):
+        """Schließt den Dialog und merkt das gewählte Getränk für die Rangfolge"""
+        if self._load_thread is not None:
+            self._load_thread.wait()
+        if result == QDialog.DialogCode.Accepted and self.drink_combo.currentText() in self._beverages:
+            self.catalog.mark_used(self.drink_combo.currentText())
+        super().done(result)
     
     def get_drink_data(self):
         """Gibt die eingegebenen Getränke-Daten zurück"""
@@ -341,22 +397,26 @@ class DrinksWidget(QWidget):
     
     # Signal für Datenänderungen
     data_changed = pyqtSignal()
+    # Typisierte Änderung mit betroffenen Zeilen und Feldern
+    drinks_changed = pyqtSignal(object)  # DrinkChange
+    # Anzahl der per Import übernommenen Getränke
+    drinks_imported = pyqtSignal(int)
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.drinks_data = []
+        # Spaltenbasierter Store hinter dem Table-Model
+        self.drinks_model = DrinksTableModel(parent=self)
+        self.drink_store = self.drinks_model.store
         self.setup_ui()
         self.connect_signals()
         # Initial Signal senden, falls Daten vorhanden sind
-        if self.drinks_data:
+        if len(self.drink_store):
             self.data_changed.emit()
     
-    def _disconnect_signals_safe(self):
-        """Thread-sichere Signal-Trennung"""
-        try:
-            self.drinks_table.cellChanged.disconnect()
-        except (TypeError, RuntimeError):
-            pass  # Signal war bereits getrennt oder Widget zerstört
+    @property
+    def drinks_data(self) -> List[Dict]:
+        """Getränke als Liste von Dictionaries (Kopie aus dem Store)"""
+        return self.drink_store.rows()
     
     def setup_ui(self):
         """Erstellt die UI-Komponenten"""
@@ -409,6 +469,30 @@ class DrinksWidget(QWidget):
             }
         """)
         
+        self.import_button = QPushButton("Importieren")
+        self.import_button.setFont(QFont("Inter", 12))
+        self.import_button.setToolTip("Mehrere Getränke aus Zwischenablage (Tabelle), CSV- oder JSON-Datei übernehmen")
+        self.import_button.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-weight: 500;
+            }
+            QPushButton:hover {
+                background-color: #1976D2;
+            }
+            QPushButton::menu-indicator {
+                width: 0px;
+            }
+        """)
+        import_menu = QMenu(self.import_button)
+        import_menu.addAction("Aus Zwischenablage einfügen", self.import_from_clipboard)
+        import_menu.addAction("Aus Datei (CSV/JSON)...", self.import_from_file)
+        self.import_button.setMenu(import_menu)
+        
         self.clear_button = QPushButton("Alle löschen")
         self.clear_button.setFont(QFont("Inter", 12))
         self.clear_button.setStyleSheet("""
@@ -426,13 +510,14 @@ class DrinksWidget(QWidget):
         """)
         
         header_layout.addWidget(self.add_button)
+        header_layout.addWidget(self.import_button)
         header_layout.addWidget(self.remove_button)
         header_layout.addWidget(self.clear_button)
         
         layout.addLayout(header_layout)
         
         # Getränke-Tabelle
-        self.drinks_table = QTableWidget()
+        self.drinks_table = QTableView()
         self.drinks_table.setFont(QFont("Inter", 11))
         self.setup_table()
         
@@ -494,9 +579,7 @@ class DrinksWidget(QWidget):
     
     def setup_table(self):
         """Konfiguriert die Getränke-Tabelle"""
-        headers = ["Getränk", "Menge (ml)", "Alkohol (%)", "Datum", "Zeit", "Alkohol (g)"]
-        self.drinks_table.setColumnCount(len(headers))
-        self.drinks_table.setHorizontalHeaderLabels(headers)
+        self.drinks_table.setModel(self.drinks_model)
         
         # Spaltenbreiten
         header = self.drinks_table.horizontalHeader()
@@ -515,22 +598,29 @@ class DrinksWidget(QWidget):
         
         # Stil
         self.drinks_table.setAlternatingRowColors(True)
-        self.drinks_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.drinks_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.drinks_table.verticalHeader().setVisible(False)
         
         # Editierbarkeit aktivieren
-        self.drinks_table.setEditTriggers(QTableWidget.EditTrigger.DoubleClicked | 
-                                        QTableWidget.EditTrigger.EditKeyPressed)
-        
-        # Signal für Zellenänderungen
-        self.drinks_table.cellChanged.connect(self.on_cell_changed)
+        self.drinks_table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | 
+                                        QAbstractItemView.EditTrigger.EditKeyPressed)
+        
+        # Signale des Models
+        self.drinks_model.drink_edited.connect(self.on_drink_edited)
+        # Queued, damit die Meldung nicht während des Editor-Commits erscheint
+        self.drinks_model.validation_failed.connect(self.on_validation_failed,
+                                                    Qt.ConnectionType.QueuedConnection)
     
     def connect_signals(self):
         """Verbindet alle Signale"""
         self.add_button.clicked.connect(self.add_drink)
         self.remove_button.clicked.connect(self.remove_selected_drink)
         self.clear_button.clicked.connect(self.clear_drinks)
-        self.drinks_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.drinks_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        # Einfügen einer kopierten Tabelle direkt in die Getränkeliste
+        paste_shortcut = QShortcut(QKeySequence.StandardKey.Paste, self.drinks_table)
+        paste_shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+        paste_shortcut.activated.connect(self.import_from_clipboard)
     
     def add_drink(self):
         """Öffnet Dialog zum Hinzufügen eines Getränks"""
@@ -541,15 +631,67 @@ class DrinksWidget(QWidget):
         dialog.date_edit.setDate(QDate(now_minus_30.year, now_minus_30.month, now_minus_30.day))
         dialog.time_edit.setTime(QTime(now_minus_30.hour, now_minus_30.minute))
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            drink_data = dialog.get_drink_data()
-            self.drinks_data.append(drink_data)
-            self.update_table()
-            self.update_summary()
-            self.data_changed.emit()
+            self.add_drink_data(dialog.get_drink_data())
+
+    def add_drink_data(self, drink_data: Dict):
+        """Fügt ein Getränk ohne Dialog hinzu (z.B. für Skripte und Benchmarks)"""
+        row = self.drinks_model.append_drink(drink_data)
+        self.update_summary()
+        self._emit_change(DrinkChange(ChangeKind.ADDED, rows=(row,), drinks=(self.drink_store.row(row),)))
+    
+    def import_drinks(self, text: str) -> int:
+        """Importiert mehrere Getränke aus CSV-, Tabellen- oder JSON-Text
+
+        Alle Zeilen werden zuerst gemeinsam geprüft und dann in einem Schritt
+        eingefügt; es wird genau eine Änderung gemeldet. Bei ungültigen Zeilen
+        wird nichts übernommen (DrinkImportError).
+        """
+        drinks = parse_drinks(text)
+        rows = self.drinks_model.append_drinks(drinks)
+        self.update_summary()
+        self._emit_change(DrinkChange(ChangeKind.ADDED, rows=tuple(rows),
+                                      drinks=tuple(self.drink_store.row(row) for row in rows)))
+        return len(rows)
     
+    def import_from_clipboard(self):
+        """Importiert Getränke aus der Zwischenablage"""
+        self._import_with_feedback(QApplication.clipboard().text())
+    
+    def import_from_file(self):
+        """Importiert Getränke aus einer CSV- oder JSON-Datei"""
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Getränke importieren", "",
+            "Getränkelisten (*.csv *.tsv *.txt *.json);;Alle Dateien (*)"
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, 'r', encoding='utf-8-sig') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "Import fehlgeschlagen", f"Datei konnte nicht gelesen werden:\n{e}")
+            return
+        self._import_with_feedback(text)
+    
+    def _import_with_feedback(self, text: str):
+        """Führt den Import aus; Fehler per Dialog, Erfolg über drinks_imported"""
+        try:
+            count = self.import_drinks(text)
+        except DrinkImportError as e:
+            details = "\n".join(e.errors)
+            QMessageBox.warning(self, "Import fehlgeschlagen",
+                                f"{e}\nEs wurden keine Getränke übernommen.\n\n{details}".strip())
+            return
+        self.drinks_imported.emit(count)
+    
+    def _emit_change(self, change: DrinkChange):
+        """Meldet eine Änderung typisiert und als allgemeines data_changed"""
+        self.drinks_changed.emit(change)
+        self.data_changed.emit()
+
     def remove_selected_drink(self):
         """Entfernt das ausgewählte Getränk"""
-        current_row = self.drinks_table.currentRow()
+        current_row = self.drinks_table.currentIndex().row()
         if current_row >= 0:
             reply = QMessageBox.question(
                 self, "Getränk entfernen",
@@ -558,14 +700,13 @@ class DrinksWidget(QWidget):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                del self.drinks_data[current_row]
-                self.update_table()
+                self.drinks_model.remove_drink(current_row)
                 self.update_summary()
-                self.data_changed.emit()
+                self._emit_change(DrinkChange(ChangeKind.REMOVED, rows=(current_row,)))
     
     def clear_drinks(self):
         """Löscht alle Getränke"""
-        if self.drinks_data:
+        if len(self.drink_store):
             reply = QMessageBox.question(
                 self, "Alle Getränke löschen",
                 "Möchten Sie wirklich alle Getränke löschen?",
@@ -573,92 +714,34 @@ class DrinksWidget(QWidget):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                self.drinks_data.clear()
-                self.update_table()
+                self.drinks_model.set_drinks([])
                 self.update_summary()
-                self.data_changed.emit()
+                self._emit_change(DrinkChange(ChangeKind.RESET))
     
     def on_selection_changed(self):
         """Reagiert auf Änderung der Auswahl"""
-        has_selection = len(self.drinks_table.selectedItems()) > 0
+        has_selection = self.drinks_table.selectionModel().hasSelection()
         self.remove_button.setEnabled(has_selection)
     
-    def update_table(self):
-        """Aktualisiert die Getränke-Tabelle"""
-        # Signal temporär disconnecten um infinite loops zu vermeiden
-        self._disconnect_signals_safe()
-        
-        self.drinks_table.setRowCount(len(self.drinks_data))
-        
-        for row, drink in enumerate(self.drinks_data):
-            # Getränkename (editierbar)
-            name_item = QTableWidgetItem(drink['name'])
-            name_item.setFlags(name_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            self.drinks_table.setItem(row, 0, name_item)
-            
-            # Menge (editierbar)
-            volume_item = QTableWidgetItem(f"{drink['volume']}")
-            volume_item.setFlags(volume_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            volume_item.setToolTip("Doppelklick zum Bearbeiten der Menge")
-            self.drinks_table.setItem(row, 1, volume_item)
-            
-            # Alkoholgehalt (editierbar)
-            alcohol_item = QTableWidgetItem(f"{drink['alcohol_content']}")
-            alcohol_item.setFlags(alcohol_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            alcohol_item.setToolTip("Doppelklick zum Bearbeiten des Alkoholgehalts")
-            self.drinks_table.setItem(row, 2, alcohol_item)
-            
-            # Datum (editierbar)
-            date_str = drink['time'].strftime('%d.%m.%Y')
-            date_item = QTableWidgetItem(date_str)
-            date_item.setFlags(date_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            date_item.setToolTip("Doppelklick zum Bearbeiten (Format: TT.MM.JJJJ)")
-            self.drinks_table.setItem(row, 3, date_item)
-            
-            # Zeit (editierbar)
-            time_str = drink['time'].strftime('%H:%M')
-            time_item = QTableWidgetItem(time_str)
-            time_item.setFlags(time_item.flags() | Qt.ItemFlag.ItemIsEditable)
-            time_item.setToolTip("Doppelklick zum Bearbeiten (Format: HH:MM)")
-            self.drinks_table.setItem(row, 4, time_item)
-            
-            # Alkohol in Gramm (nicht editierbar - automatisch berechnet)
-            try:
-                alcohol_grams = float(drink['volume']) * float(drink['alcohol_content']) / 100 * 0.789
-            except Exception:
-                alcohol_grams = 0.0
-            alcohol_item = QTableWidgetItem(f"{alcohol_grams:.1f} g")
-            alcohol_item.setFlags(alcohol_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            alcohol_item.setBackground(Qt.GlobalColor.lightGray)
-            alcohol_item.setToolTip("Automatisch berechnet: Volumen × Alkohol% × 0.789")
-            self.drinks_table.setItem(row, 5, alcohol_item)
-        
-        # Signal wieder connecten
-        self.drinks_table.cellChanged.connect(self.on_cell_changed)
-    
     def update_summary(self):
         """Aktualisiert die Zusammenfassung"""
-        if not self.drinks_data:
+        store = self.drink_store
+        if not len(store):
             self.alcohol_total_display.setText("Gesamtalkohol: 0.0 g")
             self.total_alcohol_label.setText("Gesamtalkohol: 0.0 g")
             self.drink_count_label.setText("Anzahl Getränke: 0")
             self.time_span_label.setText("Zeitspanne: --")
             return
         
-        # Gesamtalkohol berechnen
-        total_alcohol = sum(
-            drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
-            for drink in self.drinks_data
-        )
+        # Gesamtalkohol vektorisiert über die Spalten berechnen
+        total_alcohol = store.total_alcohol_grams()
         
         # Anzahl Getränke
-        drink_count = len(self.drinks_data)
+        drink_count = len(store)
         
         # Zeitspanne berechnen
         if drink_count > 1:
-            times = [drink['time'] for drink in self.drinks_data]
-            min_time = min(times)
-            max_time = max(times)
+            min_time, max_time = store.time_range()
             time_span = max_time - min_time
             
             # Zeitspanne korrekt berechnen (auch über mehrere Tage)
@@ -682,37 +765,14 @@ class DrinksWidget(QWidget):
     
     def get_drinks_data(self) -> List[Dict]:
         """Gibt die aktuellen Getränke-Daten zurück (immer float für volume und alcohol_content, time als datetime)"""
-        from datetime import datetime
-        drinks = []
-        for drink in self.drinks_data:
-            d = drink.copy()
-            # Korrigiere Typen
-            try:
-                d['volume'] = float(d['volume'])
-            except Exception:
-                d['volume'] = 0.0
-            try:
-                d['alcohol_content'] = float(d['alcohol_content'])
-            except Exception:
-                d['alcohol_content'] = 0.0
-            # Zeitfeld sicherstellen
-            if not isinstance(d['time'], datetime):
-                # Versuche verschiedene Formate
-                try:
-                    d['time'] = datetime.strptime(d['time'], '%d.%m.%Y %H:%M')
-                except Exception:
-                    try:
-                        d['time'] = datetime.fromisoformat(d['time'])
-                    except Exception:
-                        d['time'] = datetime.now()
-            drinks.append(d)
-        return drinks
+        # Typen werden bereits beim Einfügen in den Store normalisiert
+        return self.drink_store.rows()
     
     def set_drinks_data(self, data: List[Dict]):
         """Setzt die Getränke-Daten"""
-        self.drinks_data = data.copy()
-        self.update_table()
+        self.drinks_model.set_drinks(data)
         self.update_summary()
+        self.drinks_changed.emit(DrinkChange(ChangeKind.RESET, drinks=tuple(self.drink_store.rows())))
     
     def add_default_drinks(self):
         """Fügt Standard-Getränke für Tests hinzu"""
@@ -732,122 +792,17 @@ class DrinksWidget(QWidget):
             }
         ]
         
-        self.drinks_data.extend(default_drinks)
-        self.update_table()
+        rows = tuple(self.drinks_model.append_drink(drink) for drink in default_drinks)
         self.update_summary()
-        self.data_changed.emit()
+        self._emit_change(DrinkChange(ChangeKind.ADDED, rows=rows,
+                                      drinks=tuple(self.drink_store.row(row) for row in rows)))
 
-    def on_cell_changed(self, row, column):
-        """Reagiert auf Änderung einer Zelle"""
-        if row >= len(self.drinks_data):
-            return
-        
-        # Signal temporär disconnecten (robust)
-        try:
-            self.drinks_table.cellChanged.disconnect(self.on_cell_changed)
-        except TypeError:
-            pass
-        
-        try:
-            drink = self.drinks_data[row]
-            
-            if column == 0:  # Getränkename
-                new_name = self.drinks_table.item(row, column).text().strip()
-                if new_name:
-                    drink['name'] = new_name
-                else:
-                    # Ungültiger Name - zurücksetzen
-                    self.drinks_table.item(row, column).setText(drink['name'])
-            
-            elif column == 1:  # Menge
-                try:
-                    new_volume = float(self.drinks_table.item(row, column).text().replace(',', '.'))
-                    if 0 < new_volume <= 5000:  # Sinnvolle Grenzen
-                        drink['volume'] = new_volume
-                    else:
-                        raise ValueError("Volumen außerhalb des gültigen Bereichs")
-                except ValueError:
-                    # Ungültiger Wert - zurücksetzen
-                    self.drinks_table.item(row, column).setText(str(drink['volume']))
-                    QMessageBox.warning(self, "Ungültiger Wert", 
-                                      "Bitte geben Sie ein gültiges Volumen zwischen 1 und 5000 ml ein.")
-            
-            elif column == 2:  # Alkoholgehalt
-                try:
-                    new_alcohol = float(self.drinks_table.item(row, column).text().replace(',', '.'))
-                    if 0 <= new_alcohol <= 100:  # 0-100%
-                        drink['alcohol_content'] = new_alcohol
-                    else:
-                        raise ValueError("Alkoholgehalt außerhalb des gültigen Bereichs")
-                except ValueError:
-                    # Ungültiger Wert - zurücksetzen
-                    self.drinks_table.item(row, column).setText(str(drink['alcohol_content']))
-                    QMessageBox.warning(self, "Ungültiger Wert", 
-                                      "Bitte geben Sie einen gültigen Alkoholgehalt zwischen 0 und 100% ein.")
-            
-            elif column == 3:  # Datum
-                try:
-                    date_str = self.drinks_table.item(row, column).text().strip()
-                    # Versuche verschiedene Formate
-                    try:
-                        new_date = datetime.strptime(date_str, '%d.%m.%Y').date()
-                    except ValueError:
-                        try:
-                            new_date = datetime.strptime(date_str, '%d.%m.%y').date()
-                        except ValueError:
-                            new_date = datetime.strptime(date_str, '%d/%m/%Y').date()
-                    
-                    # Kombiniere mit bestehender Zeit
-                    old_time = drink['time'].time()
-                    drink['time'] = datetime.combine(new_date, old_time)
-                    
-                except ValueError:
-                    # Ungültiges Datum - zurücksetzen
-                    self.drinks_table.item(row, column).setText(drink['time'].strftime('%d.%m.%Y'))
-                    QMessageBox.warning(self, "Ungültiges Datum", 
-                                      "Bitte geben Sie ein gültiges Datum im Format TT.MM.JJJJ ein.")
-            
-            elif column == 4:  # Zeit
-                try:
-                    time_str = self.drinks_table.item(row, column).text().strip()
-                    new_time = datetime.strptime(time_str, '%H:%M').time()
-                    
-                    # Kombiniere mit bestehendem Datum
-                    old_date = drink['time'].date()
-                    drink['time'] = datetime.combine(old_date, new_time)
-                    
-                except ValueError:
-                    # Ungültige Zeit - zurücksetzen
-                    self.drinks_table.item(row, column).setText(drink['time'].strftime('%H:%M'))
-                    QMessageBox.warning(self, "Ungültige Zeit", 
-                                      "Bitte geben Sie eine gültige Zeit im Format HH:MM ein.")
-            
-            # Tabelle und Zusammenfassung aktualisieren
-            self.update_table()
-            self.update_summary()
-            # Typen für alle Getränke korrigieren
-            from datetime import datetime
-            for d in self.drinks_data:
-                try:
-                    d['volume'] = float(d['volume'])
-                except Exception:
-                    d['volume'] = 0.0
-                try:
-                    d['alcohol_content'] = float(d['alcohol_content'])
-                except Exception:
-                    d['alcohol_content'] = 0.0
-                if not isinstance(d['time'], datetime):
-                    try:
-                        d['time'] = datetime.strptime(d['time'], '%d.%m.%Y %H:%M')
-                    except Exception:
-                        try:
-                            d['time'] = datetime.fromisoformat(d['time'])
-                        except Exception:
-                            d['time'] = datetime.now()
-            self.data_changed.emit()
-            
-        except Exception as e:
-            print(f"Fehler beim Bearbeiten der Zelle: {e}")
-        finally:
-            # Signal wieder connecten
-            self.drinks_table.cellChanged.connect(self.on_cell_changed) 
\ No newline at end of file
+    def on_drink_edited(self, row: int, field: str):
+        """Reagiert auf die Bearbeitung einer Zelle"""
+        self.update_summary()
+        self._emit_change(DrinkChange(ChangeKind.UPDATED, rows=(row,), fields=(field,),
+                                      drinks=(self.drink_store.row(row),)))
+    
+    def on_validation_failed(self, title: str, message: str):
+        """Zeigt ungültige Eingaben an (der alte Wert bleibt erhalten)"""
+        QMessageBox.warning(self, title, message)
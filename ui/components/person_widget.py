@@ -3,11 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont
 
+from models import PersonChange
+
 class PersonDataWidget(QWidget):
     """Widget für die Eingabe von Personendaten"""
     
     # Signale für Datenänderungen
     data_changed = pyqtSignal()
+    field_changed = pyqtSignal(object)  # PersonChange
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -286,6 +289,18 @@ Der BMI korreliert mit der Körperzusammensetzung:<br>
         self.body_fat_slider.valueChanged.connect(self.update_body_fat_label)
         self.body_fat_slider.valueChanged.connect(self.data_changed.emit)
         self.habit_combo.currentTextChanged.connect(self.data_changed.emit)
+        
+        # Typisierte Feldänderungen
+        self._connect_field(self.gender_combo.currentTextChanged, 'gender')
+        self._connect_field(self.age_spin.valueChanged, 'age')
+        self._connect_field(self.height_spin.valueChanged, 'height')
+        self._connect_field(self.weight_spin.valueChanged, 'weight')
+        self._connect_field(self.body_fat_slider.valueChanged, 'body_fat')
+        self._connect_field(self.habit_combo.currentTextChanged, 'drinking_habit')
+    
+    def _connect_field(self, signal, field: str):
+        """Leitet ein Widget-Signal als PersonChange weiter"""
+        signal.connect(lambda value, f=field: self.field_changed.emit(PersonChange(f, value)))
     
     def set_default_values(self):
         """Setzt Standardwerte"""
@@ -1,8 +1,9 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox,
                             QScrollArea, QPushButton, QSplitter, QTabWidget, QTextEdit,
-                            QDateEdit, QTimeEdit, QDoubleSpinBox, QComboBox)
-from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTime
+                            QDateEdit, QTimeEdit, QDoubleSpinBox, QComboBox, QTableView,
+                            QCheckBox, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTime, QThread, QTimer
 from PyQt6.QtGui import QFont, QPalette
 from typing import Dict, List, Any
 from datetime import datetime, date, time
@@ -11,13 +12,72 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.dates as mdates
 
+from bak_core.curve import evaluate_bac_window
+from utils.chart_renderer import ChartModel, MatplotlibChartBackend, SCREEN_LIMITS, get_chart_style
+from ui.components.contribution_table_model import ContributionTableModel
+from utils.report_templates import NO_CALCULATION_TEXT, render_detail_html, render_validation_html
+from ui.styles.theme_manager import set_style_property
+
+class ZoomEvaluationThread(QThread):
+    """Thread für die feine Neuberechnung eines gezoomten Zeitfensters"""
+    
+    evaluation_finished = pyqtSignal(object, object)  # Zoom-Schlüssel, {Modell: (Zeiten, Werte)}
+    
+    def __init__(self, zoom_key, jobs: Dict, start: datetime, end: datetime, num_points: int):
+        super().__init__()
+        self.zoom_key = zoom_key
+        self.jobs = jobs
+        self.start_time = start
+        self.end_time = end
+        self.num_points = num_points
+    
+    def run(self):
+        """Wertet alle Modelle im Fenster aus"""
+        curves = {}
+        for model, (contributions, elimination_rate) in self.jobs.items():
+            curves[model] = evaluate_bac_window(
+                contributions, elimination_rate, self.start_time, self.end_time, self.num_points
+            )
+        self.evaluation_finished.emit(self.zoom_key, curves)
+
 class BAKChartWidget(QWidget):
-    """Widget für BAK-Verlaufsdiagramm"""
+    """Widget für BAK-Verlaufsdiagramm mit Zoom (Mausrad) und Pan (Ziehen)
+    
+    Beim Zoomen wird nur das sichtbare Zeitfenster in Pixelauflösung neu
+    berechnet (im Hintergrund) und pro Zoomstufe gecacht. Doppelklick setzt
+    die Ansicht zurück.
+    """
+    
+    # Zoomfaktor pro Mausrad-Schritt
+    ZOOM_STEP = 0.8
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_ui()
         self.chart_data = {}
+        
+        # Zoom-Zustand
+        self._handle = None
+        self._ax = None
+        self._lines = {}
+        self._coarse_data = {}
+        self._full_xlim = None
+        self._pan_origin = None
+        self._generation = 0
+        
+        # Gemeinsame Chart-Pipeline (Bildschirm-Style)
+        self.backend = MatplotlibChartBackend(get_chart_style('screen'))
+        self._zoom_threads = []
+        
+        # Cache pro Zoomstufe: Breite -> (Fensteranfang, Fensterende, Kurven)
+        self.zoom_cache = {}
+        self.zoom_cache_limit = 20
+        
+        # Debounce Timer für die Feinberechnung
+        self.zoom_timer = QTimer()
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.timeout.connect(self._request_detail)
+        
+        self.setup_ui()
     
     def cleanup(self):
         """Räumt Matplotlib-Ressourcen auf"""
@@ -42,135 +102,195 @@ class BAKChartWidget(QWidget):
         
         layout.addWidget(self.canvas)
         
+        # Zoom- und Pan-Interaktion
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
+        
         # Initial leeres Chart
         self.clear_chart()
     
     def update_chart(self, results: Dict):
         """Aktualisiert das Diagramm mit neuen Daten"""
         self.chart_data = results
-        
-        # Chart leeren
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        handle = self._handle
+        self._reset_zoom_state()
         
         if not results:
-            ax.text(0.5, 0.5, 'Keine Daten verfügbar', 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, fontsize=14, color='gray')
+            self.backend.draw_message(self.figure, 'Keine Daten verfügbar', fontsize=14)
             self.canvas.draw()
             return
         
         # Datenstruktur validieren
         if not isinstance(results, dict):
-            ax.text(0.5, 0.5, 'Ungültige Datenstruktur', 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, fontsize=14, color='red')
+            self.backend.draw_message(self.figure, 'Ungültige Datenstruktur', color='red', fontsize=14)
             self.canvas.draw()
             return
         
-        # Farben für verschiedene Modelle
-        colors = ['#2196F3', '#FF9800', '#4CAF50', '#9C27B0']
+        model = ChartModel.from_results(results, limits=SCREEN_LIMITS, label_peaks=True)
+        print(f"Erfolgreich geplottet: {len(model.series)} von {len(results)} Modellen")
         
-        max_bac = 0
-        successful_plots = 0
-        
-        # Daten für jedes Modell plotten
-        for i, (model, result) in enumerate(results.items()):
-            if 'bac_values' not in result or not result['bac_values']:
-                print(f"WARNUNG: Keine BAC-Daten für Modell {model}")
-                continue
-            
-            # BAK-Werte extrahieren
-            bac_data = result['bac_values']
-            
-            # Robuste Datenextraktion
-            try:
-                times = []
-                bac_values = []
-                
-                for point in bac_data:
-                    if isinstance(point, (list, tuple)) and len(point) >= 2:
-                        time_val, bac_val = point[0], point[1]
-                        times.append(time_val)
-                        bac_values.append(float(bac_val))
-                
-                if not times or not bac_values:
-                    print(f"WARNUNG: Leere Daten nach Extraktion für {model}")
-                    continue
-                
-                print(f"DEBUG: {model} - {len(times)} Datenpunkte, BAK Range: {min(bac_values):.3f}-{max(bac_values):.3f}")
-                
-                # Linie plotten
-                color = colors[i % len(colors)]
-                peak_bac = result.get('peak_bac', max(bac_values) if bac_values else 0)
-                ax.plot(times, bac_values, label=f"{model} (Max: {peak_bac:.2f}‰)", 
-                       color=color, linewidth=2.5, marker='o', markersize=2)
-                
-                successful_plots += 1
-                
-                # Maximum für Y-Achse
-                if bac_values:
-                    max_bac = max(max_bac, max(bac_values))
-                    
-            except Exception as e:
-                print(f"FEHLER beim Plotten von {model}: {e}")
-                continue
+        # Gleiche Struktur (Modelle, Grenzwerte): nur Liniendaten tauschen
+        if self.backend.update(handle, model):
+            self.canvas.draw_idle()
+        else:
+            handle = self.backend.draw(self.figure, model)
+            self.canvas.draw()
         
-        print(f"Erfolgreich geplottet: {successful_plots} von {len(results)} Modellen")
-        print(f"Max BAC für Y-Achse: {max_bac}")
-        
-        # Rechtliche Grenzwerte hinzufügen
-        if max_bac > 0.001:  # Nur wenn wir echte Daten haben
-            ax.axhline(y=0.3, color='orange', linestyle='--', alpha=0.7, label='0.3‰ (Ordnungswidrigkeit)')
-            ax.axhline(y=0.5, color='red', linestyle='--', alpha=0.7, label='0.5‰ (Straftat)')
-            if max_bac > 1.0:
-                ax.axhline(y=1.1, color='darkred', linestyle='--', alpha=0.7, label='1.1‰ (Fahruntüchtigkeit)')
-        
-        # Chart formatieren
-        ax.set_xlabel('Zeit', fontsize=12)
-        ax.set_ylabel('BAK (‰)', fontsize=12)
-        ax.set_title('Blutalkoholkonzentrations-Verlauf', fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        
-        # Y-Achse formatieren
-        if max_bac > 0.001:
-            ax.set_ylim(0, max_bac * 1.15)  # 15% Puffer oben
+        if handle is not None:
+            self._handle = handle
+            self._ax = handle.ax
+            self._lines = handle.lines
+            self._coarse_data = {s.key: (s.times, s.values) for s in model.series}
+            self._full_xlim = handle.ax.get_xlim()
+    
+    def _reset_zoom_state(self):
+        """Verwirft Zoom-Zustand und Cache (neue Daten)"""
+        self._generation += 1
+        self._handle = None
+        self._ax = None
+        self._lines = {}
+        self._coarse_data = {}
+        self._full_xlim = None
+        self._pan_origin = None
+        self.zoom_cache.clear()
+        self.zoom_timer.stop()
+    
+    def is_zoomed(self) -> bool:
+        """Prüft, ob ein Ausschnitt angezeigt wird"""
+        if self._ax is None or self._full_xlim is None:
+            return False
+        x0, x1 = self._ax.get_xlim()
+        return (x1 - x0) < (self._full_xlim[1] - self._full_xlim[0]) * 0.999
+    
+    def _set_view(self, x0: float, x1: float):
+        """Setzt den sichtbaren Bereich (auf den Gesamtbereich begrenzt)"""
+        full0, full1 = self._full_xlim
+        width = min(x1 - x0, full1 - full0)
+        x0 = min(max(x0, full0), full1 - width)
+        self._ax.set_xlim(x0, x0 + width)
+        
+        # Beschriftung an die Zoomstufe anpassen
+        if self.is_zoomed():
+            locator = mdates.AutoDateLocator()
+            self._ax.xaxis.set_major_locator(locator)
+            self._ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
         else:
-            ax.set_ylim(0, 1.0)  # Fallback
-        
-        # X-Achse formatieren (Zeit) - Robuster Ansatz
-        if successful_plots > 0:
-            try:
-                # Versuche matplotlib dates formatting
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-                ax.xaxis.set_major_locator(mdates.HourLocator(interval=1))
-                self.figure.autofmt_xdate()  # Rotiere Datum-Labels
-            except Exception as e:
-                print(f"WARNUNG: Datums-Formatierung fehlgeschlagen: {e}")
-                # Fallback: Einfache Formatierung
-                pass
-        
-        # Legend nur wenn wir Daten haben
-        if successful_plots > 0:
-            ax.legend(loc='upper right', fontsize=10)
-        
-        # Layout optimieren
-        self.figure.tight_layout()
-        self.canvas.draw()
+            self.backend.apply_time_axis(self._ax)
+        self.canvas.draw_idle()
+        self.zoom_timer.start(150)
+    
+    def reset_zoom(self):
+        """Stellt die Gesamtansicht wieder her"""
+        if self._ax is None:
+            return
+        self._set_view(*self._full_xlim)
+    
+    def on_scroll(self, event):
+        """Zoomt um die Mausposition"""
+        if self._ax is None or event.inaxes is not self._ax or event.xdata is None:
+            return
+        x0, x1 = self._ax.get_xlim()
+        factor = self.ZOOM_STEP if event.button == 'up' else 1 / self.ZOOM_STEP
+        # Minimal 5 Minuten sichtbar
+        new_width = max((x1 - x0) * factor, 5 / (24 * 60))
+        ratio = (event.xdata - x0) / (x1 - x0)
+        new_x0 = event.xdata - ratio * new_width
+        self._set_view(new_x0, new_x0 + new_width)
+    
+    def on_press(self, event):
+        """Startet das Verschieben bzw. setzt per Doppelklick zurück"""
+        if self._ax is None or event.inaxes is not self._ax:
+            return
+        if event.dblclick:
+            self.reset_zoom()
+            return
+        if event.button == 1:
+            self._pan_origin = (event.x, self._ax.get_xlim())
+    
+    def on_motion(self, event):
+        """Verschiebt den sichtbaren Ausschnitt"""
+        if self._pan_origin is None or event.x is None:
+            return
+        press_x, (x0, x1) = self._pan_origin
+        data_per_pixel = (x1 - x0) / max(self._ax.bbox.width, 1)
+        shift = -(event.x - press_x) * data_per_pixel
+        self._set_view(x0 + shift, x1 + shift)
+    
+    def on_release(self, event):
+        """Beendet das Verschieben"""
+        self._pan_origin = None
+    
+    def _request_detail(self):
+        """Fordert die Feinberechnung des sichtbaren Fensters an"""
+        if self._ax is None:
+            return
+        if not self.is_zoomed():
+            self._apply_curves(self._coarse_data, detailed=False)
+            return
+        
+        x0, x1 = self._ax.get_xlim()
+        width = x1 - x0
+        num_points = max(50, int(self._ax.bbox.width))
+        level_key = (round(width, 9), num_points)
+        
+        # Passender Cache-Eintrag für diese Zoomstufe?
+        cached = self.zoom_cache.get(level_key)
+        if cached and cached[0] <= x0 and x1 <= cached[1]:
+            self._apply_curves(cached[2], detailed=True)
+            return
+        
+        jobs = {}
+        for model, result in self.chart_data.items():
+            if model in self._lines and result.get('drink_contributions'):
+                jobs[model] = (result['drink_contributions'], result.get('elimination_rate', 0.15))
+        if not jobs:
+            return
         
-        print("=== Chart Update Complete ===\n")
+        # Fenster links und rechts um eine Breite erweitern, damit Pan aus dem Cache bedient wird
+        full0, full1 = self._full_xlim
+        window0 = max(full0, x0 - width)
+        window1 = min(full1, x1 + width)
+        points = int(num_points * (window1 - window0) / width)
+        start = mdates.num2date(window0).replace(tzinfo=None)
+        end = mdates.num2date(window1).replace(tzinfo=None)
+        
+        thread = ZoomEvaluationThread((self._generation, level_key, window0, window1), jobs, start, end, points)
+        thread.evaluation_finished.connect(self._on_detail_ready)
+        thread.finished.connect(lambda t=thread: self._zoom_threads.remove(t) if t in self._zoom_threads else None)
+        self._zoom_threads.append(thread)
+        thread.start()
+    
+    def _on_detail_ready(self, zoom_key, curves):
+        """Übernimmt das Ergebnis der Feinberechnung"""
+        generation, level_key, window0, window1 = zoom_key
+        if generation != self._generation:
+            return  # Veraltete Daten
+        
+        # Cache-Limit prüfen (FIFO)
+        if level_key not in self.zoom_cache and len(self.zoom_cache) >= self.zoom_cache_limit:
+            oldest_key = next(iter(self.zoom_cache))
+            del self.zoom_cache[oldest_key]
+        self.zoom_cache[level_key] = (window0, window1, curves)
+        
+        # Nur anwenden, wenn die Ansicht noch passt
+        self._request_detail()
+    
+    def _apply_curves(self, curves: Dict, detailed: bool):
+        """Ersetzt die Liniendaten ohne das Diagramm neu aufzubauen"""
+        for model, (times, values) in curves.items():
+            line = self._lines.get(model)
+            if line is None:
+                continue
+            line.set_data(times, values)
+            line.set_marker('' if detailed else 'o')
+        self.canvas.draw_idle()
     
     def clear_chart(self):
         """Leert das Diagramm"""
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.text(0.5, 0.5, 'Keine Berechnungen verfügbar\n\nGeben Sie Personendaten und Getränke ein, um Ergebnisse zu sehen', 
-               horizontalalignment='center', verticalalignment='center',
-               transform=ax.transAxes, fontsize=12, color='gray')
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.set_xticks([])
-        ax.set_yticks([])
+        self._reset_zoom_state()
+        self.backend.draw_message(self.figure, 'Keine Berechnungen verfügbar\n\nGeben Sie Personendaten und Getränke ein, um Ergebnisse zu sehen')
         self.canvas.draw()
     
     def get_chart_data(self):
@@ -180,6 +300,29 @@ class BAKChartWidget(QWidget):
 class ResultsWidget(QWidget):
     """Widget für die Anzeige der Berechnungsergebnisse inkl. ausführlicher Berechnung"""
     
+    # Stylesheets mit allen BAK-Stufen, werden nur einmal gesetzt;
+    # Updates wechseln lediglich die Property bacLevel
+    CURRENT_BAC_STYLE = """
+        QLabel {
+            color: #2196F3;
+            background-color: #E3F2FD;
+            border-radius: 8px;
+            padding: 20px;
+            margin: 10px;
+        }
+        QLabel[bacLevel="low"] { color: #8BC34A; background-color: rgba(139, 195, 74, 0.125); }
+        QLabel[bacLevel="warning"] { color: #FF9800; background-color: rgba(255, 152, 0, 0.125); }
+        QLabel[bacLevel="danger"] { color: #F44336; background-color: rgba(244, 67, 54, 0.125); }
+        QLabel[bacLevel="critical"] { color: #B71C1C; background-color: rgba(183, 28, 28, 0.125); }
+    """
+    STATUS_STYLE = """
+        QLabel { color: #4CAF50; margin: 5px; }
+        QLabel[bacLevel="low"] { color: #8BC34A; }
+        QLabel[bacLevel="warning"] { color: #FF9800; }
+        QLabel[bacLevel="danger"] { color: #F44336; }
+        QLabel[bacLevel="critical"] { color: #B71C1C; }
+    """
+    
     # Signale
     export_requested = pyqtSignal(str)  # Export-Typ
     validation_requested = pyqtSignal(dict)  # Validierungsanfrage
@@ -187,6 +330,11 @@ class ResultsWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.results_data = {}
+        # Zurückgestellte Berichte (werden beim Anzeigen des Tabs gerendert)
+        self._detail_results = None
+        self._detail_dirty = False
+        self._validation_result = None
+        self._validation_dirty = False
         self.setup_ui()
     
     def setup_ui(self):
@@ -247,10 +395,14 @@ class ResultsWidget(QWidget):
         # Tab 2: Ausführliche Berechnung
         self.detail_tab = QWidget()
         detail_layout = QVBoxLayout(self.detail_tab)
+        detail_splitter = QSplitter(Qt.Orientation.Vertical)
         self.detail_text = QTextEdit()
         self.detail_text.setReadOnly(True)
         self.detail_text.setFont(QFont("Inter", 12))
-        detail_layout.addWidget(self.detail_text)
+        detail_splitter.addWidget(self.detail_text)
+        detail_splitter.addWidget(self.create_contribution_section())
+        detail_splitter.setSizes([600, 400])
+        detail_layout.addWidget(detail_splitter)
         self.tabs.addTab(self.detail_tab, "Ausführliche Berechnung")
         
         # Tab 3: BAK-Controller (Forensische Validierung)
@@ -258,8 +410,77 @@ class ResultsWidget(QWidget):
         self.setup_controller_tab()
         self.tabs.addTab(self.controller_tab, "BAK-Controller")
         
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         layout.addWidget(self.tabs)
     
+    def create_contribution_section(self):
+        """Erstellt die virtualisierte Einzelgetränk-Tabelle"""
+        group = QGroupBox("🍺 Einzelgetränk-Analyse")
+        group.setFont(QFont("Inter", 12, QFont.Weight.Bold))
+        layout = QVBoxLayout(group)
+        
+        # Modellauswahl und Filter
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Modell:"))
+        self.contribution_model_combo = QComboBox()
+        self.contribution_model_combo.currentTextChanged.connect(self.on_contribution_model_changed)
+        controls_layout.addWidget(self.contribution_model_combo)
+        self.active_only_check = QCheckBox("Nur noch wirksame Getränke")
+        self.active_only_check.toggled.connect(self.on_active_only_toggled)
+        controls_layout.addWidget(self.active_only_check)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+        
+        # Tabelle: Qt zeichnet nur sichtbare Zeilen, Werte entstehen erst bei data()
+        self.contribution_model = ContributionTableModel(self)
+        self.contribution_table = QTableView()
+        self.contribution_table.setFont(QFont("Inter", 11))
+        self.contribution_table.setModel(self.contribution_model)
+        self.contribution_table.setSortingEnabled(True)
+        self.contribution_table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.contribution_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.contribution_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.contribution_table.verticalHeader().setVisible(False)
+        # Feste Zeilenhöhe, damit Qt keine Zeilen zur Größenbestimmung vermessen muss
+        self.contribution_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.contribution_table.verticalHeader().setDefaultSectionSize(24)
+        self.contribution_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.contribution_table)
+        
+        self.contribution_sum_label = QLabel("Summe aller Einzelbeiträge: --")
+        self.contribution_sum_label.setFont(QFont("Inter", 11))
+        layout.addWidget(self.contribution_sum_label)
+        
+        return group
+    
+    def update_contribution_view(self, results: Dict):
+        """Aktualisiert Modellauswahl und Einzelgetränk-Tabelle"""
+        current = self.contribution_model_combo.currentText()
+        self.contribution_model_combo.blockSignals(True)
+        self.contribution_model_combo.clear()
+        self.contribution_model_combo.addItems(list(results.keys()))
+        if current in results:
+            self.contribution_model_combo.setCurrentText(current)
+        self.contribution_model_combo.blockSignals(False)
+        self.on_contribution_model_changed(self.contribution_model_combo.currentText())
+    
+    def on_contribution_model_changed(self, model: str):
+        """Zeigt die Einzelgetränke des gewählten Modells"""
+        result = self.results_data.get(model) if self.results_data else None
+        self.contribution_model.set_result(result)
+        if not result:
+            self.contribution_sum_label.setText("Summe aller Einzelbeiträge: --")
+            return
+        self.contribution_sum_label.setText(
+            f"Summe aller Einzelbeiträge: {self.contribution_model.total_current_contribution():.3f} ‰ | "
+            f"Berechnete Gesamt-BAK: {result.get('current_bac', 0):.3f} ‰ "
+            f"(minimale Abweichung durch Rundungsfehler ist normal)"
+        )
+    
+    def on_active_only_toggled(self, checked: bool):
+        """Filtert bereits eliminierte Getränke aus"""
+        self.contribution_model.set_active_only(checked)
+    
     def create_overview_section(self):
         """Erstellt den Übersichtsbereich"""
         widget = QWidget()
@@ -289,22 +510,14 @@ class ResultsWidget(QWidget):
         self.current_bac_display = QLabel("0.00 ‰")
         self.current_bac_display.setFont(QFont("Inter", 48, QFont.Weight.Bold))
         self.current_bac_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.current_bac_display.setStyleSheet("""
-            QLabel {
-                color: #2196F3;
-                background-color: #E3F2FD;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 10px;
-            }
-        """)
+        self.current_bac_display.setStyleSheet(self.CURRENT_BAC_STYLE)
         current_bac_layout.addWidget(self.current_bac_display)
         
         # Status-Anzeige
         self.status_label = QLabel("Nüchtern")
         self.status_label.setFont(QFont("Inter", 14, QFont.Weight.Bold))
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_label.setStyleSheet("color: #4CAF50; margin: 5px;")
+        self.status_label.setStyleSheet(self.STATUS_STYLE)
         current_bac_layout.addWidget(self.status_label)
         
         layout.addWidget(current_bac_group)
@@ -387,39 +600,26 @@ class ResultsWidget(QWidget):
         # Aktuelle BAK anzeigen
         self.current_bac_display.setText(f"{avg_current_bac:.2f} ‰")
         
-        # BAK-Status und Farbe
+        # BAK-Status und Farbstufe
         if avg_current_bac == 0.0:
             status_text = "Nüchtern"
-            status_color = "#4CAF50"
-            bac_color = "#2196F3"
+            level = "sober"
         elif avg_current_bac < 0.3:
             status_text = "Leicht alkoholisiert"
-            status_color = "#8BC34A"
-            bac_color = "#8BC34A"
+            level = "low"
         elif avg_current_bac < 0.5:
             status_text = "Ordnungswidrigkeit"
-            status_color = "#FF9800"
-            bac_color = "#FF9800"
+            level = "warning"
         elif avg_current_bac < 1.1:
             status_text = "Straftat"
-            status_color = "#F44336"
-            bac_color = "#F44336"
+            level = "danger"
         else:
             status_text = "Absolut fahruntüchtig"
-            status_color = "#B71C1C"
-            bac_color = "#B71C1C"
+            level = "critical"
         
         self.status_label.setText(status_text)
-        self.status_label.setStyleSheet(f"color: {status_color}; margin: 5px;")
-        self.current_bac_display.setStyleSheet(f"""
-            QLabel {{
-                color: {bac_color};
-                background-color: {bac_color}20;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 10px;
-            }}
-        """)
+        set_style_property(self.status_label, 'bacLevel', level)
+        set_style_property(self.current_bac_display, 'bacLevel', level)
         
         # Zusammenfassung aktualisieren
         self.update_summary(results)
@@ -432,6 +632,7 @@ class ResultsWidget(QWidget):
         
         # Ausführliche Berechnung aktualisieren
         self.update_detail_tab(results)
+        self.update_contribution_view(results)
     
     def update_summary(self, results: Dict):
         """Aktualisiert die Zusammenfassung"""
@@ -512,18 +713,10 @@ class ResultsWidget(QWidget):
         
         # BAK-Display zurücksetzen
         self.current_bac_display.setText("N/A")
-        self.current_bac_display.setStyleSheet("""
-            QLabel {
-                color: #2196F3;
-                background-color: #E3F2FD;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 10px;
-            }
-        """)
+        set_style_property(self.current_bac_display, 'bacLevel', "sober")
         
         self.status_label.setText("N/A")
-        self.status_label.setStyleSheet("color: #4CAF50; margin: 5px;")
+        set_style_property(self.status_label, 'bacLevel', "sober")
         
         # Zusammenfassung zurücksetzen
         self.peak_bac_label.setText("Max. BAK: N/A")
@@ -537,7 +730,8 @@ class ResultsWidget(QWidget):
         self.chart_widget.clear_chart()
         
         # Ausführliche Berechnung aktualisieren
-        self.detail_text.setPlainText("Keine Berechnung möglich. Bitte geben Sie alle erforderlichen Daten ein.")
+        self.update_detail_tab({})
+        self.update_contribution_view({})
     
     def get_results_data(self) -> Dict:
         """Gibt die aktuellen Ergebnisse zurück"""
@@ -548,310 +742,32 @@ class ResultsWidget(QWidget):
         return self.chart_widget.get_chart_data()
 
     def update_detail_tab(self, results: Dict):
+        """Merkt die Ergebnisse für die ausführliche Berechnung vor
+
+        Das HTML wird erst erzeugt, wenn der Tab sichtbar ist.
+        """
         if not results:
-            self.detail_text.setPlainText("Keine Berechnung möglich. Bitte geben Sie alle erforderlichen Daten ein.")
+            self._detail_results = None
+            self._detail_dirty = False
+            self.detail_text.setPlainText(NO_CALCULATION_TEXT)
             return
-        
-        # HTML-formatierte ausführliche Berechnung
-        html_content = """
-        <h2>📊 Wissenschaftliche BAK-Berechnung</h2>
-        <p><i>Evidenzbasierte Pharmakodynamik und forensische Alkoholkennzeichnung nach internationalen Standards</i></p>
-        
-        <h3>📚 Wissenschaftliche Grundlagen</h3>
-        <p>Die Blutalkoholkonzentrations-Berechnung basiert auf etablierten pharmakokinetischen Modellen der forensischen Toxikologie. 
-        Alle implementierten Algorithmen entsprechen den Richtlinien der <b>International Association of Forensic Sciences (IAFS)</b> 
-        und der <b>Society of Forensic Toxicologists (SOFT)</b>.</p>
-        
-        <h4>🔬 Pharmakokinetische Grundprinzipien</h4>
-        <ul>
-            <li><b>ADME-Prozess:</b> Absorption → Distribution → Metabolism → Excretion</li>
-            <li><b>Verteilungsvolumen:</b> Körperwasser-abhängig (50-70% Körpergewicht)</li>
-            <li><b>Elimination:</b> First-Order-Kinetik, 90-95% hepatisch (ADH/ALDH)</li>
-            <li><b>Linearität:</b> Michaelis-Menten-Kinetik bei hohen Konzentrationen</li>
-        </ul>
-        """
-        
-        for model, result in results.items():
-            html_content += f"""
-            <hr style="margin: 20px 0;">
-            <h3>🧬 {model}-Modell</h3>
-            """
-            
-            # Ausführliche Modell-Beschreibungen mit Referenzen
-            model_info = {
-                'Widmark': {
-                    'beschreibung': 'Das klassische Widmark-Modell (1932) bildet das Fundament der forensischen Alkoholtoxikologie.',
-                    'formel': 'C = A / (m × r)',
-                    'parameter': 'C = BAK (‰), A = Alkohol (g), m = Körpergewicht (kg), r = Verteilungsfaktor',
-                    'referenzen': [
-                        '<a href="https://link.springer.com/chapter/10.1007/978-3-662-48986-4_3318">Widmark, E.M.P. (1932). Die theoretischen Grundlagen und die praktische Verwendbarkeit der gerichtlich-medizinischen Alkoholbestimmung. Urban & Schwarzenberg</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/10456393/">Jones, A.W. & Norberg, A. (1999). What constitutes a "drink"? Alcohol Alcohol 34:581-599</a>',
-                        '<a href="https://doi.org/10.1111/j.1530-0277.2006.00155.x">Brick, J. (2006). Standardization of alcohol calculations in research. Alcohol Clin Exp Res 30:1276-1287</a>'
-                    ]
-                },
-                'Watson': {
-                    'beschreibung': 'Das Watson-Modell (1981) berücksichtigt geschlechts- und altersspezifische Unterschiede in der Körperzusammensetzung.',
-                    'formel': 'TBW = f(Alter, Größe, Gewicht, Geschlecht)',
-                    'parameter': 'TBW = Total Body Water, anthropometrische Regression',
-                    'referenzen': [
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/7361681/">Watson, P.E. et al. (1980). Total body water volumes for adult males and females. Am J Clin Nutr 33:27-39</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/11350103/">Chumlea, W.C. et al. (2001). Total body water data for white adults 18 to 64 years. Kidney Int 59:2250-2258</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/23525478/">Silva, A.M. et al. (2013). Total body water and its compartments are not affected by lean mass in older adults. J Gerontol A Biol Sci Med Sci 68:1016-1021</a>'
-                    ]
-                },
-                'Forrest': {
-                    'beschreibung': 'Das Forrest-Modell (1986) erweitert Widmark um altersabhängige Korrekturfaktoren.',
-                    'formel': 'r_korr = r_standard × (1 - 0.01 × (Alter - 20))',
-                    'parameter': 'Alterskorrektur ab 20 Jahren, 1% Reduktion pro Jahr',
-                    'referenzen': [
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/3775982/">Forrest, A.R.W. (1986). Non-linear kinetics of ethyl alcohol metabolism. J Forensic Leg Med 3:41-49</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/8963496/">Kalant, H. (1996). Current state of knowledge about the mechanisms of alcohol tolerance. Addict Biol 1:133-141</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/11505034/">Ramchandani, V.A. et al. (2001). A physiologically-based pharmacokinetic (PBPK) model for alcohol. Alcohol Clin Exp Res 25:1239-1244</a>'
-                    ]
-                },
-                'Seidl': {
-                    'beschreibung': 'Das Seidl-Modell (2000) ist eine moderne Weiterentwicklung mit verbesserter Präzision für forensische Anwendungen.',
-                    'formel': 'Multi-Parameter Regression mit Korrekturfaktoren',
-                    'parameter': 'Geschlecht, Alter, BMI, Trinkmuster, Genetik',
-                    'referenzen': [
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/11118635/">Seidl, S. et al. (2000). A theoretical approach to estimate blood alcohol concentration. Forensic Sci Int 114:1-8</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/12680815/">Hering, W. et al. (2003). Comparison of serum and whole blood alcohol measurements. J Anal Toxicol 27:123-126</a>',
-                        '<a href="https://pubmed.ncbi.nlm.nih.gov/17899210/">Ulrich, L. et al. (2008). Validation studies of forensic blood alcohol calculations. Int J Legal Med 122:35-42</a>'
-                    ]
-                }
-            }
-            
-            info = model_info.get(model, model_info['Widmark'])
-            
-            html_content += f"""
-            <h4>📖 Wissenschaftlicher Hintergrund</h4>
-            <p>{info['beschreibung']}</p>
-            
-            <h4>📐 Mathematisches Modell</h4>
-            <p><b>Grundformel:</b> <code>{info['formel']}</code></p>
-            <p><b>Parameter:</b> {info['parameter']}</p>
-            """
-            
-            # Eingesetzte Werte mit wissenschaftlichen Einheiten
-            html_content += """
-            <h4>📊 Quantitative Parameter</h4>
-            <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%;">
-            <tr style="background-color: #f0f0f0;">
-                <th>Parameter</th>
-                <th>Wert</th>
-                <th>Einheit</th>
-                <th>Wissenschaftliche Grundlage</th>
-            </tr>
-            """
-            
-            parameters = [
-                ('Alkoholmenge', f"{result.get('alcohol_grams', 0):.2f}", 'g C₂H₅OH', 'Gravimetrische Berechnung: V × ρ × α (OIML)'),
-                ('Körpergewicht', f"{result.get('person_weight', 0)}", 'kg', 'Anthropometrische Standardmessung'),
-                ('r-Faktor', f"{result.get('r_factor', 0):.3f}", 'L/kg', 'Geschlechtsspezifisch: ♂ 0.68±0.05, ♀ 0.55±0.05 (Gullberg & Jones, 1994)'),
-                ('Körperfett-Korrektur', f"{result.get('body_fat_factor', 1.0):.3f}", 'dimensionslos', 'Deurenberg-Korrektur für Magermasse'),
-                ('Eliminationsrate', f"{result.get('elimination_rate', 0.15):.3f}", '‰/h', 'Hepatische ADH/ALDH-Aktivität (Jones & Sternebring, 1992)')
-            ]
-            
-            for param, value, unit, basis in parameters:
-                html_content += f"""
-                <tr>
-                    <td><b>{param}</b></td>
-                    <td>{value}</td>
-                    <td>{unit}</td>
-                    <td>{basis}</td>
-                </tr>
-                """
-            
-            html_content += "</table>"
-            
-            # Detaillierte Berechnung mit Formeln
-            calculation_details = result.get('calculation_details', {})
-            individual_contributions = result.get('individual_contributions', [])
-            
-            if calculation_details:
-                html_content += """
-                <h4>🧮 Berechnungsschritte</h4>
-                <ol>
-                """
-                
-                steps = [
-                    ('Alkoholmengen-Bestimmung', 'Σ(Volumen_i × Alkoholgrad_i × 0.789)', 'Volumetrische Summation aller Getränke'),
-                    ('Verteilungsvolumen', calculation_details.get('zwischenschritt_1', ''), 'Widmark-Grundformel'),
-                    ('Einzelgetränk-Berechnung', calculation_details.get('individual_peaks', ''), 'Separate Pharmakodynamik je Getränk'),
-                    ('Körperfett-Korrektur', calculation_details.get('körperfett_korrektur', ''), 'Magermasse-Adjustierung'),
-                    ('Gesamtkurve', 'Σ(BAK_einzelgetränk_i(t))', 'Summation aller Einzelkurven über Zeit')
-                ]
-                
-                for i, (titel, formel, erklärung) in enumerate(steps, 1):
-                    html_content += f"""
-                    <li><b>{titel}:</b><br>
-                        <code>{formel}</code><br>
-                        <i>{erklärung}</i>
-                    </li>
-                    """
-                
-                html_content += "</ol>"
-            
-            # Einzelgetränk-Details anzeigen
-            if individual_contributions:
-                html_content += """
-                <h4>🍺 Einzelgetränk-Analyse</h4>
-                <p>Jedes Getränk wird separat mit eigener Resorptions- und Eliminationskurve berechnet:</p>
-                
-                <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; font-size: 11px;">
-                <tr style="background-color: #e3f2fd;">
-                    <th>Nr.</th>
-                    <th>Alkohol (g)</th>
-                    <th>Konsumzeit</th>
-                    <th>Peak-BAK</th>
-                    <th>Peak-Zeit</th>
-                    <th>Resorption</th>
-                    <th>Aktueller Beitrag</th>
-                </tr>
-                """
-                
-                total_current_contribution = 0
-                for contrib in individual_contributions:
-                    total_current_contribution += contrib['current_contribution']
-                    
-                    # Farbe basierend auf aktuellem Beitrag
-                    if contrib['current_contribution'] > 0.1:
-                        row_color = '#ffebee'  # Noch signifikant
-                    elif contrib['current_contribution'] > 0.01:
-                        row_color = '#fff3e0'  # Gering
-                    else:
-                        row_color = '#f1f8e9'  # Praktisch eliminiert
-                    
-                    html_content += f"""
-                    <tr style="background-color: {row_color};">
-                        <td><b>{contrib['drink_number']}</b></td>
-                        <td>{contrib['alcohol_grams']:.1f} g</td>
-                        <td>{contrib['consumption_time']}</td>
-                        <td>{contrib['peak_bac']:.3f} ‰</td>
-                        <td>{contrib['peak_time']}</td>
-                        <td>{contrib['resorption_duration']:.1f}h</td>
-                        <td><b>{contrib['current_contribution']:.3f} ‰</b></td>
-                    </tr>
-                    """
-                
-                html_content += f"""
-                </table>
-                
-                <div style="background-color: #e8f5e8; padding: 10px; margin-top: 10px; border-radius: 5px;">
-                <b>Summe aller Einzelbeiträge:</b> {total_current_contribution:.3f} ‰<br>
-                <b>Berechnete Gesamt-BAK:</b> {result.get('current_bac', 0):.3f} ‰<br>
-                <i>Minimale Abweichung durch Rundungsfehler ist normal</i>
-                </div>
-                
-                <h5>📈 Pharmakodynamische Prinzipien</h5>
-                <ul>
-                    <li><b>Resorptionszeit:</b> Abhängig von Alkoholmenge (10g: 30min, 20g: 45min, >20g: 60min)</li>
-                    <li><b>Peak-Timing:</b> Individuell je Getränk, nicht global</li>
-                    <li><b>Elimination:</b> First-Order-Kinetik ab Peak-Zeit</li>
-                    <li><b>Superposition:</b> Lineare Summation aller Einzelkurven</li>
-                </ul>
-                """
-            
-            # Ergebnisse mit Konfidenzintervallen
-            html_content += f"""
-            <h4>📋 Quantitative Ergebnisse</h4>
-            <div style="background-color: #f9f9f9; padding: 15px; border-left: 4px solid #2196F3;">
-            <ul>
-                <li><b>Peak-BAK:</b> {result.get('peak_bac', 0):.3f} ‰ ± 0.02 ‰ (95% CI)</li>
-                <li><b>Aktuelle BAK:</b> {result.get('current_bac', 0):.3f} ‰ ± 0.015 ‰</li>
-                <li><b>Peak-Zeit:</b> {result.get('peak_time', '--')} (Resorptionsmaximum)</li>
-                <li><b>Eliminationsdauer:</b> {result.get('elimination_time', '--')}</li>
-            """
-            
-            if result.get('time_to_03'):
-                html_content += f"<li><b>Fahrtüchtig ab:</b> {result.get('time_to_03').strftime('%H:%M')} Uhr (BAK < 0.5‰)</li>"
-            
-            if result.get('time_to_00'):
-                html_content += f"<li><b>Nüchtern ab:</b> {result.get('time_to_00').strftime('%H:%M')} Uhr (BAK ≈ 0.0‰)</li>"
-            
-            html_content += """
-            </ul>
-            </div>
-            """
-            
-            # Wissenschaftliche Referenzen für dieses Modell
-            html_content += """
-            <h4>📚 Wissenschaftliche Referenzen</h4>
-            <ol style="font-size: 11px;">
-            """
-            
-            for ref in info['referenzen']:
-                html_content += f"<li>{ref}</li>"
-            
-            html_content += "</ol>"
-        
-        # Methodologische Limitationen
-        html_content += """
-        <hr style="margin: 20px 0;">
-        <h3>⚠️ Methodologische Limitationen</h3>
-        <div style="background-color: #fff3cd; padding: 15px; border: 1px solid #ffeaa7;">
-        <h4>Modell-Unsicherheiten</h4>
-        <ul>
-            <li><b>Inter-individuelle Variabilität:</b> ±20-30% (Genetik, Enzymoproteine)</li>
-            <li><b>Intra-individuelle Faktoren:</b> Tageszeit, Stress, Medikamente</li>
-            <li><b>Resorptionskinetik:</b> Mageninhalt, Trinkgeschwindigkeit, CO₂</li>
-            <li><b>Analytische Präzision:</b> ±0.005-0.02‰ je nach Methode</li>
-        </ul>
-        </div>
-        
-        <h3>⚖️ Forensisch-rechtliche Grenzwerte</h3>
-        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%;">
-        <tr style="background-color: #f0f0f0;">
-            <th>BAK-Bereich</th>
-            <th>Rechtliche Konsequenz</th>
-            <th>Gesetzliche Grundlage</th>
-        </tr>
-        <tr>
-            <td>≥ 0.3 ‰</td>
-            <td>Ordnungswidrigkeit bei Auffälligkeiten</td>
-            <td>§ 24a StVG, § 316 StGB</td>
-        </tr>
-        <tr>
-            <td>≥ 0.5 ‰</td>
-            <td>Ordnungswidrigkeit, Bußgeld, Fahrverbot</td>
-            <td>§ 24a StVG</td>
-        </tr>
-        <tr>
-            <td>≥ 1.1 ‰</td>
-            <td>Absolute Fahruntüchtigkeit (Straftat)</td>
-            <td>§ 316 StGB</td>
-        </tr>
-        <tr>
-            <td>≥ 3.0 ‰</td>
-            <td>Lebensgefährliche Intoxikation</td>
-            <td>Medizinischer Notfall</td>
-        </tr>
-        </table>
-        
-        <h3>⚗️ Qualitätssicherung und Validierung</h3>
-        <p>Diese Software implementiert validierte Algorithmen nach:</p>
-        <ul>
-            <li><b>ISO/IEC 17025:</b> Allgemeine Anforderungen an Prüflaboratorien</li>
-            <li><b>SOFT Guidelines:</b> Society of Forensic Toxicologists</li>
-            <li><b>GTFCh Richtlinien:</b> Gesellschaft für Toxikologische und Forensische Chemie</li>
-            <li><b>EWDTS Standards:</b> European Workplace Drug Testing Society</li>
-        </ul>
-        
-        <p><b>🚨 Disclaimer:</b> Diese Berechnungen dienen ausschließlich wissenschaftlich-informativen Zwecken. 
-        Für forensische, medizinische oder rechtliche Entscheidungen sind ausschließlich laboranalytische 
-        Blutalkoholbestimmungen durch akkreditierte Institute maßgeblich. Die Entwickler übernehmen keine 
-        Haftung für Entscheidungen basierend auf diesen Berechnungen.</p>
-        
-        <hr>
-        <p style="font-size: 10px; color: #666;">
-        <b>Software-Version:</b> BAK-Kalkulator v2.0 | 
-        <b>Algorithmus-Basis:</b> Internationale forensische Standards | 
-        <b>Letzte Validierung:</b> 2024 | 
-        <b>Entwickelt nach:</b> Good Laboratory Practice (GLP)
-        </p>
-        """
-        
-        self.detail_text.setHtml(html_content)
+        self._detail_results = results
+        self._detail_dirty = True
+        self.render_visible_reports()
+
+    def on_tab_changed(self, index: int):
+        """Rendert zurückgestellte Berichte beim Wechsel auf ihren Tab"""
+        self.render_visible_reports()
+
+    def render_visible_reports(self):
+        """Rendert veraltete Berichte, sofern ihr Tab gerade angezeigt wird"""
+        current = self.tabs.currentWidget()
+        if current is self.detail_tab and self._detail_dirty:
+            self._detail_dirty = False
+            self.detail_text.setHtml(render_detail_html(self._detail_results))
+        elif current is self.controller_tab and self._validation_dirty:
+            self._validation_dirty = False
+            self.validation_results.setHtml(render_validation_html(self._validation_result))
 
     def setup_controller_tab(self):
         """Erstellt das BAK-Controller Tab für forensische Validierung"""
@@ -1183,155 +1099,6 @@ class ResultsWidget(QWidget):
 
     def display_validation_result(self, result):
         """Zeigt das Validierungsergebnis an"""
-        html_content = f"""
-        <h2>🔬 Forensische BAK-Validierung</h2>
-        <p><i>Wissenschaftliche Überprüfung der Konsumangaben gegen gemessene Blutalkoholkonzentration</i></p>
-        
-        <h3>📋 Eingabedaten</h3>
-        <div style="background-color: #f0f0f0; padding: 10px; border-radius: 5px;">
-        <b>Messzeitpunkt:</b> {result['measurement_datetime'].strftime('%d.%m.%Y um %H:%M')} Uhr<br>
-        <b>Gemessene BAK:</b> {result['measured_bac']:.3f} ‰<br>
-        <b>Analysemethode:</b> {result['method']}<br>
-        <b>Analytische Unsicherheit:</b> ±{result['analytical_uncertainty']:.3f} ‰
-        </div>
-        
-        <h3>📊 Modell-Vergleich</h3>
-        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; font-size: 11px;">
-        <tr style="background-color: #e3f2fd;">
-            <th>Modell</th>
-            <th>Vorhergesagt</th>
-            <th>Gemessen</th>
-            <th>Abweichung</th>
-            <th>95% KI</th>
-            <th>99% KI</th>
-            <th>Bewertung</th>
-        </tr>
-        """
-        
-        for model_name, model_result in result['model_results'].items():
-            # Farbe basierend auf Konsistenz
-            if model_result['assessment'] == 'consistent':
-                row_color = '#e8f5e8'
-            elif model_result['assessment'] == 'borderline':
-                row_color = '#fff3cd'
-            else:
-                row_color = '#f8d7da'
-            
-            html_content += f"""
-            <tr style="background-color: {row_color};">
-                <td><b>{model_name}</b></td>
-                <td>{model_result['predicted_bac']:.3f} ‰</td>
-                <td>{model_result['measured_bac']:.3f} ‰</td>
-                <td>{model_result['deviation_abs']:.3f} ‰<br>({model_result['deviation_rel']:.1f}%)</td>
-                <td>{model_result['ci_95_lower']:.3f} - {model_result['ci_95_upper']:.3f} ‰</td>
-                <td>{model_result['ci_99_lower']:.3f} - {model_result['ci_99_upper']:.3f} ‰</td>
-                <td><b>{model_result['consistency']}</b></td>
-            </tr>
-            """
-        
-        html_content += "</table>"
-        
-        # Gesamtbewertung
-        assessment = result['overall_assessment']
-        total = result['total_models']
-        
-        if "plausibel" in result['overall_conclusion']:
-            conclusion_color = "#d4edda"
-            conclusion_icon = "✅"
-        elif "falsch" in result['overall_conclusion']:
-            conclusion_color = "#f8d7da"
-            conclusion_icon = "❌"
-        else:
-            conclusion_color = "#fff3cd"
-            conclusion_icon = "⚠️"
-        
-        html_content += f"""
-        <h3>⚖️ Forensische Gesamtbewertung</h3>
-        <div style="background-color: {conclusion_color}; padding: 15px; border-radius: 8px; border-left: 5px solid #007bff;">
-        <h4>{conclusion_icon} {result['overall_conclusion']}</h4>
-        
-        <b>Statistische Übersicht:</b><br>
-        • Konsistente Modelle: {assessment['consistent']}/{total} ({assessment['consistent']/total*100:.0f}%)<br>
-        • Grenzwertige Modelle: {assessment['borderline']}/{total} ({assessment['borderline']/total*100:.0f}%)<br>
-        • Inkonsistente Modelle: {assessment['inconsistent']}/{total} ({assessment['inconsistent']/total*100:.0f}%)
-        </div>
-        
-        <h3>🧮 Wissenschaftliche Bewertungskriterien</h3>
-        <h4>📏 Konfidenzintervalle (KI)</h4>
-        <ul>
-            <li><b>99% KI:</b> Sehr hohe statistische Sicherheit - bei Übereinstimmung sind Angaben plausibel</li>
-            <li><b>95% KI:</b> Hohe statistische Sicherheit - Grenzbereich für forensische Bewertung</li>
-            <li><b>Außerhalb 95% KI:</b> Statistisch signifikante Abweichung - Angaben fraglich</li>
-        </ul>
-        
-        <h4>🔬 Unsicherheitsquellen</h4>
-        <ul>
-            <li><b>Analytische Unsicherheit:</b> Messgenauigkeit der BAK-Bestimmung</li>
-            <li><b>Modell-Unsicherheit:</b> Inter-individuelle pharmakodynamische Variabilität</li>
-            <li><b>Biologische Faktoren:</b> Resorption, Elimination, Genetik</li>
-            <li><b>Temporale Faktoren:</b> Zeitliche Interpolation zwischen Datenpunkten</li>
-        </ul>
-        
-        <h4>⚖️ Forensische Interpretation</h4>
-        <div style="background-color: #f9f9f9; padding: 10px; border-left: 3px solid #2196F3;">
-        """
-        
-        if "plausibel" in result['overall_conclusion']:
-            html_content += """
-            <b>Konsistente Ergebnisse:</b> Die gemessene BAK stimmt mit den angegebenen Konsummengen 
-            innerhalb der statistischen Unsicherheit überein. Die Angaben sind <b>plausibel</b> und 
-            wissenschaftlich nachvollziehbar.
-            """
-        elif "falsch" in result['overall_conclusion']:
-            html_content += """
-            <b>Inkonsistente Ergebnisse:</b> Die gemessene BAK weicht signifikant von den berechneten 
-            Werten ab. Die Konsumangaben sind mit hoher Wahrscheinlichkeit <b>unvollständig oder falsch</b>. 
-            Mögliche Ursachen: Nicht angegebener Alkoholkonsum, falsche Mengenangaben, oder unbekannte Getränke.
-            """
-        else:
-            html_content += """
-            <b>Grenzwertige Ergebnisse:</b> Die Übereinstimmung liegt im Grenzbereich der statistischen 
-            Unsicherheit. Eine eindeutige Bewertung ist <b>nicht möglich</b>. Weitere Ermittlungen oder 
-            zusätzliche Messungen könnten erforderlich sein.
-            """
-        
-        html_content += """
-        </div>
-        
-        <h3>📚 Wissenschaftliche Grundlagen</h3>
-        <h4>🔬 Pharmakodynamische Modellierung</h4>
-        <p>Die Validierung basiert auf etablierten pharmakokinetischen Modellen mit bekannten 
-        Unsicherheitsbereichen aus der forensischen Literatur:</p>
-        
-        <ul>
-            <li><b>Widmark-Modell:</b> ±25% inter-individuelle Variabilität (Jones & Neri, 1991)</li>
-            <li><b>Watson-Modell:</b> ±20% durch TBW-Korrektur (Norberg et al., 2003)</li>
-            <li><b>Forrest-Modell:</b> ±23% mit Alterskorrektur (Kalant, 1996)</li>
-            <li><b>Seidl-Modell:</b> ±18% moderne Multi-Parameter-Regression (Seidl et al., 2000)</li>
-        </ul>
-        
-        <h4>⚗️ Analytische Qualitätssicherung</h4>
-        <p>Berücksichtigung der methodenspezifischen Messunsicherheit nach ISO/IEC 17025:</p>
-        <ul>
-            <li><b>GC-FID:</b> ±0.002‰ (Goldstandard)</li>
-            <li><b>Enzymatisch:</b> ±0.005‰ (Klinische Routine)</li>
-            <li><b>Headspace-GC:</b> ±0.003‰ (Forensische Anwendung)</li>
-        </ul>
-        
-        <h3>⚠️ Rechtliche Hinweise</h3>
-        <div style="background-color: #fff3cd; padding: 10px; border: 1px solid #ffeaa7; border-radius: 5px;">
-        <b>🚨 Disclaimer:</b> Diese wissenschaftliche Analyse dient ausschließlich informativen Zwecken. 
-        Für rechtliche oder forensische Entscheidungen sind ausschließlich gerichtlich bestellte 
-        Sachverständige und akkreditierte Laboratorien zuständig. Die Bewertung erfolgt nach bestem 
-        wissenschaftlichen Wissen, ersetzt aber keine forensische Begutachtung.
-        </div>
-        
-        <hr>
-        <p style="font-size: 10px; color: #666;">
-        <b>Software:</b> BAK-Kalkulator v2.0 - Forensisches Validierungsmodul | 
-        <b>Algorithmus:</b> Multi-Model Confidence Interval Analysis | 
-        <b>Standards:</b> ISO/IEC 17025, SOFT Guidelines, GTFCh Richtlinien
-        </p>
-        """
-        
-        self.validation_results.setHtml(html_content) 
\ No newline at end of file
+        self._validation_result = result
+        self._validation_dirty = True
+        self.render_visible_reports()
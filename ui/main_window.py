@@ -1,23 +1,36 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QTabWidget, QLabel, QPushButton, QProgressBar,
                             QSplashScreen, QApplication, QMenuBar, QMenu, QToolBar,
-                            QStatusBar, QMessageBox)
+                            QStatusBar, QMessageBox, QInputDialog, QFileDialog)
 from PyQt6.QtCore import Qt, QTimer, pyqtSlot
-from PyQt6.QtGui import QFont, QPixmap, QAction, QIcon
+from PyQt6.QtGui import QFont, QPixmap, QAction, QIcon, QKeySequence
 
 from ui.components.person_widget import PersonDataWidget
 from ui.components.drinks_widget import DrinksWidget
 from ui.components.results_widget import ResultsWidget
 from ui.components.calculation_settings_widget import CalculationSettingsWidget
 from controllers.calculation_controller import CalculationController
+from models import ChangeKind
 from utils.export_manager import ExportManager
-from ui.styles.theme_manager import theme_manager, Theme, FontManager
+from utils.session_history import PersistentList, SessionHistory, SessionSnapshot
+from utils.session_file import SESSION_EXTENSION, SessionFile, read_session, write_session
+from utils.session_journal import SessionJournal, new_session_id, read_journal, replay
+from ui.styles.theme_manager import theme_manager, Theme, FontManager, set_style_property
 from datetime import datetime
+from typing import Optional
 import os
 
 class MainWindow(QMainWindow):
     """Moderne BAK-Calculator Hauptfenster-Klasse"""
     
+    # Farbstufen der Header-Anzeige, umgeschaltet über die Property bacLevel
+    HEADER_BAC_STYLE = """
+        QLabel { color: white; }
+        QLabel[bacLevel="low"] { color: #4CAF50; }
+        QLabel[bacLevel="warning"] { color: #FF9800; }
+        QLabel[bacLevel="danger"] { color: #F44336; }
+    """
+    
     def __init__(self):
         super().__init__()
         
@@ -25,9 +38,19 @@ class MainWindow(QMainWindow):
         self.calculation_controller = CalculationController()
         self.export_manager = ExportManager(self)
         
+        # Pfad der geöffneten bzw. zuletzt gespeicherten Sitzung und ihr
+        # Änderungsjournal (Änderungen werden sofort angehängt)
+        self.session_path: Optional[str] = None
+        self.journal: Optional[SessionJournal] = None
+        
         # Setup
         self.setup_window()
         self.setup_ui()
+        
+        # Rückgängig-Verlauf ab dem Ausgangsstand
+        self.history = SessionHistory(self.current_snapshot())
+        self.update_history_actions()
+        
         self.setup_connections()
         self.setup_theme()
         
@@ -140,7 +163,7 @@ class MainWindow(QMainWindow):
         
         self.bac_value_label = QLabel("0.00 ‰")
         self.bac_value_label.setFont(FontManager.get_font('h4', 'bold'))
-        self.bac_value_label.setStyleSheet("color: white;")
+        self.bac_value_label.setStyleSheet(self.HEADER_BAC_STYLE)
         self.bac_value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         layout.addWidget(title)
@@ -167,6 +190,11 @@ class MainWindow(QMainWindow):
         save_action.triggered.connect(self.save_calculation)
         file_menu.addAction(save_action)
         
+        save_as_action = QAction('Speichern unter...', self)
+        save_as_action.setShortcut('Ctrl+Shift+S')
+        save_as_action.triggered.connect(self.save_calculation_as)
+        file_menu.addAction(save_as_action)
+        
         load_action = QAction('Laden', self)
         load_action.setShortcut('Ctrl+O')
         load_action.triggered.connect(self.load_calculation)
@@ -189,6 +217,34 @@ class MainWindow(QMainWindow):
         excel_action.triggered.connect(self.export_excel)
         export_menu.addAction(excel_action)
         
+        excel_chart_action = QAction('Als Excel mit Verlauf und Diagramm...', self)
+        excel_chart_action.triggered.connect(self.export_excel_timeseries)
+        export_menu.addAction(excel_chart_action)
+        
+        export_menu.addSeparator()
+        
+        timeseries_action = QAction('Als Zeitreihe (CSV)...', self)
+        timeseries_action.triggered.connect(lambda: self.export_timeseries(False))
+        export_menu.addAction(timeseries_action)
+        
+        timeseries_detail_action = QAction('Als Zeitreihe mit Einzelgetränken (CSV)...', self)
+        timeseries_detail_action.triggered.connect(lambda: self.export_timeseries(True))
+        export_menu.addAction(timeseries_detail_action)
+        
+        binary_action = QAction('Als Binärdatei (NPZ/Parquet)...', self)
+        binary_action.triggered.connect(self.export_binary)
+        export_menu.addAction(binary_action)
+        
+        export_menu.addSeparator()
+        
+        batch_action = QAction('PDF-Berichte für Sitzungsverzeichnis...', self)
+        batch_action.triggered.connect(self.export_manager.export_batch_reports)
+        export_menu.addAction(batch_action)
+        
+        # Laufende Exporte einzeln abbrechen (Einträge beim Öffnen aktualisiert)
+        self.export_jobs_menu = file_menu.addMenu('Laufende Exporte')
+        self.export_jobs_menu.aboutToShow.connect(self.update_export_jobs_menu)
+        
         file_menu.addSeparator()
         
         exit_action = QAction('Beenden', self)
@@ -196,6 +252,19 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
+        # Bearbeiten-Menü
+        edit_menu = menubar.addMenu('Bearbeiten')
+        
+        self.undo_action = QAction('Rückgängig', self)
+        self.undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        self.undo_action.triggered.connect(self.undo)
+        edit_menu.addAction(self.undo_action)
+        
+        self.redo_action = QAction('Wiederholen', self)
+        self.redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        self.redo_action.triggered.connect(self.redo)
+        edit_menu.addAction(self.redo_action)
+        
         # Ansicht-Menü
         view_menu = menubar.addMenu('Ansicht')
         
@@ -315,14 +384,17 @@ class MainWindow(QMainWindow):
     
     def setup_connections(self):
         """Verbindet alle Signale und Slots"""
-        # Person Widget
-        self.person_widget.data_changed.connect(self.on_person_data_changed)
-        
-        # Drinks Widget
-        self.drinks_widget.data_changed.connect(self.on_drinks_data_changed)
-        
-        # Settings Widget
-        self.settings_widget.data_changed.connect(self.on_settings_data_changed)
+        # Typisierte Änderungen direkt an den Controller weiterreichen
+        self.person_widget.field_changed.connect(self.calculation_controller.apply_person_change)
+        self.drinks_widget.drinks_changed.connect(self.calculation_controller.apply_drink_change)
+        self.settings_widget.field_changed.connect(self.calculation_controller.apply_settings_change)
+        
+        # Jede Änderung als Schritt im Rückgängig-Verlauf
+        self.person_widget.field_changed.connect(self.on_person_field_changed)
+        self.drinks_widget.drinks_changed.connect(self.on_drinks_changed)
+        self.settings_widget.field_changed.connect(self.on_settings_field_changed)
+        self.drinks_widget.drinks_imported.connect(
+            lambda count: self.statusBar().showMessage(f"{count} Getränke importiert", 3000))
         
         # Calculation Controller
         self.calculation_controller.calculation_started.connect(self.on_calculation_started)
@@ -333,6 +405,7 @@ class MainWindow(QMainWindow):
         self.export_manager.export_started.connect(self.on_export_started)
         self.export_manager.export_progress.connect(self.progress_bar.setValue)
         self.export_manager.export_finished.connect(self.on_export_finished)
+        self.export_manager.batch_case_finished.connect(self.on_batch_case_finished)
         
         # Theme Manager
         theme_manager.theme_changed.connect(self.on_theme_changed)
@@ -350,22 +423,117 @@ class MainWindow(QMainWindow):
     # Slot-Methoden
     @pyqtSlot()
     def on_person_data_changed(self):
-        """Reagiert auf Änderungen der Personendaten"""
+        """Übergibt die vollständigen Personendaten an den Controller"""
         person_data = self.person_widget.get_person_data()
         self.calculation_controller.set_person_data(person_data)
     
     @pyqtSlot()
     def on_drinks_data_changed(self):
-        """Reagiert auf Änderungen der Getränkedaten"""
+        """Übergibt die vollständige Getränkeliste an den Controller"""
         drinks_data = self.drinks_widget.get_drinks_data()
         self.calculation_controller.set_drinks_data(drinks_data)
     
     @pyqtSlot()
     def on_settings_data_changed(self):
-        """Reagiert auf Änderungen der Berechnungseinstellungen"""
+        """Übergibt die vollständigen Einstellungen an den Controller"""
         settings_data = self.settings_widget.get_settings_data()
         self.calculation_controller.set_calculation_settings(settings_data)
     
+    def on_person_field_changed(self, change):
+        """Übernimmt eine Personenänderung in den Verlauf"""
+        self.history.record(self.history.current.with_person_change(change), ('person', change.field))
+        self.journal_change(change)
+        self.update_history_actions()
+    
+    def on_drinks_changed(self, change):
+        """Übernimmt eine Getränkeänderung in den Verlauf (nur geänderte Zeilen)"""
+        merge_key = ('drinks', change.rows, change.fields) if change.kind == ChangeKind.UPDATED else None
+        self.history.record(self.history.current.with_drink_change(change), merge_key)
+        self.journal_change(change)
+        self.update_history_actions()
+    
+    def on_settings_field_changed(self, change):
+        """Übernimmt eine Einstellungsänderung in den Verlauf"""
+        self.history.record(self.history.current.with_settings_change(change), ('settings', change.field))
+        self.journal_change(change)
+        self.update_history_actions()
+    
+    def journal_change(self, change=None):
+        """Hängt eine Änderung (ohne change: den ganzen Stand) an das Sitzungsjournal an"""
+        if self.journal is None:
+            return
+        try:
+            if change is None:
+                self.journal.append_state(self.history.current)
+            else:
+                self.journal.append_change(change)
+            if self.journal.needs_compaction():
+                self.journal.compact_async(self.history.current)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Fehler beim Schreiben des Sitzungsjournals: {e}")
+    
+    def close_journal(self, compact: bool = True):
+        """Schließt das Journal der aktuellen Sitzung (optional mit Kompaktierung)"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.close(self.history.current if compact else None)
+        except OSError as e:
+            print(f"Fehler beim Schließen des Sitzungsjournals: {e}")
+        self.journal = None
+    
+    def current_snapshot(self) -> SessionSnapshot:
+        """Erstellt einen Snapshot aus den aktuellen Eingaben"""
+        return SessionSnapshot(
+            person=self.person_widget.get_person_data(),
+            settings=self.settings_widget.get_settings_data(),
+            drinks=PersistentList(self.drinks_widget.get_drinks_data())
+        )
+    
+    def undo(self):
+        """Macht die letzte Änderung rückgängig"""
+        snapshot = self.history.undo()
+        if snapshot is not None:
+            self.restore_snapshot(snapshot)
+            self.journal_change()
+    
+    def redo(self):
+        """Stellt die zuletzt rückgängig gemachte Änderung wieder her"""
+        snapshot = self.history.redo()
+        if snapshot is not None:
+            self.restore_snapshot(snapshot)
+            self.journal_change()
+    
+    def restore_snapshot(self, snapshot: SessionSnapshot):
+        """Überträgt einen Snapshot in Eingaben und Controller
+        
+        Die Widgets senden dabei keine Änderungen; ein gespeichertes Ergebnis
+        wird direkt angezeigt statt neu berechnet.
+        """
+        widgets = (self.person_widget, self.drinks_widget, self.settings_widget)
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            self.person_widget.set_person_data(snapshot.person)
+            self.settings_widget.set_settings_data(snapshot.settings)
+            self.drinks_widget.set_drinks_data(list(snapshot.drinks))
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+        
+        self.calculation_controller.restore_state(snapshot.person, list(snapshot.drinks), snapshot.settings,
+                                                  snapshot.results, snapshot.result_key)
+        self.update_history_actions()
+    
+    def update_history_actions(self):
+        """Aktualisiert Text und Zustand der Rückgängig/Wiederholen-Aktionen"""
+        undo_label = self.history.undo_label()
+        redo_label = self.history.redo_label()
+        self.undo_action.setEnabled(self.history.can_undo())
+        self.undo_action.setText(f"Rückgängig: {undo_label}" if undo_label else "Rückgängig")
+        self.redo_action.setEnabled(self.history.can_redo())
+        self.redo_action.setText(f"Wiederholen: {redo_label}" if redo_label else "Wiederholen")
+    
     @pyqtSlot()
     def on_calculation_started(self):
         """Reagiert auf Beginn einer Berechnung"""
@@ -384,6 +552,9 @@ class MainWindow(QMainWindow):
         # Aktuelle BAK im Header aktualisieren
         self.update_current_bac_display(results)
         
+        # Ergebnis mit dem aktuellen Stand im Verlauf verknüpfen
+        self.history.attach_results(results, self.calculation_controller.last_cache_key)
+        
         # Cache-Info aktualisieren
         cache_info = self.calculation_controller.get_cache_info()
         self.cache_label.setText(f"Cache: {cache_info['size']}/{cache_info['limit']}")
@@ -406,10 +577,40 @@ class MainWindow(QMainWindow):
     
     @pyqtSlot(bool, str)
     def on_export_finished(self, success, message):
-        """Reagiert auf Export-Ende"""
-        self.progress_bar.setVisible(False)
+        """Reagiert auf das Ende eines Exports (weitere können noch laufen)"""
+        busy = self.export_manager.has_active_jobs()
+        self.progress_bar.setVisible(busy)
         self.statusBar().showMessage(message, 5000)
     
+    def update_export_jobs_menu(self):
+        """Füllt das Menü der laufenden Exporte mit je einer Abbrechen-Aktion"""
+        menu = self.export_jobs_menu
+        menu.clear()
+        jobs = self.export_manager.active_jobs()
+        batch_running = bool(self.export_manager.batch_thread and self.export_manager.batch_thread.isRunning())
+        if not jobs and not batch_running:
+            empty_action = menu.addAction('Keine laufenden Exporte')
+            empty_action.setEnabled(False)
+            return
+        for job_id, label, running in jobs:
+            text = f"{label} abbrechen" if running else f"{label} (wartet) abbrechen"
+            action = menu.addAction(text)
+            action.triggered.connect(lambda checked=False, job_id=job_id: self.export_manager.cancel_job(job_id))
+        if batch_running:
+            batch_action = menu.addAction('Stapelverarbeitung abbrechen')
+            batch_action.triggered.connect(self.export_manager.batch_thread.stop)
+        menu.addSeparator()
+        menu.addAction('Alle abbrechen', self.export_manager.cancel_all)
+    
+    @pyqtSlot(str, bool, str)
+    def on_batch_case_finished(self, session_path, success, message):
+        """Meldet das Ergebnis eines Falls der Stapelverarbeitung"""
+        name = os.path.basename(session_path)
+        if success:
+            self.statusBar().showMessage(f"Bericht erstellt: {name}")
+        else:
+            self.statusBar().showMessage(f"Bericht fehlgeschlagen: {name} ({message})")
+    
     @pyqtSlot(str)
     def on_theme_changed(self, theme_name):
         """Reagiert auf Theme-Änderung"""
@@ -419,6 +620,7 @@ class MainWindow(QMainWindow):
         """Aktualisiert die aktuelle BAK-Anzeige"""
         if not results:
             self.bac_value_label.setText("0.00 ‰")
+            set_style_property(self.bac_value_label, 'bacLevel', "sober")
             return
         
         # Nimm den ersten verfügbaren Wert
@@ -429,15 +631,15 @@ class MainWindow(QMainWindow):
         
         # Farbkodierung basierend auf BAK-Wert
         if current_bac == 0.0:
-            color = "white"
+            level = "sober"    # Weiß
         elif current_bac < 0.5:
-            color = "#4CAF50"  # Grün
+            level = "low"      # Grün
         elif current_bac < 1.1:
-            color = "#FF9800"  # Orange
+            level = "warning"  # Orange
         else:
-            color = "#F44336"  # Rot
+            level = "danger"   # Rot
         
-        self.bac_value_label.setStyleSheet(f"color: {color};")
+        set_style_property(self.bac_value_label, 'bacLevel', level)
     
     # Menu-Aktionen
     def new_calculation(self):
@@ -447,22 +649,129 @@ class MainWindow(QMainWindow):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.person_widget.set_default_values()
-            self.drinks_widget.clear_drinks()
-            self.settings_widget.set_default_values()
+            # Die neue Berechnung gehört nicht mehr zur geöffneten Sitzung
+            self.close_journal()
+            self.session_path = None
+            with self.history.group("Neue Berechnung"):
+                self.person_widget.set_default_values()
+                self.drinks_widget.clear_drinks()
+                self.settings_widget.set_default_values()
             self.results_widget.clear_results()
             self.bac_value_label.setText("0.00 ‰")
+            set_style_property(self.bac_value_label, 'bacLevel', "sober")
             self.statusBar().showMessage("Neue Berechnung gestartet", 2000)
     
     def save_calculation(self):
         """Speichert die aktuelle Berechnung"""
-        # TODO: Implementierung der Speicher-Funktion
-        self.statusBar().showMessage("Speicher-Funktion wird implementiert...", 3000)
+        if self.session_path is None:
+            self.save_calculation_as()
+        else:
+            self.write_session_file(self.session_path)
+    
+    def save_calculation_as(self):
+        """Speichert die aktuelle Berechnung unter einem neuen Namen"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Sitzung speichern",
+            self.session_path or f"BAK_Sitzung_{datetime.now().strftime('%Y%m%d_%H%M%S')}{SESSION_EXTENSION}",
+            f"BAK-Sitzungen (*{SESSION_EXTENSION})"
+        )
+        if file_path:
+            if not file_path.lower().endswith(SESSION_EXTENSION):
+                file_path += SESSION_EXTENSION
+            self.write_session_file(file_path)
+    
+    def write_session_file(self, file_path: str):
+        """Schreibt Eingaben und (falls aktuell) das Ergebnis in eine Sitzungsdatei
+        
+        Danach werden alle Änderungen im Journal der Datei fortgeschrieben.
+        """
+        # Der Verlaufsstand enthält das Ergebnis nur, wenn es zu ihm gehört
+        snapshot = self.history.current
+        try:
+            if self.journal is not None and self.journal.session_path == file_path:
+                self.journal.compact(snapshot)
+            else:
+                self.close_journal()
+                journal = SessionJournal(file_path, new_session_id())
+                try:
+                    journal.compact(snapshot)
+                except BaseException:
+                    journal.close()
+                    raise
+                self.journal = journal
+        except (OSError, ValueError, TypeError) as e:
+            QMessageBox.warning(self, "Speichern fehlgeschlagen",
+                                f"Die Sitzung konnte nicht gespeichert werden:\n\n{e}")
+            return
+        self.session_path = file_path
+        self.statusBar().showMessage(f"Sitzung gespeichert: {os.path.basename(file_path)}", 3000)
     
     def load_calculation(self):
-        """Lädt eine gespeicherte Berechnung"""
-        # TODO: Implementierung der Lade-Funktion
-        self.statusBar().showMessage("Lade-Funktion wird implementiert...", 3000)
+        """Lädt eine gespeicherte Berechnung
+        
+        Die Eingaben werden sofort angezeigt; das gespeicherte Ergebnis wird
+        danach gelesen und übernommen, sofern es zu den Eingaben passt.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Sitzung laden",
+            os.path.dirname(self.session_path) if self.session_path else "",
+            f"BAK-Sitzungen (*{SESSION_EXTENSION})"
+        )
+        if not file_path:
+            return
+        try:
+            session = read_session(file_path)
+            # Nicht eingearbeitete Änderungen aus dem Journal (z.B. nach Absturz)
+            records = read_journal(file_path, session.session_id, session.journal_seq)
+            snapshot = replay(SessionSnapshot(
+                person=session.person_data,
+                settings=session.settings_data,
+                drinks=PersistentList(session.drinks_data)
+            ), records)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            QMessageBox.warning(self, "Laden fehlgeschlagen",
+                                f"Die Sitzung konnte nicht geladen werden:\n\n{e}")
+            return
+        
+        snapshot = SessionSnapshot(person=snapshot.person, settings=snapshot.settings,
+                                   drinks=snapshot.drinks, label="Sitzung geladen")
+        self.close_journal()
+        self.history.reset(snapshot)
+        self.restore_snapshot(snapshot)
+        self.session_path = file_path
+        try:
+            seq = records[-1]['seq'] if records else session.journal_seq
+            if records:
+                # Wiederhergestellte Änderungen erst in die Sitzungsdatei
+                # übernehmen, bevor das Journal neu angelegt wird
+                write_session(file_path, snapshot.person, list(snapshot.drinks), snapshot.settings,
+                              session_id=session.session_id, journal_seq=seq)
+            self.journal = SessionJournal(file_path, session.session_id, seq)
+        except (OSError, ValueError, TypeError) as e:
+            self.journal = None
+            print(f"Sitzungsjournal kann nicht angelegt werden: {e}")
+        
+        if records:
+            self.statusBar().showMessage(
+                f"Sitzung geladen: {os.path.basename(file_path)} ({len(records)} Änderungen wiederhergestellt)", 5000)
+        else:
+            self.statusBar().showMessage(f"Sitzung geladen: {os.path.basename(file_path)}", 3000)
+            if session.has_results:
+                QTimer.singleShot(0, lambda: self.apply_session_results(session, snapshot))
+    
+    def apply_session_results(self, session: SessionFile, snapshot: SessionSnapshot):
+        """Übernimmt das gespeicherte Ergebnis einer geladenen Sitzung"""
+        if self.history.current is not snapshot:
+            return  # Inzwischen geändert, die Berechnung ist ohnehin angestoßen
+        try:
+            results = session.load_results()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Gespeichertes Ergebnis nicht lesbar, wird neu berechnet: {e}")
+            return
+        if results:
+            self.calculation_controller.adopt_results(results, session.cache_key)
     
     def export_pdf(self):
         """Exportiert als PDF"""
@@ -479,6 +788,35 @@ class MainWindow(QMainWindow):
         data = self.gather_export_data()
         self.export_manager.export_to_excel(data)
     
+    def ask_export_resolution(self) -> Optional[int]:
+        """Fragt die Auflösung eines Verlaufs-Exports ab (None bei Abbruch)"""
+        resolution, ok = QInputDialog.getInt(
+            self, "Zeitreihe exportieren", "Auflösung (Sekunden zwischen zwei Zeilen):",
+            60, 1, 3600
+        )
+        return resolution if ok else None
+    
+    def export_excel_timeseries(self):
+        """Exportiert als Excel mit BAK-Verlauf und nativem Diagramm"""
+        resolution = self.ask_export_resolution()
+        if resolution is None:
+            return
+        data = self.gather_export_data()
+        self.export_manager.export_to_excel(data, streaming=True, resolution_seconds=resolution)
+    
+    def export_timeseries(self, include_contributions: bool = False):
+        """Exportiert die vollständigen BAK-Verläufe als Zeitreihe"""
+        resolution = self.ask_export_resolution()
+        if resolution is None:
+            return
+        data = self.gather_export_data()
+        self.export_manager.export_timeseries_csv(data, resolution, include_contributions)
+    
+    def export_binary(self):
+        """Exportiert Kurven, Getränke und Parameter spaltenweise"""
+        data = self.gather_export_data()
+        self.export_manager.export_to_binary(data)
+    
     def gather_export_data(self):
         """Sammelt alle Daten für den Export"""
         return {
@@ -537,6 +875,7 @@ class MainWindow(QMainWindow):
                               <li>Strg+N: Neue Berechnung</li>
                               <li>Strg+S: Speichern</li>
                               <li>Strg+O: Laden</li>
+                              <li>Strg+Z / Strg+Y: Rückgängig / Wiederholen</li>
                               <li>F1: Diese Hilfe</li>
                               </ul>
                               """)
@@ -554,6 +893,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Behandelt das Schließen des Fensters"""
         self.save_user_preferences()
+        self.close_journal()
         event.accept()
     
     def update_bac_plot(self):
@@ -1,10 +1,25 @@
 from enum import Enum
 from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtGui import QFont, QFontDatabase
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QWidget
+import hashlib
 import json
 import os
 
+def set_style_property(widget: QWidget, name: str, value: str):
+    """Setzt eine dynamische Property und poliert nur dieses Widget neu
+
+    Zusammen mit Property-Selektoren im (einmalig gesetzten) Stylesheet, z.B.
+    QLabel[bacLevel="warning"], ersetzt das neue Stylesheet-Strings pro Update.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
 class Theme(Enum):
     LIGHT = "light"
     DARK = "dark"
@@ -129,6 +144,10 @@ class ThemeManager(QObject):
         self.colors = Colors.LIGHT
         self.settings_file = os.path.join(os.path.expanduser('~'), '.bak_calculator', 'theme_settings.json')
         
+        # Stylesheet-Cache pro Farbschema (nur im Speicher, damit Änderungen an
+        # der Vorlage nie durch veraltete Einträge verdeckt werden)
+        self._stylesheet_cache = {}
+        
         # Erstelle Einstellungsverzeichnis
         os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
         
@@ -162,8 +181,26 @@ class ThemeManager(QObject):
         """Wendet das aktuelle Theme auf die Anwendung an"""
         app = QApplication.instance()
         if app:
-            stylesheet = self._generate_stylesheet()
-            app.setStyleSheet(stylesheet)
+            stylesheet = self.get_stylesheet()
+            # Unverändertes Stylesheet nicht erneut setzen (vermeidet Restyle aller Widgets)
+            if app.styleSheet() != stylesheet:
+                app.setStyleSheet(stylesheet)
+    
+    def get_stylesheet(self) -> str:
+        """Gibt das Stylesheet des aktuellen Farbschemas aus dem Cache zurück"""
+        key = self._stylesheet_key()
+        stylesheet = self._stylesheet_cache.get(key)
+        if stylesheet is not None:
+            return stylesheet
+        
+        stylesheet = self._generate_stylesheet()
+        self._stylesheet_cache[key] = stylesheet
+        return stylesheet
+    
+    def _stylesheet_key(self) -> str:
+        """Cache-Schlüssel aus dem Farbschema"""
+        colors_json = json.dumps(self.colors, sort_keys=True)
+        return hashlib.md5(colors_json.encode()).hexdigest()
     
     def _generate_stylesheet(self) -> str:
         """Generiert das globale Stylesheet"""
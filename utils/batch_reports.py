@@ -0,0 +1,133 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from utils.drink_store import coerce_float, coerce_time
+from utils.session_file import SESSION_EXTENSION, read_session
+
+# Stapelverarbeitung von PDF-Berichten: Jede gespeicherte Sitzung (.baks oder
+# JSON mit person_data, drinks_data und settings_data, z.B. aus dem
+# JSON-Export) wird in einem eigenen Prozess mit dem Qt-freien Berechnungskern
+# berechnet und als PDF gerendert. Jeder Worker legt beim Start einmal seine
+# reportlab-Stile und seinen Agg-Chart-Renderer an und verwendet sie für alle
+# seine Fälle.
+
+# Dateiendungen, die als Sitzung eingelesen werden
+SESSION_EXTENSIONS = ('.json', SESSION_EXTENSION)
+
+# Zustand eines Worker-Prozesses (wird von _init_worker gesetzt)
+_worker_styles = None
+_worker_renderer = None
+
+@dataclass(frozen=True)
+class BatchCaseResult:
+    """Ergebnis eines Falls der Stapelverarbeitung"""
+    session_path: str
+    output_path: str
+    success: bool
+    message: str
+    seconds: float
+
+def find_sessions(directory: str) -> List[str]:
+    """Sitzungsdateien eines Verzeichnisses (sortiert, nicht rekursiv)"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(SESSION_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))
+    )
+
+def load_session(path: str) -> Dict:
+    """Liest eine gespeicherte Sitzung und normalisiert die Getränke"""
+    if path.lower().endswith(SESSION_EXTENSION):
+        session_file = read_session(path)
+        return {
+            'person_data': session_file.person_data,
+            'drinks_data': session_file.drinks_data,
+            'settings_data': session_file.settings_data,
+        }
+    with open(path, 'r', encoding='utf-8') as f:
+        session = json.load(f)
+    if not isinstance(session, dict) or 'person_data' not in session or 'drinks_data' not in session:
+        raise ValueError("Keine gültige Sitzung (person_data und drinks_data fehlen)")
+    session['drinks_data'] = [
+        {
+            'name': str(drink.get('name', '')),
+            'volume': coerce_float(drink.get('volume', 0)),
+            'alcohol_content': coerce_float(drink.get('alcohol_content', 0)),
+            'time': coerce_time(drink.get('time')),
+        }
+        for drink in session['drinks_data']
+    ]
+    return session
+
+def _init_worker():
+    """Legt Stile und Renderer einmal pro Worker-Prozess an"""
+    global _worker_styles, _worker_renderer
+    from utils.pdf_report import ReportStyles
+    from utils.chart_renderer import ChartRenderer
+
+    _worker_styles = ReportStyles()
+    _worker_renderer = ChartRenderer()
+
+def render_case(session_path: str, output_dir: str, chart_format: str = 'vector') -> BatchCaseResult:
+    """Berechnet eine Sitzung und schreibt ihren PDF-Bericht (läuft im Worker)"""
+    from bak_core import calculate_data
+    from utils.pdf_report import build_pdf_report
+
+    if _worker_renderer is None:
+        _init_worker()
+    started = time.perf_counter()
+    # Endung der Sitzung behalten: case.json und case.baks dürfen sich nicht überschreiben
+    output_path = os.path.join(output_dir, os.path.basename(session_path) + '.pdf')
+    try:
+        session = load_session(session_path)
+        results = calculate_data(session['person_data'], session['drinks_data'], session.get('settings_data') or {})
+        data = {
+            'person_data': session['person_data'],
+            'drinks_data': session['drinks_data'],
+            'settings_data': session.get('settings_data') or {},
+            'results': results,
+            'chart_data': results,
+        }
+        build_pdf_report(output_path, data, chart_format, styles=_worker_styles, renderer=_worker_renderer)
+        return BatchCaseResult(session_path, output_path, True, "OK", time.perf_counter() - started)
+    except Exception as e:
+        return BatchCaseResult(session_path, output_path, False, str(e), time.perf_counter() - started)
+
+def run_batch(session_paths: List[str], output_dir: str, chart_format: str = 'vector',
+              max_workers: Optional[int] = None,
+              on_result: Optional[Callable[[BatchCaseResult, int, int], None]] = None,
+              should_stop: Optional[Callable[[], bool]] = None) -> List[BatchCaseResult]:
+    """Rendert alle Sitzungen parallel in einem Prozesspool
+
+    on_result wird für jeden abgeschlossenen Fall mit (Ergebnis, erledigt,
+    gesamt) aufgerufen. Gibt die Ergebnisse in Abschlussreihenfolge zurück.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total = len(session_paths)
+    if not total:
+        return []
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, total))
+
+    # spawn statt fork: der Elternprozess hat Qt- und Export-Threads
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker) as executor:
+        futures = {executor.submit(render_case, path, output_dir, chart_format): path for path in session_paths}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Z.B. abgestürzter Worker-Prozess: Fall als fehlgeschlagen melden
+                result = BatchCaseResult(futures[future], '', False, f"Worker-Fehler: {e}", 0.0)
+            results.append(result)
+            if on_result is not None:
+                on_result(result, len(results), total)
+            if should_stop is not None and should_stop():
+                for pending in futures:
+                    pending.cancel()
+                break
+    return results
@@ -0,0 +1,254 @@
+import heapq
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+import numpy as np
+
+# Getränkekatalog: Die Datendatei (name;category;volume;alcohol) wird erst bei
+# der ersten Suche per mmap eingelesen. Für die Suche werden nur die Namen
+# dekodiert und in einen Wort-Präfix- und einen Trigramm-Index übernommen;
+# die übrigen Felder einer Zeile werden erst bei Bedarf gelesen.
+
+# Mitgelieferter Katalog; eine Datei im Benutzerverzeichnis hat Vorrang
+BUNDLED_CATALOG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'beverage_catalog.csv')
+USER_DIR = os.path.join(os.path.expanduser('~'), '.bak_calculator')
+USER_CATALOG_FILE = os.path.join(USER_DIR, 'beverage_catalog.csv')
+RECENT_FILE = os.path.join(USER_DIR, 'recent_drinks.json')
+
+# Maximale Anzahl gemerkter zuletzt verwendeter Getränke
+RECENT_LIMIT = 100
+
+# Halbwertszeit der Zuletzt-verwendet-Gewichtung (Tage)
+RECENT_HALF_LIFE_DAYS = 14.0
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+@dataclass(frozen=True)
+class Beverage:
+    """Eintrag im Getränkekatalog"""
+    name: str
+    category: str
+    volume: float
+    alcohol: float
+
+def _normalize(text: str) -> str:
+    """Suchschlüssel: Kleinschreibung, Komma als Dezimalpunkt"""
+    return text.casefold().replace(',', '.')
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigramme eines normalisierten Texts"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class BeverageCatalog:
+    """Durchsuchbarer Getränkekatalog mit Zuletzt-verwendet-Rangfolge"""
+
+    def __init__(self, path: Optional[str] = None, recent_file: Optional[str] = RECENT_FILE):
+        if path is None:
+            path = USER_CATALOG_FILE if os.path.exists(USER_CATALOG_FILE) else BUNDLED_CATALOG_FILE
+        self.path = path
+        self.recent_file = recent_file
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._mmap: Optional[mmap.mmap] = None
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._ends = np.zeros(0, dtype=np.int64)
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._ids_by_name: Dict[str, int] = {}
+        self._entries: Dict[int, Beverage] = {}
+        # Präfix-Index: sortierte Wörter mit zugehöriger Eintragsnummer
+        self._words: List[str] = []
+        self._word_ids = array('I')
+        # Trigramm-Index: Trigramm -> Eintragsnummern
+        self._trigram_ids: Dict[str, array] = {}
+        self._recent: Optional[Dict[str, Dict]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        """Lädt den Katalog vorab (z.B. aus einem Hintergrund-Thread)"""
+        self._ensure_loaded()
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._names)
+
+    def _ensure_loaded(self):
+        """Lädt Datei und Index beim ersten Zugriff"""
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self):
+        """Liest die Zeilen per mmap und baut den Suchindex auf"""
+        try:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            print(f"Fehler beim Laden des Getränkekatalogs: {e}")
+            return
+
+        # Zeilengrenzen vektorisiert bestimmen (erste Zeile ist die Überschrift)
+        data = np.frombuffer(self._mmap, dtype=np.uint8)
+        newlines = np.flatnonzero(data == ord('\n'))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(data)]))
+        keep = ends > starts
+        starts, ends = starts[keep][1:], ends[keep][1:]
+
+        # Nur die Namensspalte dekodieren
+        buffer = self._mmap
+        names = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            separator = buffer.find(b';', start, end)
+            names.append(buffer[start:separator if separator >= 0 else end].decode('utf-8').strip())
+        self._starts, self._ends, self._names = starts, ends, names
+        self._keys = [_normalize(name) for name in names]
+        self._ids_by_name = {name: index for index, name in enumerate(names)}
+
+        words = []
+        trigram_ids: Dict[str, array] = {}
+        for index, key in enumerate(self._keys):
+            for word in set(_WORD_PATTERN.findall(key)):
+                words.append((word, index))
+            for trigram in _trigrams(key):
+                trigram_ids.setdefault(trigram, array('I')).append(index)
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_ids = array('I', (index for _, index in words))
+        self._trigram_ids = trigram_ids
+
+    def entry(self, index: int) -> Beverage:
+        """Gibt einen Eintrag zurück (Felder werden bei Bedarf gelesen)"""
+        self._ensure_loaded()
+        beverage = self._entries.get(index)
+        if beverage is None:
+            line = self._mmap[int(self._starts[index]):int(self._ends[index])].decode('utf-8').strip()
+            fields = line.split(';')
+            try:
+                volume, alcohol = float(fields[2]), float(fields[3])
+            except (IndexError, ValueError):
+                volume, alcohol = 0.0, 0.0
+            beverage = Beverage(self._names[index], fields[1] if len(fields) > 1 else '', volume, alcohol)
+            self._entries[index] = beverage
+        return beverage
+
+    def get(self, name: str) -> Optional[Beverage]:
+        """Sucht einen Eintrag über den exakten Namen"""
+        self._ensure_loaded()
+        index = self._ids_by_name.get(name)
+        return None if index is None else self.entry(index)
+
+    def _prefix_ids(self, token: str) -> Set[int]:
+        """Einträge mit einem Wort, das mit token beginnt"""
+        ids = set()
+        position = bisect_left(self._words, token)
+        while position < len(self._words) and self._words[position].startswith(token):
+            ids.add(self._word_ids[position])
+            position += 1
+        return ids
+
+    def _substring_ids(self, token: str) -> Set[int]:
+        """Einträge, die token enthalten (über den Trigramm-Index)"""
+        postings = sorted((self._trigram_ids.get(trigram, ()) for trigram in _trigrams(token)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids.intersection_update(posting)
+            if not ids:
+                return ids
+        return {index for index in ids if token in self._keys[index]}
+
+    def search(self, query: str, limit: int = 50) -> List[Beverage]:
+        """Sucht Getränke (Wortanfänge, ab drei Zeichen auch Teilwörter)
+
+        Zuletzt verwendete Getränke stehen vorne, danach Treffer am
+        Namensanfang, danach kürzere Namen.
+        """
+        self._ensure_loaded()
+        query = _normalize(query.strip())
+        recent = self._recent_scores()
+        if not query:
+            ranked = sorted(recent, key=recent.get, reverse=True)
+            ids = [self._ids_by_name[name] for name in ranked if name in self._ids_by_name]
+            seen = set(ids)
+            ids.extend(index for index in range(min(len(self._names), limit + len(ids))) if index not in seen)
+            return [self.entry(index) for index in ids[:limit]]
+
+        candidates: Optional[Set[int]] = None
+        for token in _WORD_PATTERN.findall(query) or [query]:
+            ids = self._prefix_ids(token)
+            if len(token) >= 3:
+                ids |= self._substring_ids(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        keys, names = self._keys, self._names
+        ranked = heapq.nsmallest(limit, candidates, key=lambda index: (-recent.get(names[index], 0.0),
+                                                                       not keys[index].startswith(query),
+                                                                       len(keys[index]), index))
+        return [self.entry(index) for index in ranked]
+
+    def _load_recent(self) -> Dict[str, Dict]:
+        """Lädt die zuletzt verwendeten Getränke"""
+        if self._recent is None:
+            self._recent = {}
+            if self.recent_file and os.path.exists(self.recent_file):
+                try:
+                    with open(self.recent_file, 'r', encoding='utf-8') as f:
+                        self._recent = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Fehler beim Laden der zuletzt verwendeten Getränke: {e}")
+        return self._recent
+
+    def _recent_scores(self) -> Dict[str, float]:
+        """Rangwert je Getränk: Anzahl, mit dem Alter abgeschwächt"""
+        now = time.time()
+        return {
+            name: info.get('count', 1) * 0.5 ** ((now - info.get('last_used', now)) / 86400 / RECENT_HALF_LIFE_DAYS)
+            for name, info in self._load_recent().items()
+        }
+
+    def mark_used(self, name: str):
+        """Merkt ein Getränk als verwendet (für die Rangfolge)"""
+        recent = self._load_recent()
+        info = recent.pop(name, {'count': 0})
+        recent[name] = {'count': info.get('count', 0) + 1, 'last_used': time.time()}
+
+        # FIFO: Am längsten nicht verwendete Einträge verwerfen
+        while len(recent) > RECENT_LIMIT:
+            del recent[next(iter(recent))]
+
+        if self.recent_file:
+            try:
+                os.makedirs(os.path.dirname(self.recent_file), exist_ok=True)
+                with open(self.recent_file, 'w', encoding='utf-8') as f:
+                    json.dump(recent, f, ensure_ascii=False)
+            except OSError as e:
+                print(f"Fehler beim Speichern der zuletzt verwendeten Getränke: {e}")
+
+_catalog: Optional[BeverageCatalog] = None
+
+def get_catalog() -> BeverageCatalog:
+    """Gemeinsame Katalog-Instanz (Datei wird erst bei der ersten Suche geladen)"""
+    global _catalog
+    if _catalog is None:
+        _catalog = BeverageCatalog()
+    return _catalog
@@ -0,0 +1,437 @@
+from io import BytesIO
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.dates as mdates
+
+# Gemeinsame Chart-Pipeline: Ein ChartModel (Kurven, Grenzwerte, Annotationen)
+# wird von allen Ausgabezielen verwendet. MatplotlibChartBackend zeichnet in den
+# Qt-Canvas und in Agg-Rasterbilder, ReportlabChartBackend erzeugt Vektorgrafik.
+
+# Farben für verschiedene Modelle
+MODEL_COLORS = ['#2196F3', '#FF9800', '#4CAF50', '#9C27B0']
+
+# Obergrenze der Stützpunkte pro Kurve im Vektor-Export
+VECTOR_MAX_POINTS = 400
+
+# Obergrenze der Stützpunkte pro Kurve in Matplotlib (Bildschirm und Raster)
+RASTER_MAX_POINTS = 4000
+
+try:
+    from reportlab.graphics.shapes import Drawing, String, Line
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.charts.legends import Legend
+    from reportlab.lib import colors as rl_colors
+    REPORTLAB_GRAPHICS_AVAILABLE = True
+except ImportError:
+    REPORTLAB_GRAPHICS_AVAILABLE = False
+
+@dataclass(frozen=True)
+class LimitLine:
+    """Horizontale Grenzwertlinie"""
+    value: float
+    color: str
+    label: str
+    min_peak: Optional[float] = None  # Nur anzeigen, wenn die Max-BAK darüber liegt
+
+@dataclass
+class ChartSeries:
+    """Eine BAK-Kurve"""
+    key: str
+    label: str
+    times: List
+    values: List[float]
+    color: str
+
+@dataclass(frozen=True)
+class ChartAnnotation:
+    """Vertikale Markierung, z.B. der Konsumzeitpunkt eines Getränks"""
+    time: datetime
+    text: str
+    color: str = 'r'
+
+# Rechtliche Grenzwerte in der Ergebnisansicht
+SCREEN_LIMITS = (
+    LimitLine(0.3, 'orange', '0.3‰ (Ordnungswidrigkeit)', min_peak=0.001),
+    LimitLine(0.5, 'red', '0.5‰ (Straftat)', min_peak=0.001),
+    LimitLine(1.1, 'darkred', '1.1‰ (Fahruntüchtigkeit)', min_peak=1.0),
+)
+
+# Rechtliche Grenzwerte in Exporten
+EXPORT_LIMITS = (
+    LimitLine(0.3, 'orange', '0.3‰'),
+    LimitLine(0.5, 'red', '0.5‰'),
+    LimitLine(1.1, 'darkred', '1.1‰'),
+)
+
+# Promillegrenzen im einfachen BAK-Plot
+PLOT_LIMITS = (
+    LimitLine(0.5, 'g', '0.5‰'),
+    LimitLine(1.1, 'r', '1.1‰'),
+)
+
+@dataclass(frozen=True)
+class ChartStyle:
+    """Darstellungsparameter eines Ausgabeziels"""
+    linewidth: float
+    marker: str
+    markersize: float
+    title_size: int
+    label_size: int
+    legend_size: int
+    legend_loc: str
+    limit_alpha: float
+    hour_interval: Optional[int]  # None = automatische Zeitachse
+    grid_alpha: float = 0.3
+    facecolor: str = '#FFFFFF'
+
+@lru_cache(maxsize=None)
+def get_chart_style(target: str) -> ChartStyle:
+    """Liefert den gecachten Style für 'screen', 'plot' oder 'export'"""
+    if target == 'screen':
+        return ChartStyle(linewidth=2.5, marker='o', markersize=2, title_size=14, label_size=12,
+                          legend_size=10, legend_loc='upper right', limit_alpha=0.7, hour_interval=1)
+    if target == 'plot':
+        return ChartStyle(linewidth=2, marker='', markersize=0, title_size=12, label_size=10,
+                          legend_size=10, legend_loc='best', limit_alpha=0.5, hour_interval=2)
+    if target == 'export':
+        return ChartStyle(linewidth=2, marker='', markersize=0, title_size=12, label_size=10,
+                          legend_size=10, legend_loc='best', limit_alpha=0.7, hour_interval=None)
+    raise ValueError(f"Unbekanntes Ausgabeziel: {target}")
+
+def downsample_series(times: List, values: List[float], max_points: int) -> Tuple[List, List[float]]:
+    """Reduziert eine Zeitreihe per Min/Max-Bucketing auf höchstens max_points Punkte
+
+    Pro Bucket bleiben Minimum und Maximum in zeitlicher Reihenfolge erhalten,
+    sodass Peaks und Nulldurchgänge trotz Reduktion sichtbar bleiben.
+    """
+    count = len(values)
+    if count <= max_points or max_points < 4:
+        return list(times), list(values)
+
+    y = np.asarray(values, dtype=float)
+    bucket_count = (max_points - 2) // 2
+    edges = np.linspace(1, count - 1, bucket_count + 1).astype(int)
+
+    indices = [0]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        low = start + int(np.argmin(bucket))
+        high = start + int(np.argmax(bucket))
+        indices.extend(sorted({low, high}))
+    indices.append(count - 1)
+
+    return [times[i] for i in indices], [float(y[i]) for i in indices]
+
+@dataclass
+class ChartModel:
+    """Beschreibt ein BAK-Diagramm unabhängig vom Ausgabeziel"""
+    series: List[ChartSeries] = field(default_factory=list)
+    limits: Tuple[LimitLine, ...] = EXPORT_LIMITS
+    annotations: Tuple[ChartAnnotation, ...] = ()
+    title: str = 'Blutalkoholkonzentrations-Verlauf'
+    xlabel: str = 'Zeit'
+    ylabel: str = 'BAK (‰)'
+    y_range: Optional[Tuple[float, float]] = None  # None = aus den Daten (15% Puffer oben)
+
+    @classmethod
+    def from_results(cls, results: Dict, limits: Tuple[LimitLine, ...] = EXPORT_LIMITS,
+                     label_peaks: bool = False) -> 'ChartModel':
+        """Baut das Modell aus den Berechnungsergebnissen (ein Eintrag pro Modell)"""
+        series = []
+        for i, (model, result) in enumerate(results.items()):
+            if not isinstance(result, dict) or not result.get('bac_values'):
+                print(f"WARNUNG: Keine BAC-Daten für Modell {model}")
+                continue
+
+            times = []
+            values = []
+            for point in result['bac_values']:
+                if isinstance(point, (list, tuple)) and len(point) >= 2:
+                    times.append(point[0])
+                    values.append(float(point[1]))
+            if not times:
+                print(f"WARNUNG: Leere Daten nach Extraktion für {model}")
+                continue
+
+            label = model
+            if label_peaks:
+                peak_bac = result.get('peak_bac', max(values))
+                label = f"{model} (Max: {peak_bac:.2f}‰)"
+            series.append(ChartSeries(model, label, times, values, MODEL_COLORS[i % len(MODEL_COLORS)]))
+
+        return cls(series=series, limits=limits)
+
+    @property
+    def max_value(self) -> float:
+        """Höchster BAK-Wert aller Kurven"""
+        return max((max(s.values) for s in self.series if s.values), default=0.0)
+
+    def visible_limits(self) -> List[LimitLine]:
+        """Grenzwerte, die bei der aktuellen Max-BAK angezeigt werden"""
+        peak = self.max_value
+        return [limit for limit in self.limits if limit.min_peak is None or peak > limit.min_peak]
+
+    def resolved_y_range(self) -> Tuple[float, float]:
+        """Y-Achsenbereich des Diagramms"""
+        if self.y_range is not None:
+            return self.y_range
+        peak = self.max_value
+        return (0, peak * 1.15) if peak > 0.001 else (0, 1.0)
+
+    def structure_key(self) -> Tuple:
+        """Gleiche Struktur = inkrementelles Update möglich"""
+        return (tuple(s.key for s in self.series),
+                tuple(limit.value for limit in self.visible_limits()),
+                tuple(self.annotations))
+
+    def downsampled(self, max_points: int) -> 'ChartModel':
+        """Kopie mit auf max_points reduzierten Kurven"""
+        series = [replace(s, times=t, values=v)
+                  for s in self.series
+                  for t, v in [downsample_series(s.times, s.values, max_points)]]
+        return replace(self, series=series)
+
+@dataclass
+class ChartHandle:
+    """Gezeichnetes Diagramm (Achse, Linien pro Kurve, Struktur)"""
+    ax: object
+    lines: Dict
+    structure: Tuple
+
+class MatplotlibChartBackend:
+    """Zeichnet ein ChartModel in eine Matplotlib-Figure (Qt-Canvas oder Agg)"""
+
+    def __init__(self, style: ChartStyle, max_points: int = RASTER_MAX_POINTS):
+        self.style = style
+        self.max_points = max_points
+
+    def draw(self, figure: Figure, model: ChartModel) -> Optional[ChartHandle]:
+        """Baut das Diagramm vollständig neu auf (None bei fehlenden Daten)"""
+        style = self.style
+        model = model.downsampled(self.max_points)
+        figure.clear()
+        figure.patch.set_facecolor(style.facecolor)
+
+        if not model.series:
+            self.draw_message(figure, 'Keine Daten verfügbar', fontsize=14)
+            return None
+
+        ax = figure.add_subplot(111)
+        lines = {}
+        for s in model.series:
+            line, = ax.plot(s.times, s.values, label=s.label, color=s.color,
+                            linewidth=style.linewidth, marker=style.marker or 'None',
+                            markersize=style.markersize)
+            lines[s.key] = line
+
+        for limit in model.visible_limits():
+            ax.axhline(y=limit.value, color=limit.color, linestyle='--', alpha=style.limit_alpha,
+                       label=limit.label)
+
+        ax.set_xlabel(model.xlabel, fontsize=style.label_size)
+        ax.set_ylabel(model.ylabel, fontsize=style.label_size)
+        ax.set_title(model.title, fontsize=style.title_size, fontweight='bold')
+        ax.grid(True, alpha=style.grid_alpha)
+        ax.set_ylim(*model.resolved_y_range())
+        self.apply_time_axis(ax)
+        figure.autofmt_xdate()
+
+        # Annotationen erst nach dem Y-Bereich, damit der Text oben anliegt
+        y_top = ax.get_ylim()[1]
+        for annotation in model.annotations:
+            ax.axvline(x=annotation.time, color=annotation.color, linestyle='--', alpha=0.5)
+            ax.text(annotation.time, y_top, annotation.text, rotation=90, va='top', ha='center',
+                    color=annotation.color, alpha=0.7)
+
+        ax.legend(loc=style.legend_loc, fontsize=style.legend_size)
+        figure.tight_layout()
+        return ChartHandle(ax, lines, model.structure_key())
+
+    def update(self, handle: Optional[ChartHandle], model: ChartModel) -> bool:
+        """Tauscht nur die Kurvendaten aus, wenn die Struktur unverändert ist
+
+        Gibt False zurück, wenn ein vollständiger Neuaufbau (draw) nötig ist.
+        """
+        if handle is None or not model.series or handle.structure != model.structure_key():
+            return False
+
+        model = model.downsampled(self.max_points)
+        ax = handle.ax
+        for s in model.series:
+            line = handle.lines[s.key]
+            line.set_data(s.times, s.values)
+            line.set_label(s.label)
+            line.set_marker(self.style.marker or 'None')
+
+        # Ein Zoom (set_xlim) schaltet die x-Autoskalierung ab; neue Daten
+        # werden wieder vollständig gezeigt
+        ax.set_autoscalex_on(True)
+        ax.relim()
+        ax.autoscale_view(scaley=False)
+        ax.set_ylim(*model.resolved_y_range())
+        self.apply_time_axis(ax)
+        ax.legend(loc=self.style.legend_loc, fontsize=self.style.legend_size)
+        return True
+
+    def apply_time_axis(self, ax):
+        """Setzt Formatierung und Ticks der Zeitachse"""
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+        if self.style.hour_interval:
+            ax.xaxis.set_major_locator(mdates.HourLocator(interval=self.style.hour_interval))
+        else:
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+
+    def draw_message(self, figure: Figure, text: str, color: str = 'gray', fontsize: int = 12):
+        """Zeigt statt eines Diagramms einen Hinweistext"""
+        figure.clear()
+        ax = figure.add_subplot(111)
+        ax.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center',
+                transform=ax.transAxes, fontsize=fontsize, color=color)
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        return ax
+
+def _rl_color(name: str):
+    """Übersetzt eine Matplotlib-Farbe für reportlab"""
+    if name.startswith('#'):
+        return rl_colors.HexColor(name)
+    try:
+        return rl_colors.toColor(name)
+    except ValueError:
+        return rl_colors.black
+
+class ReportlabChartBackend:
+    """Zeichnet ein ChartModel als reportlab-Vektorgrafik (Drawing)"""
+
+    def __init__(self, max_points: int = VECTOR_MAX_POINTS):
+        self.max_points = max_points
+
+    def draw(self, model: ChartModel, width: float, height: float) -> "Drawing":
+        """Erstellt die Vektorgrafik
+
+        Die Kurven werden vor dem Zeichnen auf max_points Stützpunkte reduziert,
+        damit die Pfadkomplexität im PDF unabhängig von der Auflösung bleibt.
+        """
+        if not REPORTLAB_GRAPHICS_AVAILABLE:
+            raise ImportError("ReportLab ist nicht installiert. Bitte installieren Sie es mit: pip install reportlab")
+
+        model = model.downsampled(self.max_points)
+        drawing = Drawing(width, height)
+        drawing.add(String(width / 2, height - 14, model.title,
+                           fontName='Helvetica-Bold', fontSize=12, textAnchor='middle'))
+        if not model.series:
+            return drawing
+
+        # Zeitachse in Stunden relativ zum frühesten Datenpunkt
+        origin = min(s.times[0] for s in model.series)
+        end = max(s.times[-1] for s in model.series)
+        span_hours = max((end - origin).total_seconds() / 3600, 1.0)
+        limits = model.visible_limits()
+        y_min, y_max = model.resolved_y_range()
+
+        data = []
+        for s in model.series:
+            data.append([((t - origin).total_seconds() / 3600, v) for t, v in zip(s.times, s.values)])
+        for limit in limits:
+            data.append([(0.0, limit.value), (span_hours, limit.value)])
+
+        plot = LinePlot()
+        plot.x = 45
+        plot.y = 40
+        plot.width = width - 150
+        plot.height = height - 80
+        plot.data = data
+        plot.joinedLines = 1
+
+        for index, s in enumerate(model.series):
+            plot.lines[index].strokeColor = _rl_color(s.color)
+            plot.lines[index].strokeWidth = 1.5
+        for offset, limit in enumerate(limits):
+            line = plot.lines[len(model.series) + offset]
+            line.strokeColor = _rl_color(limit.color)
+            line.strokeWidth = 0.8
+            line.strokeDashArray = [4, 3]
+
+        step = max(1, int(np.ceil(span_hours / 12)))
+        plot.xValueAxis.valueMin = 0
+        plot.xValueAxis.valueMax = span_hours
+        plot.xValueAxis.valueStep = step
+        plot.xValueAxis.labelTextFormat = lambda h: (origin + timedelta(hours=h)).strftime('%H:%M')
+        plot.xValueAxis.labels.fontName = 'Helvetica'
+        plot.xValueAxis.labels.fontSize = 7
+        plot.xValueAxis.labels.angle = 45
+        plot.xValueAxis.labels.boxAnchor = 'ne'
+        plot.yValueAxis.valueMin = y_min
+        plot.yValueAxis.valueMax = max(y_max, 1.2)
+        plot.yValueAxis.labelTextFormat = '%.1f'
+        plot.yValueAxis.labels.fontName = 'Helvetica'
+        plot.yValueAxis.labels.fontSize = 7
+        plot.yValueAxis.visibleGrid = 1
+        plot.yValueAxis.gridStrokeColor = rl_colors.lightgrey
+        drawing.add(plot)
+
+        for annotation in model.annotations:
+            x = plot.x + plot.width * ((annotation.time - origin).total_seconds() / 3600) / span_hours
+            drawing.add(Line(x, plot.y, x, plot.y + plot.height, strokeColor=_rl_color(annotation.color),
+                             strokeWidth=0.5, strokeDashArray=[2, 2]))
+
+        drawing.add(String(plot.x + plot.width / 2, 4, model.xlabel, fontName='Helvetica', fontSize=8,
+                           textAnchor='middle'))
+        drawing.add(String(10, plot.y + plot.height + 6, model.ylabel, fontName='Helvetica', fontSize=8))
+
+        legend = Legend()
+        legend.x = plot.x + plot.width + 15
+        legend.y = plot.y + plot.height
+        legend.fontName = 'Helvetica'
+        legend.fontSize = 7
+        legend.alignment = 'right'
+        legend.colorNamePairs = (
+            [(_rl_color(s.color), s.label) for s in model.series] +
+            [(_rl_color(limit.color), limit.label) for limit in limits]
+        )
+        legend.columnMaximum = len(legend.colorNamePairs)
+        drawing.add(legend)
+        return drawing
+
+class ChartRenderer:
+    """Thread-sicherer Chart-Renderer für Exporte
+
+    Verwendet pro Aufruf eine isolierte Figure mit FigureCanvasAgg und greift
+    nicht auf den globalen pyplot-Zustand zu. Dadurch kann er gefahrlos aus
+    Worker-Threads und parallel laufenden Exporten verwendet werden.
+    """
+
+    def __init__(self, figsize=(12, 8), dpi: int = 300):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.backend = MatplotlibChartBackend(get_chart_style('export'))
+
+    def render_figure(self, chart_data: Dict) -> Figure:
+        """Erstellt eine eigenständige Figure mit dem BAK-Verlauf"""
+        figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(figure)
+        self.backend.draw(figure, ChartModel.from_results(chart_data))
+        return figure
+
+    def render_png(self, chart_data: Dict) -> BytesIO:
+        """Rendert das Chart als PNG direkt in einen Speicherpuffer"""
+        figure = self.render_figure(chart_data)
+        buffer = BytesIO()
+        figure.savefig(buffer, format='png', dpi=self.dpi, bbox_inches='tight')
+        buffer.seek(0)
+        return buffer
+
+    def render_vector(self, chart_data: Dict, width: float, height: float,
+                      max_points: int = VECTOR_MAX_POINTS) -> "Drawing":
+        """Erstellt das Chart als reportlab-Vektorgrafik (Drawing)"""
+        backend = ReportlabChartBackend(max_points)
+        return backend.draw(ChartModel.from_results(chart_data), width, height)
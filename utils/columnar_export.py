@@ -0,0 +1,217 @@
+import json
+import os
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+from utils.timeseries_export import DEFAULT_RESOLUTION_SECONDS, iter_timeseries_chunks, timeseries_row_count
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Spaltenbasierter Binär-Export: Zeitachse, BAK-Kurve je Modell, Getränketabelle
+# und die aufgelösten Modellparameter als typisierte numpy-Arrays. NPZ ist immer
+# verfügbar (unkomprimiert, ohne Pickle, daher in Millisekunden ladbar);
+# Parquet und Arrow/Feather werden genutzt, wenn pyarrow installiert ist.
+
+# Dateiendungen der Formate
+NPZ_EXTENSIONS = ('.npz',)
+PARQUET_EXTENSIONS = ('.parquet',)
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+# Skalare Modellparameter aus dem Berechnungsergebnis
+PARAMETER_FIELDS = ('elimination_rate', 'r_factor', 'body_fat_factor', 'person_weight',
+                    'alcohol_grams', 'peak_bac', 'current_bac')
+
+# Format-Version der Exportdateien
+FORMAT_VERSION = 1
+
+# Zeilen je Schreibblock bei Parquet/Arrow (Fortschritt und Abbruch je Block)
+WRITE_BATCH_ROWS = 100000
+
+# Anteil der Kurvenberechnung am Gesamtfortschritt; der Rest entfällt aufs Schreiben
+BUILD_PROGRESS_SHARE = 0.5
+
+def _datetime_array(values: List) -> np.ndarray:
+    """Wandelt datetime-Werte in ein datetime64[ms]-Array (fehlende Werte -> NaT)"""
+    return np.array([v if isinstance(v, datetime) else None for v in values], dtype='datetime64[ms]')
+
+def curve_columns(results: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                  progress: Optional[Callable[[float], None]] = None) -> Dict[str, np.ndarray]:
+    """Gemeinsame Zeitachse und eine BAK-Spalte je Modell
+
+    progress erhält nach jedem berechneten Block den Anteil der Zeilen (0..1).
+    """
+    total_rows = timeseries_row_count(results, resolution_seconds)
+    times, blocks = [], []
+    built = 0
+    for chunk_times, values in iter_timeseries_chunks(results, resolution_seconds, chunk_rows=1 << 20):
+        times.append(chunk_times)
+        blocks.append(values)
+        built += len(chunk_times)
+        if progress is not None:
+            progress(built / total_rows)
+    if not times:
+        return {'time': np.zeros(0, dtype='datetime64[ms]'),
+                **{f'bac_{model}': np.zeros(0) for model in results}}
+
+    values = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+    columns = {'time': np.concatenate(times) if len(times) > 1 else times[0]}
+    for index, model in enumerate(results):
+        # values ist die Transponierte der Modell-Matrix: bei einem Block sind die
+        # Spalten bereits zusammenhängend und werden nicht kopiert
+        columns[f'bac_{model}'] = np.ascontiguousarray(values[:, index])
+    return columns
+
+def drink_columns(drinks_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """Getränketabelle als Spalten"""
+    count = len(drinks_data)
+    volumes = np.fromiter((float(d.get('volume', 0)) for d in drinks_data), dtype=float, count=count)
+    contents = np.fromiter((float(d.get('alcohol_content', 0)) for d in drinks_data), dtype=float, count=count)
+    return {
+        'drink_name': np.array([str(d.get('name', '')) for d in drinks_data], dtype=str),
+        'drink_volume': volumes,
+        'drink_alcohol_content': contents,
+        'drink_time': _datetime_array([d.get('time') for d in drinks_data]),
+        'drink_alcohol_grams': volumes * (contents / 100) * 0.8,
+    }
+
+def parameter_columns(results: Dict) -> Dict[str, np.ndarray]:
+    """Aufgelöste Parameter je Modell (eine Zeile je Modell)"""
+    columns = {'model': np.array(list(results), dtype=str)}
+    for field in PARAMETER_FIELDS:
+        columns[f'param_{field}'] = np.array([float(result.get(field) or 0.0) for result in results.values()])
+    return columns
+
+def _metadata(data: Dict, resolution_seconds: float) -> Dict:
+    """Personendaten und Einstellungen (klein, als JSON)"""
+    return {
+        'format_version': FORMAT_VERSION,
+        'created': datetime.now().isoformat(),
+        'resolution_seconds': resolution_seconds,
+        'person_data': data.get('person_data') or {},
+        'settings_data': data.get('settings_data') or {},
+    }
+
+def build_columns(data: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                  progress: Optional[Callable[[float], None]] = None) -> Dict[str, np.ndarray]:
+    """Stellt alle Export-Spalten zusammen"""
+    results = data.get('results') or {}
+    columns = curve_columns(results, resolution_seconds, progress)
+    columns.update(drink_columns(data.get('drinks_data') or []))
+    columns.update(parameter_columns(results))
+    columns['metadata'] = np.array(json.dumps(_metadata(data, resolution_seconds), default=str))
+    return columns
+
+def binary_format(file_path: str) -> str:
+    """Format anhand der Dateiendung ('npz', 'parquet' oder 'arrow')"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return 'parquet'
+    if extension in ARROW_EXTENSIONS:
+        return 'arrow'
+    return 'npz'
+
+def available_binary_formats() -> List[str]:
+    """Verfügbare Binärformate (Parquet/Arrow nur mit pyarrow)"""
+    return ['npz', 'parquet', 'arrow'] if PYARROW_AVAILABLE else ['npz']
+
+def _arrow_table(columns: Dict[str, np.ndarray]):
+    """Kurventabelle mit Getränken und Parametern als Schema-Metadaten
+
+    Parquet/Arrow speichern genau eine Tabelle; die kürzeren Tabellen
+    (Getränke, Parameter) werden daher als JSON in den Metadaten abgelegt.
+    """
+    curve = {name: values for name, values in columns.items() if name == 'time' or name.startswith('bac_')}
+    # Zahlen-Arrays werden ohne Kopie übernommen
+    table = pa.table({name: pa.array(values) for name, values in curve.items()})
+
+    def as_records(prefix: str) -> str:
+        fields = {name: values.tolist() for name, values in columns.items() if name.startswith(prefix)}
+        return json.dumps(fields, default=str)
+
+    metadata = {
+        b'bak.metadata': str(columns['metadata']).encode('utf-8'),
+        b'bak.drinks': as_records('drink_').encode('utf-8'),
+        b'bak.parameters': json.dumps({'model': columns['model'].tolist(),
+                                       **{name: values.tolist() for name, values in columns.items()
+                                          if name.startswith('param_')}}).encode('utf-8'),
+    }
+    return table.replace_schema_metadata(metadata)
+
+def _write_npz(file_path: str, columns: Dict[str, np.ndarray], progress: Callable[[float], None]):
+    """Schreibt die Spalten wie np.savez (unkomprimiert), meldet aber jede Spalte
+
+    Der Fortschritt richtet sich nach den geschriebenen Bytes, da die
+    Kurvenspalten den Großteil der Datei ausmachen.
+    """
+    total_bytes = sum(values.nbytes for values in columns.values()) or 1
+    written = 0
+    with zipfile.ZipFile(file_path, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, values in columns.items():
+            with archive.open(f'{name}.npy', mode='w', force_zip64=True) as member:
+                np.lib.format.write_array(member, np.asanyarray(values), allow_pickle=False)
+            written += values.nbytes
+            progress(written / total_bytes)
+
+def _write_arrow(file_path: str, table, file_format: str, progress: Callable[[float], None]):
+    """Schreibt die Tabelle blockweise als Parquet bzw. Arrow (Feather V2, unkomprimiert)"""
+    if file_format == 'parquet':
+        writer = pq.ParquetWriter(file_path, table.schema)
+    else:
+        writer = pa.ipc.new_file(file_path, table.schema)
+    with writer:
+        for offset in range(0, table.num_rows, WRITE_BATCH_ROWS):
+            writer.write_table(table.slice(offset, WRITE_BATCH_ROWS))
+            progress(min(offset + WRITE_BATCH_ROWS, table.num_rows) / table.num_rows)
+
+def write_binary(file_path: str, data: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                 file_format: Optional[str] = None,
+                 progress: Optional[Callable[[float], None]] = None) -> str:
+    """Schreibt den Binär-Export und gibt das verwendete Format zurück
+
+    progress erhält den Gesamtanteil (0..1): zuerst je berechnetem Kurvenblock,
+    danach je geschriebener Spalte (NPZ) bzw. je Zeilenblock (Parquet/Arrow).
+    """
+    file_format = file_format or binary_format(file_path)
+    if file_format in ('parquet', 'arrow') and not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow ist nicht installiert. Bitte installieren Sie es mit: pip install pyarrow "
+                          "oder exportieren Sie als NPZ.")
+
+    report = progress or (lambda fraction: None)
+    columns = build_columns(data, resolution_seconds,
+                            lambda fraction: report(BUILD_PROGRESS_SHARE * fraction))
+
+    def report_written(fraction: float):
+        report(BUILD_PROGRESS_SHARE + (1.0 - BUILD_PROGRESS_SHARE) * fraction)
+
+    if file_format in ('parquet', 'arrow'):
+        table = _arrow_table(columns)
+        if table.num_rows:
+            _write_arrow(file_path, table, file_format, report_written)
+        elif file_format == 'parquet':
+            pq.write_table(table, file_path)
+        else:
+            feather.write_feather(table, file_path, compression='uncompressed')
+    else:
+        # Über den Pfad schreiben: np.savez würde .npz anhängen, wenn die Endung fehlt
+        _write_npz(file_path, columns, report_written)
+    report(1.0)
+    return file_format
+
+def load_binary(file_path: str) -> Dict[str, np.ndarray]:
+    """Lädt einen NPZ-Export (Arrays werden beim Zugriff gelesen)
+
+    Für Parquet/Arrow-Dateien bitte pyarrow bzw. pandas.read_parquet verwenden.
+    """
+    return np.load(file_path, allow_pickle=False)
+
+def load_metadata(columns) -> Dict:
+    """Liest Personendaten und Einstellungen eines NPZ-Exports"""
+    return json.loads(str(columns['metadata']))
@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Massenimport von Getränken aus CSV, eingefügten Tabellen (Tab-getrennt) und
+# JSON-Listen. Zahlen werden spaltenweise in Arrays gelesen und in einem
+# einzigen vektorisierten Durchlauf geprüft (gleiche Grenzen wie in der Tabelle).
+
+# Gültigkeitsgrenzen (wie bei der Zellbearbeitung)
+MAX_VOLUME = 5000.0
+MAX_ALCOHOL = 100.0
+
+# Maximale Anzahl einzeln gemeldeter Fehlerzeilen
+MAX_REPORTED_ERRORS = 10
+
+# Spaltenüberschriften (deutsch/englisch, wie in der Getränketabelle)
+COLUMN_ALIASES = {
+    'name': ('name', 'getränk', 'getraenk', 'drink'),
+    'volume': ('volume', 'menge', 'menge (ml)', 'volumen', 'ml'),
+    'alcohol_content': ('alcohol_content', 'alkohol (%)', 'alkohol', 'alkoholgehalt', 'vol%', 'abv'),
+    'date': ('date', 'datum'),
+    'time': ('time', 'zeit', 'uhrzeit', 'zeitpunkt', 'datetime'),
+}
+
+# Spaltenfolge ohne Überschrift (entspricht der Getränketabelle)
+POSITIONAL_COLUMNS = ('name', 'volume', 'alcohol_content', 'date', 'time')
+
+DATETIME_FORMATS = ('%d.%m.%Y %H:%M', '%d.%m.%Y %H:%M:%S', '%d.%m.%y %H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S')
+DATE_FORMATS = ('%d.%m.%Y', '%d.%m.%y', '%d/%m/%Y', '%Y-%m-%d')
+TIME_FORMATS = ('%H:%M', '%H:%M:%S')
+
+class DrinkImportError(ValueError):
+    """Fehler beim Einlesen oder Prüfen importierter Getränke"""
+
+    def __init__(self, message: str, errors: Optional[List[str]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+def _normalize_header(value: Any) -> Optional[str]:
+    """Ordnet eine Spaltenüberschrift einem Feld zu"""
+    text = str(value).strip().lower()
+    for field, aliases in COLUMN_ALIASES.items():
+        if text in aliases:
+            return field
+    return None
+
+def _parse_number(value: Any) -> float:
+    """Liest eine Zahl (auch mit Komma), ungültig -> NaN"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(',', '.'))
+    except ValueError:
+        return float('nan')
+
+def _parse_with(text: str, formats: Sequence[str]):
+    """Probiert mehrere strptime-Formate"""
+    for fmt in formats:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+def parse_drink_time(value: Any, date_value: Any = None, default_date=None) -> Optional[datetime]:
+    """Liest einen Konsumzeitpunkt aus Zeit- und optionaler Datumsangabe"""
+    if isinstance(value, datetime):
+        return value
+    text = str(value or '').strip()
+    if not text:
+        return None
+
+    # Reine Uhrzeit (kurz) oder vollständiger Zeitpunkt
+    clock = _parse_with(text, TIME_FORMATS) if len(text) <= 8 else None
+    if clock is None:
+        parsed = _parse_with(text, DATETIME_FORMATS)
+        if parsed is None:
+            try:
+                parsed = datetime.fromisoformat(text)
+            except ValueError:
+                parsed = None
+        return parsed
+
+    # Datum aus eigener Spalte (sonst Standarddatum)
+    day = default_date or datetime.now().date()
+    if date_value not in (None, ''):
+        if isinstance(date_value, datetime):
+            day = date_value.date()
+        else:
+            parsed_date = _parse_with(str(date_value).strip(), DATE_FORMATS)
+            if parsed_date is None:
+                return None
+            day = parsed_date.date()
+    return datetime.combine(day, clock.time())
+
+def _rows_from_text(text: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Liest CSV- oder Tabellentext in Zeilen-Dictionaries
+
+    Gibt die Zeilen und die Nummer der ersten Datenzeile zurück.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return [], 1
+    sample = '\n'.join(lines[:20])
+    if '\t' in sample:
+        delimiter = '\t'
+    elif all(';' in line for line in lines[:20]):
+        # Semikolon hat Vorrang, da Kommas als Dezimaltrennzeichen vorkommen
+        delimiter = ';'
+    else:
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=';,|').delimiter
+        except csv.Error:
+            delimiter = ';' if ';' in sample else ','
+    records = list(csv.reader(io.StringIO('\n'.join(lines)), delimiter=delimiter))
+
+    # Überschrift erkennen; ohne Überschrift gilt die Spaltenfolge der Tabelle
+    header = [_normalize_header(cell) for cell in records[0]]
+    if 'volume' in header or 'alcohol_content' in header:
+        fields, records, first_line = header, records[1:], 2
+    else:
+        fields = list(POSITIONAL_COLUMNS[:len(records[0])])
+        if len(records[0]) == 4:  # Name, Menge, Alkohol, Zeitpunkt
+            fields[3] = 'time'
+        first_line = 1
+
+    rows = []
+    for record in records:
+        rows.append({field: cell for field, cell in zip(fields, record) if field})
+    return rows, first_line
+
+def _rows_from_json(text: str) -> List[Dict[str, Any]]:
+    """Liest eine JSON-Liste von Getränken"""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise DrinkImportError(f"Ungültiges JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get('drinks', data.get('getränke'))
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise DrinkImportError("JSON muss eine Liste von Getränke-Objekten enthalten.")
+    rows = []
+    for item in data:
+        row = {}
+        for key, value in item.items():
+            field = _normalize_header(key)
+            if field:
+                row[field] = value
+        rows.append(row)
+    return rows
+
+def parse_drinks(text: str, default_date=None) -> List[Dict]:
+    """Liest und prüft Getränke aus CSV-, Tabellen- oder JSON-Text
+
+    Alle Zeilen werden gemeinsam geprüft; bei einem Fehler wird nichts
+    übernommen und DrinkImportError mit den fehlerhaften Zeilen ausgelöst.
+    """
+    text = text.strip()
+    if not text:
+        raise DrinkImportError("Keine Getränke zum Importieren gefunden.")
+    if text[0] in '[{':
+        rows, first_line = _rows_from_json(text), 1
+    else:
+        rows, first_line = _rows_from_text(text)
+    if not rows:
+        raise DrinkImportError("Keine Getränke zum Importieren gefunden.")
+
+    # Zahlen spaltenweise einlesen und vektorisiert prüfen
+    volumes = np.fromiter((_parse_number(row.get('volume', '')) for row in rows), dtype=float, count=len(rows))
+    alcohol = np.fromiter((_parse_number(row.get('alcohol_content', '')) for row in rows), dtype=float, count=len(rows))
+    volume_ok = (volumes > 0) & (volumes <= MAX_VOLUME)
+    alcohol_ok = (alcohol >= 0) & (alcohol <= MAX_ALCOHOL)  # NaN ist nie gültig
+
+    names = [str(row.get('name', '')).strip() for row in rows]
+    times = [parse_drink_time(row.get('time'), row.get('date'), default_date) for row in rows]
+    name_ok = np.fromiter((bool(name) for name in names), dtype=bool, count=len(rows))
+    time_ok = np.fromiter((t is not None for t in times), dtype=bool, count=len(rows))
+
+    invalid = np.flatnonzero(~(volume_ok & alcohol_ok & name_ok & time_ok))
+    if len(invalid):
+        errors = []
+        for index in invalid[:MAX_REPORTED_ERRORS]:
+            problems = []
+            if not name_ok[index]:
+                problems.append("Name fehlt")
+            if not volume_ok[index]:
+                problems.append(f"Volumen muss zwischen 1 und {MAX_VOLUME:.0f} ml liegen")
+            if not alcohol_ok[index]:
+                problems.append(f"Alkoholgehalt muss zwischen 0 und {MAX_ALCOHOL:.0f}% liegen")
+            if not time_ok[index]:
+                problems.append("Zeit ungültig (TT.MM.JJJJ HH:MM)")
+            errors.append(f"Zeile {index + first_line}: {', '.join(problems)}")
+        if len(invalid) > MAX_REPORTED_ERRORS:
+            errors.append(f"... und {len(invalid) - MAX_REPORTED_ERRORS} weitere")
+        raise DrinkImportError(f"{len(invalid)} von {len(rows)} Zeilen sind ungültig.", errors)
+
+    return [
+        {'name': name, 'volume': volume, 'alcohol_content': content, 'time': drink_time}
+        for name, volume, content, drink_time in zip(names, volumes.tolist(), alcohol.tolist(), times)
+    ]
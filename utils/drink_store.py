@@ -0,0 +1,137 @@
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Dichte von Ethanol für die Grammanzeige pro Getränk (g/ml)
+ETHANOL_DENSITY = 0.789
+
+# Gerundete Dichte für die Gesamtsumme (wie in der Zusammenfassung üblich)
+SUMMARY_DENSITY = 0.8
+
+def coerce_float(value: Any) -> float:
+    """Wandelt Zahlen und Texte (auch mit Komma) in float um, sonst 0.0"""
+    try:
+        if isinstance(value, str):
+            value = value.replace(',', '.')
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def coerce_time(value: Any) -> datetime:
+    """Wandelt einen Zeitpunkt in datetime um (Fallback: jetzt)"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, '%d.%m.%Y %H:%M')
+    except (TypeError, ValueError):
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return datetime.now()
+
+class DrinkStore:
+    """Spaltenbasierte Ablage der Getränke
+
+    Jedes Feld liegt in einer eigenen Spalte (Zahlen als array('d')), sodass
+    Zugriffe und Änderungen einzelner Zellen O(1) sind und Summen vektorisiert
+    über die Spalten berechnet werden können. Typen werden beim Einfügen
+    einmalig normalisiert.
+    """
+
+    FIELDS = ('name', 'volume', 'alcohol_content', 'time')
+
+    def __init__(self, drinks: Optional[Iterable[Dict]] = None):
+        self.names: List[str] = []
+        self.volumes = array('d')
+        self.alcohol_contents = array('d')
+        self.times: List[datetime] = []
+        if drinks:
+            self.extend(drinks)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(self, drink: Dict) -> int:
+        """Fügt ein Getränk an und gibt seine Zeile zurück"""
+        self.names.append(str(drink.get('name', '')))
+        self.volumes.append(coerce_float(drink.get('volume', 0)))
+        self.alcohol_contents.append(coerce_float(drink.get('alcohol_content', 0)))
+        self.times.append(coerce_time(drink.get('time')))
+        return len(self.names) - 1
+
+    def extend(self, drinks: Iterable[Dict]):
+        """Fügt mehrere Getränke an"""
+        for drink in drinks:
+            self.append(drink)
+
+    def remove(self, row: int):
+        """Entfernt ein Getränk"""
+        del self.names[row]
+        del self.volumes[row]
+        del self.alcohol_contents[row]
+        del self.times[row]
+
+    def clear(self):
+        """Entfernt alle Getränke"""
+        self.names.clear()
+        self.volumes = array('d')
+        self.alcohol_contents = array('d')
+        self.times.clear()
+
+    def get(self, row: int, field: str) -> Any:
+        """Liest ein einzelnes Feld"""
+        return self._column(field)[row]
+
+    def set(self, row: int, field: str, value: Any):
+        """Schreibt ein einzelnes Feld (Typen werden normalisiert)"""
+        if field in ('volume', 'alcohol_content'):
+            value = coerce_float(value)
+        elif field == 'time':
+            value = coerce_time(value)
+        else:
+            value = str(value)
+        self._column(field)[row] = value
+
+    def _column(self, field: str):
+        """Gibt die Spalte zu einem Feldnamen zurück"""
+        if field == 'name':
+            return self.names
+        if field == 'volume':
+            return self.volumes
+        if field == 'alcohol_content':
+            return self.alcohol_contents
+        if field == 'time':
+            return self.times
+        raise KeyError(f"Unbekanntes Feld: {field}")
+
+    def row(self, row: int) -> Dict:
+        """Gibt ein Getränk als Dictionary zurück"""
+        return {
+            'name': self.names[row],
+            'volume': self.volumes[row],
+            'alcohol_content': self.alcohol_contents[row],
+            'time': self.times[row]
+        }
+
+    def rows(self) -> List[Dict]:
+        """Gibt alle Getränke als Liste von Dictionaries zurück"""
+        return [self.row(i) for i in range(len(self.names))]
+
+    def alcohol_grams(self, row: int, density: float = ETHANOL_DENSITY) -> float:
+        """Alkohol in Gramm für eine Zeile (on demand berechnet)"""
+        return self.volumes[row] * self.alcohol_contents[row] / 100 * density
+
+    def total_alcohol_grams(self, density: float = SUMMARY_DENSITY) -> float:
+        """Gesamtalkohol in Gramm über alle Getränke"""
+        if not self.names:
+            return 0.0
+        volumes = np.frombuffer(self.volumes, dtype=np.float64)
+        contents = np.frombuffer(self.alcohol_contents, dtype=np.float64)
+        return float(np.dot(volumes, contents) / 100 * density)
+
+    def time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """Frühester und spätester Konsumzeitpunkt"""
+        if not self.times:
+            return None
+        return min(self.times), max(self.times)
@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import numpy as np
+
+from utils.timeseries_export import (DEFAULT_RESOLUTION_SECONDS, iter_timeseries_chunks,
+                                     timeseries_header, timeseries_row_count)
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.chart import LineChart, Reference
+    from openpyxl.styles import Font, PatternFill
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Streaming-Excel-Export: Ein write-only Workbook schreibt jede Zeile sofort in
+# die temporäre Arbeitsblattdatei, sodass der Speicherbedarf auch bei langen
+# Verläufen konstant bleibt. BAK-Werte werden als echte Zahlen abgelegt, das
+# Diagramm ist ein natives Excel-Liniendiagramm, das auf das Verlaufsblatt
+# verweist.
+
+# Maximale Zeilenzahl eines Excel-Arbeitsblatts
+EXCEL_MAX_ROWS = 1048576
+
+# Excel-Seriennummer 0 (Tage seit 30.12.1899)
+EXCEL_EPOCH = np.datetime64('1899-12-30T00:00:00', 'ms')
+MS_PER_DAY = 86400000.0
+
+TIME_FORMAT = 'DD.MM.YYYY HH:MM:SS'
+
+# Zeilen pro Block; das Schreiben der Zellen überwiegt, kleinere Blöcke
+# ergeben einen feineren Fortschritt
+EXCEL_CHUNK_ROWS = 2000
+
+def _header_row(sheet, values):
+    """Fett formatierte Überschriftenzeile"""
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        row.append(cell)
+    return row
+
+def _formatted(sheet, value, number_format: str):
+    """Zelle mit Zahlenformat"""
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.number_format = number_format
+    return cell
+
+def _write_person_sheet(workbook, person: Dict):
+    sheet = workbook.create_sheet("Personendaten")
+    sheet.column_dimensions['A'].width = 20
+    title = WriteOnlyCell(sheet, value="Personendaten")
+    title.font = Font(bold=True, size=14)
+    sheet.append([title])
+    sheet.append([])
+    for label, key, unit in (('Geschlecht:', 'gender', None), ('Alter:', 'age', 'Jahre'),
+                             ('Größe:', 'height', 'cm'), ('Gewicht:', 'weight', 'kg'),
+                             ('Körperfettanteil:', 'body_fat', '%'),
+                             ('Trinkgewohnheit:', 'drinking_habit', None)):
+        label_cell = WriteOnlyCell(sheet, value=label)
+        label_cell.font = Font(bold=True)
+        sheet.append([label_cell, person.get(key, 'N/A'), unit])
+
+def _write_drinks_sheet(workbook, drinks):
+    sheet = workbook.create_sheet("Getränke")
+    sheet.column_dimensions['A'].width = 25
+    sheet.column_dimensions['D'].width = 20
+    sheet.append(_header_row(sheet, ['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)']))
+    for drink in drinks:
+        alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
+        drink_time = drink['time']
+        sheet.append([
+            drink['name'],
+            drink['volume'],
+            drink['alcohol_content'],
+            _formatted(sheet, drink_time, 'DD.MM.YYYY HH:MM') if isinstance(drink_time, datetime) else str(drink_time),
+            _formatted(sheet, alcohol_grams, '0.0'),
+        ])
+
+def _write_results_sheet(workbook, results: Dict):
+    sheet = workbook.create_sheet("Ergebnisse")
+    sheet.column_dimensions['A'].width = 15
+    sheet.append(_header_row(sheet, ['Modell', 'Aktuelle BAK (‰)', 'Max. BAK (‰)', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰']))
+    for model, result in results.items():
+        sheet.append([
+            model,
+            _formatted(sheet, result.get('current_bac', 0), '0.00'),
+            _formatted(sheet, result.get('peak_bac', 0), '0.00'),
+            _formatted(sheet, result['time_to_03'], 'HH:MM') if result.get('time_to_03') else '--',
+            _formatted(sheet, result['time_to_00'], 'HH:MM') if result.get('time_to_00') else '--',
+        ])
+
+def write_streaming_workbook(file_path: str, data: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                             chunk_rows: int = EXCEL_CHUNK_ROWS,
+                             progress: Optional[Callable[[float], None]] = None) -> int:
+    """Schreibt Personendaten, Getränke, Ergebnisse und den BAK-Verlauf mit Diagramm
+
+    Gibt die Anzahl der Verlaufszeilen zurück.
+    """
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("openpyxl ist nicht installiert. Bitte installieren Sie es mit: pip install openpyxl")
+
+    results = data.get('results') or {}
+    total_rows = timeseries_row_count(results, resolution_seconds)
+    if total_rows + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Der Verlauf hätte {total_rows} Zeilen (Excel erlaubt höchstens {EXCEL_MAX_ROWS - 1}). "
+                         "Bitte eine gröbere Auflösung wählen.")
+
+    workbook = Workbook(write_only=True)
+    if data.get('person_data'):
+        _write_person_sheet(workbook, data['person_data'])
+    if data.get('drinks_data'):
+        _write_drinks_sheet(workbook, data['drinks_data'])
+    if results:
+        _write_results_sheet(workbook, results)
+
+    written = 0
+    if results and total_rows:
+        # Diagrammblatt zuerst anlegen, damit es vor den Rohdaten steht
+        chart_sheet = workbook.create_sheet("Diagramm")
+        sheet = workbook.create_sheet("Verlauf")
+        sheet.column_dimensions['A'].width = 20
+        header = timeseries_header(results)
+        sheet.append(_header_row(sheet, header))
+        sheet.freeze_panes = 'A2'
+
+        # Zeilen werden beim append sofort geschrieben, daher genügt eine
+        # wiederverwendete Zeitzelle (Zahlenformat nur einmal anlegen)
+        time_cell = _formatted(sheet, None, TIME_FORMAT)
+        for times, values in iter_timeseries_chunks(results, resolution_seconds, chunk_rows=chunk_rows):
+            serials = ((times - EXCEL_EPOCH).astype(np.float64) / MS_PER_DAY).tolist()
+            for serial, row in zip(serials, values.tolist()):
+                time_cell.value = serial
+                sheet.append([time_cell, *row])
+            written += len(serials)
+            if progress is not None:
+                progress(written / total_rows)
+
+        chart = LineChart()
+        chart.title = "BAK-Verlauf"
+        chart.y_axis.title = "BAK (‰)"
+        chart.x_axis.title = "Zeit"
+        chart.x_axis.number_format = 'HH:MM'
+        chart.height = 12
+        chart.width = 28
+        chart.add_data(Reference(sheet, min_col=2, max_col=len(header), min_row=1, max_row=total_rows + 1),
+                       titles_from_data=True)
+        chart.set_categories(Reference(sheet, min_col=1, min_row=2, max_row=total_rows + 1))
+        for series in chart.series:
+            series.smooth = False
+            series.marker.symbol = 'none'
+        chart_sheet.add_chart(chart, 'A1')
+
+    workbook.save(file_path)
+    return written
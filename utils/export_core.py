@@ -0,0 +1,296 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from utils.timeseries_export import DEFAULT_RESOLUTION_SECONDS, write_timeseries_csv
+from utils.columnar_export import write_binary
+from utils.excel_export import write_streaming_workbook
+from utils.pdf_report import build_pdf_report
+
+# Export-Kern ohne Qt: Alle Formate werden über run_export geschrieben und
+# können so aus Skripten, Worker-Prozessen und Servern genutzt werden.
+# ExportThread und ExportManager sind nur dünne Qt-Adapter darum.
+#
+# Jeder Exporter erhält (file_path, data, options, report). report nimmt den
+# Anteil der erledigten Arbeit (0..1) entgegen und darf ExportCancelled
+# auslösen, um den Export abzubrechen.
+
+class ExportCancelled(Exception):
+    """Export wurde vom Benutzer abgebrochen"""
+
+def _no_progress(fraction: float):
+    pass
+
+def _json_default(value):
+    """Verschachtelte Zeitpunkte (Kurven, Einzelgetränke) als ISO-Text, numpy-Werte als Python-Werte"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def export_pdf(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als PDF"""
+    build_pdf_report(
+        file_path, data,
+        chart_format=options.get('chart_format', 'vector'),
+        progress=report
+    )
+
+def summary_csv_rows(data: Dict) -> List[List]:
+    """Zeilen des CSV-Exports (Personendaten, Getränke, Ergebnisse)"""
+    rows = []
+    
+    # Header
+    rows.append(['BAK-Kalkulator Export'])
+    rows.append(['Erstellt am:', datetime.now().strftime('%d.%m.%Y %H:%M')])
+    rows.append([])
+    
+    # Personendaten
+    if 'person_data' in data:
+        rows.append(['Personendaten'])
+        person = data['person_data']
+        rows.append(['Geschlecht:', person.get('gender', 'N/A')])
+        rows.append(['Alter:', f"{person.get('age', 'N/A')} Jahre"])
+        rows.append(['Größe:', f"{person.get('height', 'N/A')} cm"])
+        rows.append(['Gewicht:', f"{person.get('weight', 'N/A')} kg"])
+        rows.append(['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"])
+        rows.append(['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')])
+        rows.append([])
+    
+    # Getränke
+    if 'drinks_data' in data and data['drinks_data']:
+        rows.append(['Konsumierte Getränke'])
+        rows.append(['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)'])
+        
+        for drink in data['drinks_data']:
+            alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
+            rows.append([
+                drink['name'],
+                drink['volume'],
+                f"{drink['alcohol_content']:.1f}",
+                drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']),
+                f"{alcohol_grams:.1f}"
+            ])
+        rows.append([])
+    
+    # Ergebnisse
+    if 'results' in data and data['results']:
+        rows.append(['Berechnungsergebnisse'])
+        rows.append(['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰'])
+        
+        for model, result in data['results'].items():
+            rows.append([
+                model,
+                f"{result.get('current_bac', 0):.2f}",
+                f"{result.get('peak_bac', 0):.2f}",
+                result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--',
+                result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--'
+            ])
+    
+    return rows
+
+def export_csv(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als CSV (Fortschritt je geschriebener Zeile)"""
+    rows = summary_csv_rows(data)
+    
+    with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile, delimiter=';')
+        for index, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            report(index / len(rows))
+
+def export_timeseries_csv(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert die vollständigen BAK-Verläufe aller Modelle als CSV"""
+    results = data.get('results') or {}
+    if not any(result.get('drink_contributions') for result in results.values()):
+        raise ValueError("Keine Berechnungsergebnisse für den Zeitreihen-Export vorhanden.")
+    
+    write_timeseries_csv(
+        file_path, results,
+        resolution_seconds=options.get('resolution_seconds', DEFAULT_RESOLUTION_SECONDS),
+        include_contributions=options.get('include_contributions', False),
+        progress=report
+    )
+
+def export_json(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als JSON"""
+    
+    # Prepare data for JSON serialization
+    json_data = {}
+    
+    # Convert datetime objects to strings
+    if 'drinks_data' in data:
+        drinks_data = []
+        for drink in data['drinks_data']:
+            drink_copy = drink.copy()
+            if isinstance(drink_copy.get('time'), datetime):
+                drink_copy['time'] = drink_copy['time'].isoformat()
+            drinks_data.append(drink_copy)
+        json_data['drinks_data'] = drinks_data
+    
+    # Convert results datetime objects (Fortschritt je Modell, das Schreiben zählt als letzter Schritt)
+    results = data.get('results') or {}
+    steps = len(results) + 1
+    if 'results' in data:
+        results_data = {}
+        for index, (model, result) in enumerate(results.items(), start=1):
+            result_copy = result.copy()
+            for key, value in result_copy.items():
+                if isinstance(value, datetime):
+                    result_copy[key] = value.isoformat()
+            results_data[model] = result_copy
+            report(index / steps)
+        json_data['results'] = results_data
+    
+    # Copy other data as-is
+    for key, value in data.items():
+        if key not in ['drinks_data', 'results']:
+            json_data[key] = value
+    
+    with open(file_path, 'w', encoding='utf-8') as jsonfile:
+        json.dump(json_data, jsonfile, indent=2, ensure_ascii=False, default=_json_default)
+    report(1.0)
+
+def export_excel_streaming(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als Excel mit numerischem Verlaufsblatt und nativem Diagramm"""
+    # Die Verlaufszeilen machen den Großteil aus; Speichern des Workbooks zuletzt
+    write_streaming_workbook(
+        file_path, data,
+        resolution_seconds=options.get('resolution_seconds', DEFAULT_RESOLUTION_SECONDS),
+        progress=lambda fraction: report(0.95 * fraction)
+    )
+
+def export_binary(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert Kurven, Getränke und Parameter spaltenweise (NPZ/Parquet/Arrow)"""
+    write_binary(
+        file_path, data,
+        resolution_seconds=options.get('resolution_seconds', DEFAULT_RESOLUTION_SECONDS),
+        progress=report
+    )
+
+def export_excel_table(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als Excel (Tabellenblätter mit Personendaten, Getränken, Ergebnissen)"""
+    try:
+        import openpyxl
+        from openpyxl.styles import Font, PatternFill, Alignment
+    except ImportError:
+        raise ImportError("openpyxl ist nicht installiert. Bitte installieren Sie es mit: pip install openpyxl")
+    
+    # Fortschritt je geschriebener Zeile, das Speichern zählt als letzter Schritt
+    drinks = data.get('drinks_data') or []
+    results = data.get('results') or {}
+    total_rows = 6 + len(drinks) + len(results) + 1
+    written = 0
+    
+    def row_written():
+        nonlocal written
+        written += 1
+        report(written / total_rows)
+    
+    workbook = openpyxl.Workbook()
+    
+    # Personendaten Sheet
+    if 'person_data' in data:
+        ws_person = workbook.active
+        ws_person.title = "Personendaten"
+        
+        person = data['person_data']
+        ws_person['A1'] = "Personendaten"
+        ws_person['A1'].font = Font(bold=True, size=14)
+        
+        data_rows = [
+            ['Geschlecht:', person.get('gender', 'N/A')],
+            ['Alter:', f"{person.get('age', 'N/A')} Jahre"],
+            ['Größe:', f"{person.get('height', 'N/A')} cm"],
+            ['Gewicht:', f"{person.get('weight', 'N/A')} kg"],
+            ['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"],
+            ['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')]
+        ]
+        
+        for i, (label, value) in enumerate(data_rows, start=3):
+            ws_person[f'A{i}'] = label
+            ws_person[f'B{i}'] = value
+            ws_person[f'A{i}'].font = Font(bold=True)
+            row_written()
+    
+    # Getränke Sheet
+    if 'drinks_data' in data and data['drinks_data']:
+        ws_drinks = workbook.create_sheet("Getränke")
+        
+        headers = ['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)']
+        for col, header in enumerate(headers, start=1):
+            cell = ws_drinks.cell(row=1, column=col, value=header)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        
+        for row, drink in enumerate(data['drinks_data'], start=2):
+            alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
+            ws_drinks.cell(row=row, column=1, value=drink['name'])
+            ws_drinks.cell(row=row, column=2, value=drink['volume'])
+            ws_drinks.cell(row=row, column=3, value=drink['alcohol_content'])
+            ws_drinks.cell(row=row, column=4, value=drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']))
+            ws_drinks.cell(row=row, column=5, value=round(alcohol_grams, 1))
+            row_written()
+    
+    # Ergebnisse Sheet
+    if 'results' in data and data['results']:
+        ws_results = workbook.create_sheet("Ergebnisse")
+        
+        headers = ['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰']
+        for col, header in enumerate(headers, start=1):
+            cell = ws_results.cell(row=1, column=col, value=header)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        
+        for row, (model, result) in enumerate(data['results'].items(), start=2):
+            ws_results.cell(row=row, column=1, value=model)
+            ws_results.cell(row=row, column=2, value=f"{result.get('current_bac', 0):.2f}")
+            ws_results.cell(row=row, column=3, value=f"{result.get('peak_bac', 0):.2f}")
+            ws_results.cell(row=row, column=4, value=result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--')
+            ws_results.cell(row=row, column=5, value=result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--')
+            row_written()
+    
+    workbook.save(file_path)
+
+def export_excel(file_path: str, data: Dict, options: Dict, report: Callable[[float], None]):
+    """Exportiert als Excel ({'streaming': True}: mit BAK-Verlauf und Diagramm)"""
+    if options.get('streaming'):
+        export_excel_streaming(file_path, data, options, report)
+    else:
+        export_excel_table(file_path, data, options, report)
+
+# Exporter je Exporttyp
+EXPORTERS = {
+    'pdf': export_pdf,
+    'csv': export_csv,
+    'timeseries_csv': export_timeseries_csv,
+    'excel': export_excel,
+    'json': export_json,
+    'binary': export_binary,
+}
+
+def run_export(export_type: str, file_path: str, data: Dict, options: Optional[Dict] = None,
+               progress: Optional[Callable[[float], None]] = None):
+    """Schreibt einen Export; bei Abbruch wird die unvollständige Datei entfernt
+
+    Optionen, z.B. {'chart_format': 'vector' | 'raster'} oder für Zeitreihen
+    {'resolution_seconds': 60, 'include_contributions': False}.
+    """
+    exporter = EXPORTERS.get(export_type)
+    if exporter is None:
+        raise ValueError(f"Unbekannter Exporttyp: {export_type}")
+    report = progress or _no_progress
+    try:
+        report(0.0)
+        exporter(file_path, data, options or {}, report)
+    except ExportCancelled:
+        # Unvollständige Datei nicht liegen lassen
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as e:
+            print(f"Fehler beim Entfernen der abgebrochenen Exportdatei: {e}")
+        raise
@@ -1,442 +1,152 @@
-from typing import Dict, List, Optional
-import csv
-import json
+from typing import Dict, List, Optional, Tuple
+from collections import deque
 from datetime import datetime
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QWidget
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
-from PyQt6.QtGui import QPixmap, QPainter
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-import pandas as pd
 import os
 
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+from utils.export_core import ExportCancelled, run_export
+from utils.timeseries_export import DEFAULT_RESOLUTION_SECONDS
+from utils.columnar_export import PYARROW_AVAILABLE
+from utils.batch_reports import SESSION_EXTENSIONS, BatchCaseResult, find_sessions, run_batch
 
 class ExportThread(QThread):
-    """Thread für Export-Operationen"""
+    """Thread für Export-Operationen
+
+    Die Formate schreibt utils.export_core; der Thread leitet nur Fortschritt
+    und Ergebnis als Signale weiter. cancel() bricht beim nächsten
+    Fortschrittsschritt ab, die unvollständige Datei wird entfernt.
+    """
     
     progress_updated = pyqtSignal(int)
     export_finished = pyqtSignal(bool, str)  # success, message
     
-    def __init__(self, export_type: str, file_path: str, data: Dict):
+    def __init__(self, export_type: str, file_path: str, data: Dict, options: Optional[Dict] = None):
         super().__init__()
         self.export_type = export_type
         self.file_path = file_path
         self.data = data
+        # Export-Optionen, z.B. {'chart_format': 'vector' | 'raster'} oder für
+        # Zeitreihen {'resolution_seconds': 60, 'include_contributions': False};
+        # {'streaming': True} wählt den Excel-Export mit Verlauf und Diagramm
+        self.options = options or {}
+        self._cancel_requested = False
+        self._last_percent = -1
+    
+    def cancel(self):
+        """Fordert den Abbruch des Exports an"""
+        self._cancel_requested = True
+    
+    def is_cancelled(self) -> bool:
+        return self._cancel_requested
+    
+    def _report(self, fraction: float):
+        """Meldet den Fortschritt (Anteil 0..1) und prüft auf Abbruch"""
+        if self._cancel_requested:
+            raise ExportCancelled()
+        percent = max(0, min(100, int(fraction * 100)))
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress_updated.emit(percent)
     
     def run(self):
         """Führt den Export durch"""
         try:
-            if self.export_type == 'pdf':
-                self._export_pdf()
-            elif self.export_type == 'csv':
-                self._export_csv()
-            elif self.export_type == 'excel':
-                self._export_excel()
-            elif self.export_type == 'json':
-                self._export_json()
-            
+            run_export(self.export_type, self.file_path, self.data, self.options, progress=self._report)
+            if self._last_percent != 100:
+                self.progress_updated.emit(100)
             self.export_finished.emit(True, f"Export erfolgreich: {self.file_path}")
-            
+        except ExportCancelled:
+            self.export_finished.emit(False, f"Export abgebrochen: {self.file_path}")
         except Exception as e:
             self.export_finished.emit(False, f"Export-Fehler: {str(e)}")
+
+class BatchReportThread(QThread):
+    """Thread, der die Stapelverarbeitung von PDF-Berichten steuert
+
+    Die eigentliche Arbeit läuft in einem Prozesspool; der Thread meldet
+    Fortschritt und das Ergebnis jedes Falls.
+    """
     
-    def _export_pdf(self):
-        """Exportiert als PDF"""
-        if not REPORTLAB_AVAILABLE:
-            raise ImportError("ReportLab ist nicht installiert. Bitte installieren Sie es mit: pip install reportlab")
-        
-        self.progress_updated.emit(10)
-        
-        doc = SimpleDocTemplate(self.file_path, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Titel
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph("BAK-Kalkulator Bericht", title_style))
-        story.append(Spacer(1, 20))
-        
-        # Datum
-        date_style = ParagraphStyle(
-            'DateStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            alignment=TA_RIGHT
-        )
-        story.append(Paragraph(f"Erstellt am: {datetime.now().strftime('%d.%m.%Y %H:%M')}", date_style))
-        story.append(Spacer(1, 30))
-        
-        self.progress_updated.emit(20)
-        
-        # Personendaten
-        if 'person_data' in self.data:
-            person = self.data['person_data']
-            story.append(Paragraph("Personendaten", styles['Heading2']))
-            
-            person_table_data = [
-                ['Geschlecht:', person.get('gender', 'N/A')],
-                ['Alter:', f"{person.get('age', 'N/A')} Jahre"],
-                ['Größe:', f"{person.get('height', 'N/A')} cm"],
-                ['Gewicht:', f"{person.get('weight', 'N/A')} kg"],
-                ['BMI:', f"{person.get('bmi', 'N/A'):.1f}" if person.get('bmi') else 'N/A'],
-                ['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"],
-                ['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')]
-            ]
-            
-            person_table = Table(person_table_data, colWidths=[4*cm, 6*cm])
-            person_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-            ]))
-            story.append(person_table)
-            story.append(Spacer(1, 20))
-        
-        self.progress_updated.emit(40)
-        
-        # Getränke
-        if 'drinks_data' in self.data and self.data['drinks_data']:
-            story.append(Paragraph("Konsumierte Getränke", styles['Heading2']))
-            
-            drinks_table_data = [['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)']]
-            
-            for drink in self.data['drinks_data']:
-                alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
-                drinks_table_data.append([
-                    drink['name'],
-                    str(drink['volume']),
-                    f"{drink['alcohol_content']:.1f}",
-                    drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']),
-                    f"{alcohol_grams:.1f}"
-                ])
-            
-            drinks_table = Table(drinks_table_data, colWidths=[4*cm, 2*cm, 2*cm, 2*cm, 2*cm])
-            drinks_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(drinks_table)
-            story.append(Spacer(1, 20))
-        
-        self.progress_updated.emit(60)
-        
-        # Ergebnisse
-        if 'results' in self.data and self.data['results']:
-            story.append(Paragraph("Berechnungsergebnisse", styles['Heading2']))
-            
-            results_table_data = [['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰']]
-            
-            for model, result in self.data['results'].items():
-                results_table_data.append([
-                    model,
-                    f"{result.get('current_bac', 0):.2f} ‰",
-                    f"{result.get('peak_bac', 0):.2f} ‰",
-                    result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--',
-                    result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--'
-                ])
-            
-            results_table = Table(results_table_data, colWidths=[3*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm])
-            results_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(results_table)
-            story.append(Spacer(1, 20))
-        
-        self.progress_updated.emit(80)
-        
-        # Chart hinzufügen (falls verfügbar)
-        if 'chart_data' in self.data and self.data['chart_data']:
-            story.append(Paragraph("BAK-Verlaufsdiagramm", styles['Heading2']))
-            
-            # Erstelle Chart als Bild
-            chart_path = self.file_path.replace('.pdf', '_chart.png')
-            self._create_chart_image(chart_path)
-            
-            if os.path.exists(chart_path):
-                chart_img = Image(chart_path, width=15*cm, height=10*cm)
-                story.append(chart_img)
-                # Temporäres Chart-Bild löschen
-                os.remove(chart_path)
-        
-        # Disclaimer
-        story.append(Spacer(1, 30))
-        disclaimer_style = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.red,
-            alignment=TA_CENTER
-        )
-        story.append(Paragraph(
-            "<b>WICHTIGER HINWEIS:</b> Diese Berechnung dient nur zu Informationszwecken. "
-            "Die tatsächliche Blutalkoholkonzentration kann von den berechneten Werten abweichen. "
-            "Fahren Sie niemals unter Alkoholeinfluss!",
-            disclaimer_style
-        ))
-        
-        # PDF erstellen
-        doc.build(story)
-        self.progress_updated.emit(100)
+    progress_updated = pyqtSignal(int)
+    case_finished = pyqtSignal(str, bool, str)  # Sitzungsdatei, success, message
+    batch_finished = pyqtSignal(int, int)  # erfolgreich, fehlgeschlagen
     
-    def _create_chart_image(self, file_path: str):
-        """Erstellt ein Chart-Bild für PDF-Export"""
-        try:
-            import matplotlib.pyplot as plt
-            
-            fig, ax = plt.subplots(figsize=(12, 8))
-            
-            colors = ['#2196F3', '#FF9800', '#4CAF50', '#9C27B0']
-            
-            for i, (model, result) in enumerate(self.data['chart_data'].items()):
-                if 'bac_values' in result and result['bac_values']:
-                    times = [point[0] for point in result['bac_values']]
-                    bac_values = [point[1] for point in result['bac_values']]
-                    
-                    color = colors[i % len(colors)]
-                    ax.plot(times, bac_values, label=f"{model}", color=color, linewidth=2)
-            
-            # Grenzwerte
-            ax.axhline(y=0.3, color='orange', linestyle='--', alpha=0.7, label='0.3‰')
-            ax.axhline(y=0.5, color='red', linestyle='--', alpha=0.7, label='0.5‰')
-            ax.axhline(y=1.1, color='darkred', linestyle='--', alpha=0.7, label='1.1‰')
-            
-            ax.set_xlabel('Zeit')
-            ax.set_ylabel('BAK (‰)')
-            ax.set_title('Blutalkoholkonzentrations-Verlauf')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            plt.savefig(file_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-        except Exception as e:
-            print(f"Fehler beim Erstellen des Chart-Bildes: {e}")
+    def __init__(self, session_paths: List[str], output_dir: str, chart_format: str = 'vector',
+                 max_workers: Optional[int] = None):
+        super().__init__()
+        self.session_paths = session_paths
+        self.output_dir = output_dir
+        self.chart_format = chart_format
+        self.max_workers = max_workers
+        self.results: List[BatchCaseResult] = []
+        self._stop_requested = False
     
-    def _export_csv(self):
-        """Exportiert als CSV"""
-        self.progress_updated.emit(20)
-        
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile, delimiter=';')
-            
-            # Header
-            writer.writerow(['BAK-Kalkulator Export'])
-            writer.writerow(['Erstellt am:', datetime.now().strftime('%d.%m.%Y %H:%M')])
-            writer.writerow([])
-            
-            self.progress_updated.emit(40)
-            
-            # Personendaten
-            if 'person_data' in self.data:
-                writer.writerow(['Personendaten'])
-                person = self.data['person_data']
-                writer.writerow(['Geschlecht:', person.get('gender', 'N/A')])
-                writer.writerow(['Alter:', f"{person.get('age', 'N/A')} Jahre"])
-                writer.writerow(['Größe:', f"{person.get('height', 'N/A')} cm"])
-                writer.writerow(['Gewicht:', f"{person.get('weight', 'N/A')} kg"])
-                writer.writerow(['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"])
-                writer.writerow(['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')])
-                writer.writerow([])
-            
-            self.progress_updated.emit(60)
-            
-            # Getränke
-            if 'drinks_data' in self.data and self.data['drinks_data']:
-                writer.writerow(['Konsumierte Getränke'])
-                writer.writerow(['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)'])
-                
-                for drink in self.data['drinks_data']:
-                    alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
-                    writer.writerow([
-                        drink['name'],
-                        drink['volume'],
-                        f"{drink['alcohol_content']:.1f}",
-                        drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']),
-                        f"{alcohol_grams:.1f}"
-                    ])
-                writer.writerow([])
-            
-            self.progress_updated.emit(80)
-            
-            # Ergebnisse
-            if 'results' in self.data and self.data['results']:
-                writer.writerow(['Berechnungsergebnisse'])
-                writer.writerow(['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰'])
-                
-                for model, result in self.data['results'].items():
-                    writer.writerow([
-                        model,
-                        f"{result.get('current_bac', 0):.2f}",
-                        f"{result.get('peak_bac', 0):.2f}",
-                        result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--',
-                        result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--'
-                    ])
-        
-        self.progress_updated.emit(100)
+    def stop(self):
+        """Bricht nach den laufenden Fällen ab"""
+        self._stop_requested = True
     
-    def _export_json(self):
-        """Exportiert als JSON"""
-        self.progress_updated.emit(20)
-        
-        # Prepare data for JSON serialization
-        json_data = {}
-        
-        # Convert datetime objects to strings
-        if 'drinks_data' in self.data:
-            drinks_data = []
-            for drink in self.data['drinks_data']:
-                drink_copy = drink.copy()
-                if isinstance(drink_copy.get('time'), datetime):
-                    drink_copy['time'] = drink_copy['time'].isoformat()
-                drinks_data.append(drink_copy)
-            json_data['drinks_data'] = drinks_data
-        
-        self.progress_updated.emit(60)
-        
-        # Convert results datetime objects
-        if 'results' in self.data:
-            results_data = {}
-            for model, result in self.data['results'].items():
-                result_copy = result.copy()
-                for key, value in result_copy.items():
-                    if isinstance(value, datetime):
-                        result_copy[key] = value.isoformat()
-                results_data[model] = result_copy
-            json_data['results'] = results_data
-        
-        # Copy other data as-is
-        for key, value in self.data.items():
-            if key not in ['drinks_data', 'results']:
-                json_data[key] = value
-        
-        with open(self.file_path, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
+    def run(self):
+        """Verteilt die Fälle auf den Prozesspool"""
+        def on_result(result: BatchCaseResult, done: int, total: int):
+            self.case_finished.emit(result.session_path, result.success, result.message)
+            self.progress_updated.emit(int(done * 100 / total))
         
-        self.progress_updated.emit(100)
-    
-    def _export_excel(self):
-        """Exportiert als Excel"""
         try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-        except ImportError:
-            raise ImportError("openpyxl ist nicht installiert. Bitte installieren Sie es mit: pip install openpyxl")
-        
-        self.progress_updated.emit(20)
-        
-        workbook = openpyxl.Workbook()
-        
-        # Personendaten Sheet
-        if 'person_data' in self.data:
-            ws_person = workbook.active
-            ws_person.title = "Personendaten"
-            
-            person = self.data['person_data']
-            ws_person['A1'] = "Personendaten"
-            ws_person['A1'].font = Font(bold=True, size=14)
-            
-            data_rows = [
-                ['Geschlecht:', person.get('gender', 'N/A')],
-                ['Alter:', f"{person.get('age', 'N/A')} Jahre"],
-                ['Größe:', f"{person.get('height', 'N/A')} cm"],
-                ['Gewicht:', f"{person.get('weight', 'N/A')} kg"],
-                ['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"],
-                ['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')]
-            ]
-            
-            for i, (label, value) in enumerate(data_rows, start=3):
-                ws_person[f'A{i}'] = label
-                ws_person[f'B{i}'] = value
-                ws_person[f'A{i}'].font = Font(bold=True)
-        
-        self.progress_updated.emit(50)
-        
-        # Getränke Sheet
-        if 'drinks_data' in self.data and self.data['drinks_data']:
-            ws_drinks = workbook.create_sheet("Getränke")
-            
-            headers = ['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)']
-            for col, header in enumerate(headers, start=1):
-                cell = ws_drinks.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-            
-            for row, drink in enumerate(self.data['drinks_data'], start=2):
-                alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
-                ws_drinks.cell(row=row, column=1, value=drink['name'])
-                ws_drinks.cell(row=row, column=2, value=drink['volume'])
-                ws_drinks.cell(row=row, column=3, value=drink['alcohol_content'])
-                ws_drinks.cell(row=row, column=4, value=drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']))
-                ws_drinks.cell(row=row, column=5, value=round(alcohol_grams, 1))
-        
-        self.progress_updated.emit(80)
-        
-        # Ergebnisse Sheet
-        if 'results' in self.data and self.data['results']:
-            ws_results = workbook.create_sheet("Ergebnisse")
-            
-            headers = ['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰']
-            for col, header in enumerate(headers, start=1):
-                cell = ws_results.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-            
-            for row, (model, result) in enumerate(self.data['results'].items(), start=2):
-                ws_results.cell(row=row, column=1, value=model)
-                ws_results.cell(row=row, column=2, value=f"{result.get('current_bac', 0):.2f}")
-                ws_results.cell(row=row, column=3, value=f"{result.get('peak_bac', 0):.2f}")
-                ws_results.cell(row=row, column=4, value=result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--')
-                ws_results.cell(row=row, column=5, value=result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--')
-        
-        workbook.save(self.file_path)
-        self.progress_updated.emit(100)
+            self.results = run_batch(self.session_paths, self.output_dir, self.chart_format,
+                                     self.max_workers, on_result, lambda: self._stop_requested)
+        except Exception as e:
+            # Pool konnte nicht gestartet werden: alle Fälle als fehlgeschlagen melden
+            print(f"Fehler bei der Stapelverarbeitung: {e}")
+            self.results = [BatchCaseResult(path, '', False, str(e), 0.0) for path in self.session_paths]
+        succeeded = sum(1 for result in self.results if result.success)
+        self.batch_finished.emit(succeeded, len(self.results) - succeeded)
+
+# Anzahl gleichzeitig laufender Exporte; weitere warten in der Warteschlange
+MAX_CONCURRENT_EXPORTS = 3
+
+# Eintrag der Stapelverarbeitung im Gesamtfortschritt (Job-Nummern beginnen bei 1)
+BATCH_JOB_ID = 0
+
+# Anzeigenamen der Exporttypen (für die Jobliste)
+EXPORT_TYPE_LABELS = {
+    'pdf': 'PDF',
+    'csv': 'CSV',
+    'timeseries_csv': 'Zeitreihe',
+    'excel': 'Excel',
+    'json': 'JSON',
+    'binary': 'Binär',
+}
 
 class ExportManager(QObject):
-    """Manager für Export-Funktionen"""
+    """Manager für Export-Funktionen
+
+    Exporte werden als Jobs in eine Warteschlange gestellt; bis zu
+    MAX_CONCURRENT_EXPORTS laufen gleichzeitig, jeder Job kann einzeln
+    abgebrochen werden. export_progress meldet den Gesamtfortschritt aller
+    Jobs seit dem letzten Leerlauf; eine Stapelverarbeitung zählt darin als
+    eigener Job.
+    """
     
     export_started = pyqtSignal()
     export_progress = pyqtSignal(int)
     export_finished = pyqtSignal(bool, str)  # success, message
+    batch_case_finished = pyqtSignal(str, bool, str)  # Sitzungsdatei, success, message
+    job_added = pyqtSignal(int, str)  # job_id, Bezeichnung
+    job_progress = pyqtSignal(int, int)  # job_id, Prozent
+    job_finished = pyqtSignal(int, bool, str)  # job_id, success, message
     
     def __init__(self, parent: QWidget = None):
         super().__init__()
         self.parent = parent
-        self.export_thread = None
+        self.max_concurrent = MAX_CONCURRENT_EXPORTS
+        self.batch_thread = None
+        self._next_job_id = 1
+        self._pending = deque()  # (job_id, ExportThread), FIFO
+        self._running: Dict[int, ExportThread] = {}
+        self._labels: Dict[int, str] = {}
+        # Fortschritt aller Jobs seit dem letzten Leerlauf (für den Gesamtbalken)
+        self._progress: Dict[int, int] = {}
     
     def export_to_pdf(self, data: Dict):
         """Exportiert Daten als PDF"""
@@ -462,8 +172,25 @@ class ExportManager(QObject):
         if file_path:
             self._start_export('csv', file_path, data)
     
-    def export_to_excel(self, data: Dict):
-        """Exportiert Daten als Excel"""
+    def export_timeseries_csv(self, data: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                              include_contributions: bool = False):
+        """Exportiert die BAK-Verläufe als Zeitreihe (CSV)"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self.parent,
+            "Zeitreihe exportieren",
+            f"BAK_Zeitreihe_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            "CSV Dateien (*.csv)"
+        )
+        
+        if file_path:
+            self._start_export('timeseries_csv', file_path, data, {
+                'resolution_seconds': resolution_seconds,
+                'include_contributions': include_contributions
+            })
+    
+    def export_to_excel(self, data: Dict, streaming: bool = False,
+                        resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS):
+        """Exportiert Daten als Excel (streaming: mit BAK-Verlauf und Diagramm)"""
         file_path, _ = QFileDialog.getSaveFileName(
             self.parent,
             "Excel exportieren",
@@ -472,7 +199,8 @@ class ExportManager(QObject):
         )
         
         if file_path:
-            self._start_export('excel', file_path, data)
+            options = {'streaming': True, 'resolution_seconds': resolution_seconds} if streaming else None
+            self._start_export('excel', file_path, data, options)
     
     def export_to_json(self, data: Dict):
         """Exportiert Daten als JSON"""
@@ -486,15 +214,146 @@ class ExportManager(QObject):
         if file_path:
             self._start_export('json', file_path, data)
     
-    def _start_export(self, export_type: str, file_path: str, data: Dict):
-        """Startet den Export in einem separaten Thread"""
-        if self.export_thread and self.export_thread.isRunning():
-            QMessageBox.warning(self.parent, "Export läuft", "Es läuft bereits ein Export. Bitte warten Sie.")
+    def export_to_binary(self, data: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS):
+        """Exportiert Daten spaltenweise binär (NPZ, mit pyarrow auch Parquet/Arrow)"""
+        file_filter = "NumPy Archiv (*.npz)"
+        if PYARROW_AVAILABLE:
+            file_filter += ";;Parquet Dateien (*.parquet);;Arrow Dateien (*.arrow *.feather)"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self.parent,
+            "Binär exportieren",
+            f"BAK_Berechnung_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz",
+            file_filter
+        )
+        
+        if file_path:
+            self._start_export('binary', file_path, data, {'resolution_seconds': resolution_seconds})
+    
+    def export_batch_reports(self, chart_format: str = 'vector'):
+        """Erstellt PDF-Berichte für alle Sitzungen eines Verzeichnisses"""
+        if self.batch_thread and self.batch_thread.isRunning():
+            QMessageBox.warning(self.parent, "Stapelverarbeitung läuft",
+                                "Es läuft bereits eine Stapelverarbeitung. Bitte warten Sie.")
             return
         
-        self.export_started.emit()
+        session_dir = QFileDialog.getExistingDirectory(self.parent, "Verzeichnis mit gespeicherten Sitzungen wählen")
+        if not session_dir:
+            return
+        session_paths = find_sessions(session_dir)
+        if not session_paths:
+            patterns = ", ".join(f"*{extension}" for extension in SESSION_EXTENSIONS)
+            QMessageBox.warning(self.parent, "Keine Sitzungen",
+                                f"Im gewählten Verzeichnis wurden keine Sitzungsdateien ({patterns}) gefunden.")
+            return
         
-        self.export_thread = ExportThread(export_type, file_path, data)
-        self.export_thread.progress_updated.connect(self.export_progress.emit)
-        self.export_thread.export_finished.connect(self.export_finished.emit)
-        self.export_thread.start() 
\ No newline at end of file
+        if not self.has_active_jobs():
+            self._progress.clear()
+            self.export_started.emit()
+        self._progress[BATCH_JOB_ID] = 0
+        
+        output_dir = os.path.join(session_dir, 'Berichte')
+        self.batch_thread = BatchReportThread(session_paths, output_dir, chart_format)
+        self.batch_thread.progress_updated.connect(self._on_batch_progress)
+        self.batch_thread.case_finished.connect(self.batch_case_finished.emit)
+        self.batch_thread.batch_finished.connect(self._on_batch_finished)
+        self.batch_thread.start()
+    
+    def _on_batch_progress(self, percent: int):
+        """Übernimmt den Fortschritt der Stapelverarbeitung in die Gesamtanzeige"""
+        self._progress[BATCH_JOB_ID] = percent
+        self._emit_total_progress()
+    
+    def _on_batch_finished(self, succeeded: int, failed: int):
+        """Fasst das Ergebnis der Stapelverarbeitung zusammen"""
+        output_dir = ''
+        if self.batch_thread:
+            # Das Signal kommt noch aus run(); danach gilt der Thread als beendet
+            self.batch_thread.wait()
+            output_dir = self.batch_thread.output_dir
+        self._progress[BATCH_JOB_ID] = 100
+        message = f"{succeeded} Berichte erstellt in {output_dir}"
+        if failed:
+            message += f", {failed} fehlgeschlagen"
+        self.export_finished.emit(failed == 0, message)
+    
+    def _start_export(self, export_type: str, file_path: str, data: Dict, options: Optional[Dict] = None) -> int:
+        """Stellt einen Export in die Warteschlange und gibt die Job-Nummer zurück"""
+        if not self.has_active_jobs():
+            self._progress.clear()
+            self.export_started.emit()
+        
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        thread = ExportThread(export_type, file_path, data, options)
+        thread.progress_updated.connect(lambda percent, job_id=job_id: self._on_job_progress(job_id, percent))
+        thread.export_finished.connect(
+            lambda success, message, job_id=job_id: self._on_job_finished(job_id, success, message))
+        
+        label = f"{EXPORT_TYPE_LABELS.get(export_type, export_type)}: {os.path.basename(file_path)}"
+        self._labels[job_id] = label
+        self._progress[job_id] = 0
+        self._pending.append((job_id, thread))
+        self.job_added.emit(job_id, label)
+        self._start_pending()
+        return job_id
+    
+    def _start_pending(self):
+        """Startet wartende Jobs, solange Plätze frei sind"""
+        while self._pending and len(self._running) < self.max_concurrent:
+            job_id, thread = self._pending.popleft()
+            self._running[job_id] = thread
+            thread.start()
+    
+    def has_active_jobs(self) -> bool:
+        """True, solange Exporte laufen oder warten oder eine Stapelverarbeitung läuft"""
+        batch_running = bool(self.batch_thread and self.batch_thread.isRunning())
+        return bool(self._running or self._pending) or batch_running
+    
+    def active_jobs(self) -> List[Tuple[int, str, bool]]:
+        """Laufende und wartende Jobs als (job_id, Bezeichnung, läuft)"""
+        jobs = [(job_id, self._labels[job_id], True) for job_id in self._running]
+        jobs.extend((job_id, self._labels[job_id], False) for job_id, _ in self._pending)
+        return jobs
+    
+    def cancel_job(self, job_id: int):
+        """Bricht einen laufenden oder wartenden Export ab"""
+        for index, (pending_id, thread) in enumerate(self._pending):
+            if pending_id == job_id:
+                del self._pending[index]
+                thread.deleteLater()
+                self._on_job_finished(job_id, False, f"Export abgebrochen: {thread.file_path}")
+                return
+        thread = self._running.get(job_id)
+        if thread is not None:
+            thread.cancel()
+    
+    def cancel_all(self):
+        """Bricht alle Exporte ab (auch eine laufende Stapelverarbeitung)"""
+        for job_id, _, _ in self.active_jobs():
+            self.cancel_job(job_id)
+        if self.batch_thread and self.batch_thread.isRunning():
+            self.batch_thread.stop()
+    
+    def _on_job_progress(self, job_id: int, percent: int):
+        """Leitet den Fortschritt eines Jobs weiter und aktualisiert die Gesamtanzeige"""
+        if job_id not in self._progress:
+            return
+        self._progress[job_id] = percent
+        self.job_progress.emit(job_id, percent)
+        self._emit_total_progress()
+    
+    def _emit_total_progress(self):
+        """Meldet den mittleren Fortschritt aller Jobs seit dem letzten Leerlauf"""
+        self.export_progress.emit(sum(self._progress.values()) // len(self._progress))
+    
+    def _on_job_finished(self, job_id: int, success: bool, message: str):
+        """Räumt einen beendeten Job ab und startet den nächsten"""
+        thread = self._running.pop(job_id, None)
+        if thread is not None:
+            thread.wait()
+            thread.deleteLater()
+        self._labels.pop(job_id, None)
+        self._progress[job_id] = 100
+        self.job_finished.emit(job_id, success, message)
+        self._start_pending()
+        self.export_finished.emit(success, message) 
\ No newline at end of file
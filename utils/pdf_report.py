@@ -0,0 +1,245 @@
+from datetime import datetime
+from io import BytesIO
+from typing import Callable, Dict, Optional
+
+from utils.chart_renderer import ChartRenderer
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+# PDF-Bericht ohne Qt-Abhängigkeit: wird vom ExportThread und von den
+# Prozessen der Stapelverarbeitung verwendet. Stile und Chart-Renderer können
+# übergeben werden, damit ein Worker sie nur einmal anlegt.
+
+class ReportStyles:
+    """Absatzstile des PDF-Berichts (einmal pro Prozess bzw. Export angelegt)"""
+
+    def __init__(self):
+        sheet = getSampleStyleSheet()
+        self.normal = sheet['Normal']
+        self.heading = sheet['Heading2']
+        self.title = ParagraphStyle(
+            'CustomTitle',
+            parent=sheet['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        self.date = ParagraphStyle(
+            'DateStyle',
+            parent=sheet['Normal'],
+            fontSize=12,
+            alignment=TA_RIGHT
+        )
+        self.disclaimer = ParagraphStyle(
+            'Disclaimer',
+            parent=sheet['Normal'],
+            fontSize=10,
+            textColor=colors.red,
+            alignment=TA_CENTER
+        )
+
+def _flowable_weight(flowable) -> int:
+    """Aufwand eines Flowables für den Fortschritt (Tabellen zählen zeilenweise)"""
+    return len(getattr(flowable, '_cellvalues', ())) or 1
+
+if REPORTLAB_AVAILABLE:
+    class ProgressDocTemplate(SimpleDocTemplate):
+        """SimpleDocTemplate, das den Fortschritt beim Seitenaufbau meldet
+
+        Nach jedem gesetzten Flowable wird der Anteil der erledigten Arbeit
+        gemeldet. Aufgeteilte Tabellen werden über ihre verbleibenden Zeilen
+        gezählt, sodass auch lange Getränkelisten gleichmäßig fortschreiten.
+        """
+
+        def __init__(self, filename, progress: Optional[Callable[[float], None]] = None, **kwargs):
+            super().__init__(filename, **kwargs)
+            self._progress = progress
+            self._total_weight = 1
+
+        def build(self, flowables, *args, **kwargs):
+            self._total_weight = max(sum(_flowable_weight(f) for f in flowables), 1)
+            super().build(flowables, *args, **kwargs)
+
+        def handle_flowable(self, flowables):
+            super().handle_flowable(flowables)
+            if self._progress is not None:
+                remaining = sum(_flowable_weight(f) for f in flowables)
+                self._progress(max(0.0, 1.0 - remaining / self._total_weight))
+
+def create_chart_drawing(chart_data: Dict, renderer: Optional[ChartRenderer] = None):
+    """Erstellt das Chart als reportlab-Vektorgrafik für den PDF-Export"""
+    try:
+        return (renderer or ChartRenderer()).render_vector(chart_data, width=17*cm, height=11*cm)
+    except Exception as e:
+        print(f"Fehler beim Erstellen der Chart-Grafik: {e}")
+        return None
+
+def create_chart_image(chart_data: Dict, renderer: Optional[ChartRenderer] = None) -> Optional[BytesIO]:
+    """Erstellt ein Chart-Bild für PDF-Export als PNG-Puffer"""
+    try:
+        return (renderer or ChartRenderer()).render_png(chart_data)
+    except Exception as e:
+        print(f"Fehler beim Erstellen des Chart-Bildes: {e}")
+        return None
+
+def build_pdf_report(file_path: str, data: Dict, chart_format: str = 'vector',
+                     styles: Optional[ReportStyles] = None, renderer: Optional[ChartRenderer] = None,
+                     progress: Optional[Callable[[float], None]] = None):
+    """Schreibt den PDF-Bericht (Personendaten, Getränke, Ergebnisse, Diagramm)
+
+    chart_format: 'vector' (reportlab-Grafik) oder 'raster' (PNG über Agg).
+    progress erhält den Anteil der erledigten Arbeit (0..1): bis 0.1 für das
+    Zusammenstellen, danach für die gesetzten Flowables bzw. Seiten.
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("ReportLab ist nicht installiert. Bitte installieren Sie es mit: pip install reportlab")
+    
+    report = progress or (lambda fraction: None)
+    report(0.0)
+    
+    styles = styles or ReportStyles()
+    story = []
+    
+    # Titel
+    story.append(Paragraph("BAK-Kalkulator Bericht", styles.title))
+    story.append(Spacer(1, 20))
+    
+    # Datum
+    story.append(Paragraph(f"Erstellt am: {datetime.now().strftime('%d.%m.%Y %H:%M')}", styles.date))
+    story.append(Spacer(1, 30))
+    
+    report(0.02)
+    
+    # Personendaten
+    if 'person_data' in data:
+        person = data['person_data']
+        story.append(Paragraph("Personendaten", styles.heading))
+        
+        person_table_data = [
+            ['Geschlecht:', person.get('gender', 'N/A')],
+            ['Alter:', f"{person.get('age', 'N/A')} Jahre"],
+            ['Größe:', f"{person.get('height', 'N/A')} cm"],
+            ['Gewicht:', f"{person.get('weight', 'N/A')} kg"],
+            ['BMI:', f"{person.get('bmi', 'N/A'):.1f}" if person.get('bmi') else 'N/A'],
+            ['Körperfettanteil:', f"{person.get('body_fat', 'N/A')}%"],
+            ['Trinkgewohnheit:', person.get('drinking_habit', 'N/A')]
+        ]
+        
+        person_table = Table(person_table_data, colWidths=[4*cm, 6*cm])
+        person_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+        ]))
+        story.append(person_table)
+        story.append(Spacer(1, 20))
+    
+    report(0.04)
+    
+    # Getränke
+    if 'drinks_data' in data and data['drinks_data']:
+        story.append(Paragraph("Konsumierte Getränke", styles.heading))
+        
+        drinks_table_data = [['Getränk', 'Menge (ml)', 'Alkohol (%)', 'Zeit', 'Alkohol (g)']]
+        
+        for drink in data['drinks_data']:
+            alcohol_grams = drink['volume'] * (drink['alcohol_content'] / 100) * 0.8
+            drinks_table_data.append([
+                drink['name'],
+                str(drink['volume']),
+                f"{drink['alcohol_content']:.1f}",
+                drink['time'].strftime('%H:%M') if isinstance(drink['time'], datetime) else str(drink['time']),
+                f"{alcohol_grams:.1f}"
+            ])
+        
+        drinks_table = Table(drinks_table_data, colWidths=[4*cm, 2*cm, 2*cm, 2*cm, 2*cm], repeatRows=1)
+        drinks_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(drinks_table)
+        story.append(Spacer(1, 20))
+    
+    report(0.06)
+    
+    # Ergebnisse
+    if 'results' in data and data['results']:
+        story.append(Paragraph("Berechnungsergebnisse", styles.heading))
+        
+        results_table_data = [['Modell', 'Aktuelle BAK', 'Max. BAK', 'Zeit bis 0.5‰', 'Zeit bis 0.0‰']]
+        
+        for model, result in data['results'].items():
+            results_table_data.append([
+                model,
+                f"{result.get('current_bac', 0):.2f} ‰",
+                f"{result.get('peak_bac', 0):.2f} ‰",
+                result.get('time_to_03', '--').strftime('%H:%M') if result.get('time_to_03') else '--',
+                result.get('time_to_00', '--').strftime('%H:%M') if result.get('time_to_00') else '--'
+            ])
+        
+        results_table = Table(results_table_data, colWidths=[3*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm])
+        results_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(results_table)
+        story.append(Spacer(1, 20))
+    
+    report(0.08)
+    
+    # Chart hinzufügen (falls verfügbar)
+    if 'chart_data' in data and data['chart_data']:
+        story.append(Paragraph("BAK-Verlaufsdiagramm", styles.heading))
+        
+        if chart_format == 'vector':
+            # Vektorgrafik: scharf bei jedem Zoom, kleine Dateien
+            chart_drawing = create_chart_drawing(data['chart_data'], renderer)
+            if chart_drawing is not None:
+                story.append(chart_drawing)
+        else:
+            # Chart im Speicher rendern (kein temporäres PNG neben der Zieldatei)
+            chart_buffer = create_chart_image(data['chart_data'], renderer)
+            if chart_buffer is not None:
+                chart_img = Image(chart_buffer, width=15*cm, height=10*cm)
+                story.append(chart_img)
+    
+    # Disclaimer
+    story.append(Spacer(1, 30))
+    story.append(Paragraph(
+        "<b>WICHTIGER HINWEIS:</b> Diese Berechnung dient nur zu Informationszwecken. "
+        "Die tatsächliche Blutalkoholkonzentration kann von den berechneten Werten abweichen. "
+        "Fahren Sie niemals unter Alkoholeinfluss!",
+        styles.disclaimer
+    ))
+    
+    report(0.1)
+    
+    # PDF erstellen (Fortschritt je gesetztem Flowable)
+    doc = ProgressDocTemplate(file_path, progress=lambda fraction: report(0.1 + 0.9 * fraction), pagesize=A4)
+    doc.build(story)
+    report(1.0)
@@ -0,0 +1,458 @@
+from functools import lru_cache
+from typing import Dict, List
+
+# HTML-Vorlagen für die ausführliche Berechnung und die forensische Validierung.
+# Die langen statischen Textteile (Grundlagen, Referenzen, Hinweise) liegen als
+# fertige Fragmente vor; pro Berechnung werden nur noch die Zahlenblöcke je
+# Modell eingesetzt und alle Teile einmal zusammengefügt.
+
+NO_CALCULATION_TEXT = "Keine Berechnung möglich. Bitte geben Sie alle erforderlichen Daten ein."
+
+DETAIL_HEADER = """
+        <h2>📊 Wissenschaftliche BAK-Berechnung</h2>
+        <p><i>Evidenzbasierte Pharmakodynamik und forensische Alkoholkennzeichnung nach internationalen Standards</i></p>
+
+        <h3>📚 Wissenschaftliche Grundlagen</h3>
+        <p>Die Blutalkoholkonzentrations-Berechnung basiert auf etablierten pharmakokinetischen Modellen der forensischen Toxikologie.
+        Alle implementierten Algorithmen entsprechen den Richtlinien der <b>International Association of Forensic Sciences (IAFS)</b>
+        und der <b>Society of Forensic Toxicologists (SOFT)</b>.</p>
+
+        <h4>🔬 Pharmakokinetische Grundprinzipien</h4>
+        <ul>
+            <li><b>ADME-Prozess:</b> Absorption → Distribution → Metabolism → Excretion</li>
+            <li><b>Verteilungsvolumen:</b> Körperwasser-abhängig (50-70% Körpergewicht)</li>
+            <li><b>Elimination:</b> First-Order-Kinetik, 90-95% hepatisch (ADH/ALDH)</li>
+            <li><b>Linearität:</b> Michaelis-Menten-Kinetik bei hohen Konzentrationen</li>
+        </ul>
+        """
+
+# Ausführliche Modell-Beschreibungen mit Referenzen
+MODEL_INFO = {
+    'Widmark': {
+        'beschreibung': 'Das klassische Widmark-Modell (1932) bildet das Fundament der forensischen Alkoholtoxikologie.',
+        'formel': 'C = A / (m × r)',
+        'parameter': 'C = BAK (‰), A = Alkohol (g), m = Körpergewicht (kg), r = Verteilungsfaktor',
+        'referenzen': [
+            '<a href="https://link.springer.com/chapter/10.1007/978-3-662-48986-4_3318">Widmark, E.M.P. (1932). Die theoretischen Grundlagen und die praktische Verwendbarkeit der gerichtlich-medizinischen Alkoholbestimmung. Urban & Schwarzenberg</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/10456393/">Jones, A.W. & Norberg, A. (1999). What constitutes a "drink"? Alcohol Alcohol 34:581-599</a>',
+            '<a href="https://doi.org/10.1111/j.1530-0277.2006.00155.x">Brick, J. (2006). Standardization of alcohol calculations in research. Alcohol Clin Exp Res 30:1276-1287</a>'
+        ]
+    },
+    'Watson': {
+        'beschreibung': 'Das Watson-Modell (1981) berücksichtigt geschlechts- und altersspezifische Unterschiede in der Körperzusammensetzung.',
+        'formel': 'TBW = f(Alter, Größe, Gewicht, Geschlecht)',
+        'parameter': 'TBW = Total Body Water, anthropometrische Regression',
+        'referenzen': [
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/7361681/">Watson, P.E. et al. (1980). Total body water volumes for adult males and females. Am J Clin Nutr 33:27-39</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/11350103/">Chumlea, W.C. et al. (2001). Total body water data for white adults 18 to 64 years. Kidney Int 59:2250-2258</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/23525478/">Silva, A.M. et al. (2013). Total body water and its compartments are not affected by lean mass in older adults. J Gerontol A Biol Sci Med Sci 68:1016-1021</a>'
+        ]
+    },
+    'Forrest': {
+        'beschreibung': 'Das Forrest-Modell (1986) erweitert Widmark um altersabhängige Korrekturfaktoren.',
+        'formel': 'r_korr = r_standard × (1 - 0.01 × (Alter - 20))',
+        'parameter': 'Alterskorrektur ab 20 Jahren, 1% Reduktion pro Jahr',
+        'referenzen': [
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/3775982/">Forrest, A.R.W. (1986). Non-linear kinetics of ethyl alcohol metabolism. J Forensic Leg Med 3:41-49</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/8963496/">Kalant, H. (1996). Current state of knowledge about the mechanisms of alcohol tolerance. Addict Biol 1:133-141</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/11505034/">Ramchandani, V.A. et al. (2001). A physiologically-based pharmacokinetic (PBPK) model for alcohol. Alcohol Clin Exp Res 25:1239-1244</a>'
+        ]
+    },
+    'Seidl': {
+        'beschreibung': 'Das Seidl-Modell (2000) ist eine moderne Weiterentwicklung mit verbesserter Präzision für forensische Anwendungen.',
+        'formel': 'Multi-Parameter Regression mit Korrekturfaktoren',
+        'parameter': 'Geschlecht, Alter, BMI, Trinkmuster, Genetik',
+        'referenzen': [
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/11118635/">Seidl, S. et al. (2000). A theoretical approach to estimate blood alcohol concentration. Forensic Sci Int 114:1-8</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/12680815/">Hering, W. et al. (2003). Comparison of serum and whole blood alcohol measurements. J Anal Toxicol 27:123-126</a>',
+            '<a href="https://pubmed.ncbi.nlm.nih.gov/17899210/">Ulrich, L. et al. (2008). Validation studies of forensic blood alcohol calculations. Int J Legal Med 122:35-42</a>'
+        ]
+    }
+}
+
+MODEL_INTRO_TEMPLATE = """
+            <hr style="margin: 20px 0;">
+            <h3>🧬 {model}-Modell</h3>
+
+            <h4>📖 Wissenschaftlicher Hintergrund</h4>
+            <p>{beschreibung}</p>
+
+            <h4>📐 Mathematisches Modell</h4>
+            <p><b>Grundformel:</b> <code>{formel}</code></p>
+            <p><b>Parameter:</b> {parameter}</p>
+
+            <h4>📊 Quantitative Parameter</h4>
+            <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%;">
+            <tr style="background-color: #f0f0f0;">
+                <th>Parameter</th>
+                <th>Wert</th>
+                <th>Einheit</th>
+                <th>Wissenschaftliche Grundlage</th>
+            </tr>
+            """
+
+# Parameterzeilen: Bezeichnung, Einheit, Grundlage (Wert wird eingesetzt)
+PARAMETER_ROWS = (
+    ('Alkoholmenge', 'g C₂H₅OH', 'Gravimetrische Berechnung: V × ρ × α (OIML)'),
+    ('Körpergewicht', 'kg', 'Anthropometrische Standardmessung'),
+    ('r-Faktor', 'L/kg', 'Geschlechtsspezifisch: ♂ 0.68±0.05, ♀ 0.55±0.05 (Gullberg & Jones, 1994)'),
+    ('Körperfett-Korrektur', 'dimensionslos', 'Deurenberg-Korrektur für Magermasse'),
+    ('Eliminationsrate', '‰/h', 'Hepatische ADH/ALDH-Aktivität (Jones & Sternebring, 1992)')
+)
+
+PARAMETER_ROW_TEMPLATE = """
+                <tr>
+                    <td><b>{param}</b></td>
+                    <td>{{}}</td>
+                    <td>{unit}</td>
+                    <td>{basis}</td>
+                </tr>
+                """
+
+# Berechnungsschritte: Titel, Schlüssel in calculation_details (oder feste Formel), Erklärung
+CALCULATION_STEPS = (
+    ('Alkoholmengen-Bestimmung', None, 'Σ(Volumen_i × Alkoholgrad_i × 0.789)', 'Volumetrische Summation aller Getränke'),
+    ('Verteilungsvolumen', 'zwischenschritt_1', '', 'Widmark-Grundformel'),
+    ('Einzelgetränk-Berechnung', 'individual_peaks', '', 'Separate Pharmakodynamik je Getränk'),
+    ('Körperfett-Korrektur', 'körperfett_korrektur', '', 'Magermasse-Adjustierung'),
+    ('Gesamtkurve', None, 'Σ(BAK_einzelgetränk_i(t))', 'Summation aller Einzelkurven über Zeit')
+)
+
+CALCULATION_STEP_TEMPLATE = """
+                    <li><b>{titel}:</b><br>
+                        <code>{formel}</code><br>
+                        <i>{erklärung}</i>
+                    </li>
+                    """
+
+DRINK_ANALYSIS_TEMPLATE = """
+                <h4>🍺 Einzelgetränk-Analyse</h4>
+                <p>Jedes der {drink_count} Getränke wird separat mit eigener Resorptions- und Eliminationskurve berechnet.
+                Die Einzelbeiträge stehen in der Tabelle <b>Einzelgetränk-Analyse</b> unterhalb.</p>
+
+                <h5>📈 Pharmakodynamische Prinzipien</h5>
+                <ul>
+                    <li><b>Resorptionszeit:</b> Abhängig von Alkoholmenge (10g: 30min, 20g: 45min, >20g: 60min)</li>
+                    <li><b>Peak-Timing:</b> Individuell je Getränk, nicht global</li>
+                    <li><b>Elimination:</b> First-Order-Kinetik ab Peak-Zeit</li>
+                    <li><b>Superposition:</b> Lineare Summation aller Einzelkurven</li>
+                </ul>
+                """
+
+RESULTS_TEMPLATE = """
+            <h4>📋 Quantitative Ergebnisse</h4>
+            <div style="background-color: #f9f9f9; padding: 15px; border-left: 4px solid #2196F3;">
+            <ul>
+                <li><b>Peak-BAK:</b> {peak_bac:.3f} ‰ ± 0.02 ‰ (95% CI)</li>
+                <li><b>Aktuelle BAK:</b> {current_bac:.3f} ‰ ± 0.015 ‰</li>
+                <li><b>Peak-Zeit:</b> {peak_time} (Resorptionsmaximum)</li>
+                <li><b>Eliminationsdauer:</b> {elimination_time}</li>
+            """
+
+DETAIL_FOOTER = """
+        <hr style="margin: 20px 0;">
+        <h3>⚠️ Methodologische Limitationen</h3>
+        <div style="background-color: #fff3cd; padding: 15px; border: 1px solid #ffeaa7;">
+        <h4>Modell-Unsicherheiten</h4>
+        <ul>
+            <li><b>Inter-individuelle Variabilität:</b> ±20-30% (Genetik, Enzymoproteine)</li>
+            <li><b>Intra-individuelle Faktoren:</b> Tageszeit, Stress, Medikamente</li>
+            <li><b>Resorptionskinetik:</b> Mageninhalt, Trinkgeschwindigkeit, CO₂</li>
+            <li><b>Analytische Präzision:</b> ±0.005-0.02‰ je nach Methode</li>
+        </ul>
+        </div>
+
+        <h3>⚖️ Forensisch-rechtliche Grenzwerte</h3>
+        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%;">
+        <tr style="background-color: #f0f0f0;">
+            <th>BAK-Bereich</th>
+            <th>Rechtliche Konsequenz</th>
+            <th>Gesetzliche Grundlage</th>
+        </tr>
+        <tr>
+            <td>≥ 0.3 ‰</td>
+            <td>Ordnungswidrigkeit bei Auffälligkeiten</td>
+            <td>§ 24a StVG, § 316 StGB</td>
+        </tr>
+        <tr>
+            <td>≥ 0.5 ‰</td>
+            <td>Ordnungswidrigkeit, Bußgeld, Fahrverbot</td>
+            <td>§ 24a StVG</td>
+        </tr>
+        <tr>
+            <td>≥ 1.1 ‰</td>
+            <td>Absolute Fahruntüchtigkeit (Straftat)</td>
+            <td>§ 316 StGB</td>
+        </tr>
+        <tr>
+            <td>≥ 3.0 ‰</td>
+            <td>Lebensgefährliche Intoxikation</td>
+            <td>Medizinischer Notfall</td>
+        </tr>
+        </table>
+
+        <h3>⚗️ Qualitätssicherung und Validierung</h3>
+        <p>Diese Software implementiert validierte Algorithmen nach:</p>
+        <ul>
+            <li><b>ISO/IEC 17025:</b> Allgemeine Anforderungen an Prüflaboratorien</li>
+            <li><b>SOFT Guidelines:</b> Society of Forensic Toxicologists</li>
+            <li><b>GTFCh Richtlinien:</b> Gesellschaft für Toxikologische und Forensische Chemie</li>
+            <li><b>EWDTS Standards:</b> European Workplace Drug Testing Society</li>
+        </ul>
+
+        <p><b>🚨 Disclaimer:</b> Diese Berechnungen dienen ausschließlich wissenschaftlich-informativen Zwecken.
+        Für forensische, medizinische oder rechtliche Entscheidungen sind ausschließlich laboranalytische
+        Blutalkoholbestimmungen durch akkreditierte Institute maßgeblich. Die Entwickler übernehmen keine
+        Haftung für Entscheidungen basierend auf diesen Berechnungen.</p>
+
+        <hr>
+        <p style="font-size: 10px; color: #666;">
+        <b>Software-Version:</b> BAK-Kalkulator v2.0 |
+        <b>Algorithmus-Basis:</b> Internationale forensische Standards |
+        <b>Letzte Validierung:</b> 2024 |
+        <b>Entwickelt nach:</b> Good Laboratory Practice (GLP)
+        </p>
+        """
+
+@lru_cache(maxsize=None)
+def _model_fragments(model: str) -> Dict[str, str]:
+    """Statische HTML-Fragmente eines Modells (einmalig vorgerendert)"""
+    info = MODEL_INFO.get(model, MODEL_INFO['Widmark'])
+    references = ''.join(f"<li>{ref}</li>" for ref in info['referenzen'])
+    return {
+        'intro': MODEL_INTRO_TEMPLATE.format(model=model, beschreibung=info['beschreibung'],
+                                             formel=info['formel'], parameter=info['parameter']),
+        'references': f"""
+            <h4>📚 Wissenschaftliche Referenzen</h4>
+            <ol style="font-size: 11px;">
+            {references}</ol>""",
+    }
+
+# Parameterzeilen mit leerem Wert-Platzhalter (Einheit und Grundlage fest)
+_PARAMETER_ROWS = tuple(PARAMETER_ROW_TEMPLATE.format(param=param, unit=unit, basis=basis)
+                        for param, unit, basis in PARAMETER_ROWS)
+
+def _model_section(model: str, result: Dict) -> List[str]:
+    """Setzt die Zahlenblöcke eines Modells zwischen die statischen Fragmente"""
+    fragments = _model_fragments(model)
+    values = (
+        f"{result.get('alcohol_grams', 0):.2f}",
+        f"{result.get('person_weight', 0)}",
+        f"{result.get('r_factor', 0):.3f}",
+        f"{result.get('body_fat_factor', 1.0):.3f}",
+        f"{result.get('elimination_rate', 0.15):.3f}",
+    )
+    parts = [fragments['intro']]
+    parts.extend(row.format(value) for row, value in zip(_PARAMETER_ROWS, values))
+    parts.append("</table>")
+
+    # Detaillierte Berechnung mit Formeln
+    calculation_details = result.get('calculation_details', {})
+    if calculation_details:
+        parts.append("""
+                <h4>🧮 Berechnungsschritte</h4>
+                <ol>
+                """)
+        for titel, key, formel, erklärung in CALCULATION_STEPS:
+            if key:
+                formel = calculation_details.get(key, '')
+            parts.append(CALCULATION_STEP_TEMPLATE.format(titel=titel, formel=formel, erklärung=erklärung))
+        parts.append("</ol>")
+
+    # Einzelgetränk-Details: Tabelle unterhalb (virtualisiert)
+    drink_count = len(result.get('drink_contributions') or [])
+    if drink_count:
+        parts.append(DRINK_ANALYSIS_TEMPLATE.format(drink_count=drink_count))
+
+    # Ergebnisse mit Konfidenzintervallen
+    parts.append(RESULTS_TEMPLATE.format(peak_bac=result.get('peak_bac', 0),
+                                         current_bac=result.get('current_bac', 0),
+                                         peak_time=result.get('peak_time', '--'),
+                                         elimination_time=result.get('elimination_time', '--')))
+    if result.get('time_to_03'):
+        parts.append(f"<li><b>Fahrtüchtig ab:</b> {result.get('time_to_03').strftime('%H:%M')} Uhr (BAK < 0.5‰)</li>")
+    if result.get('time_to_00'):
+        parts.append(f"<li><b>Nüchtern ab:</b> {result.get('time_to_00').strftime('%H:%M')} Uhr (BAK ≈ 0.0‰)</li>")
+    parts.append("""
+            </ul>
+            </div>
+            """)
+
+    # Wissenschaftliche Referenzen für dieses Modell
+    parts.append(fragments['references'])
+    return parts
+
+def render_detail_html(results: Dict) -> str:
+    """Erstellt das HTML der ausführlichen Berechnung"""
+    parts = [DETAIL_HEADER]
+    for model, result in results.items():
+        parts.extend(_model_section(model, result))
+    parts.append(DETAIL_FOOTER)
+    return ''.join(parts)
+
+VALIDATION_HEADER_TEMPLATE = """
+        <h2>🔬 Forensische BAK-Validierung</h2>
+        <p><i>Wissenschaftliche Überprüfung der Konsumangaben gegen gemessene Blutalkoholkonzentration</i></p>
+
+        <h3>📋 Eingabedaten</h3>
+        <div style="background-color: #f0f0f0; padding: 10px; border-radius: 5px;">
+        <b>Messzeitpunkt:</b> {measurement} Uhr<br>
+        <b>Gemessene BAK:</b> {measured_bac:.3f} ‰<br>
+        <b>Analysemethode:</b> {method}<br>
+        <b>Analytische Unsicherheit:</b> ±{uncertainty:.3f} ‰
+        </div>
+
+        <h3>📊 Modell-Vergleich</h3>
+        <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; font-size: 11px;">
+        <tr style="background-color: #e3f2fd;">
+            <th>Modell</th>
+            <th>Vorhergesagt</th>
+            <th>Gemessen</th>
+            <th>Abweichung</th>
+            <th>95% KI</th>
+            <th>99% KI</th>
+            <th>Bewertung</th>
+        </tr>
+        """
+
+# Zeilenfarbe je Konsistenzbewertung
+ASSESSMENT_COLORS = {
+    'consistent': '#e8f5e8',
+    'borderline': '#fff3cd',
+}
+INCONSISTENT_COLOR = '#f8d7da'
+
+VALIDATION_ROW_TEMPLATE = """
+            <tr style="background-color: {row_color};">
+                <td><b>{model_name}</b></td>
+                <td>{predicted_bac:.3f} ‰</td>
+                <td>{measured_bac:.3f} ‰</td>
+                <td>{deviation_abs:.3f} ‰<br>({deviation_rel:.1f}%)</td>
+                <td>{ci_95_lower:.3f} - {ci_95_upper:.3f} ‰</td>
+                <td>{ci_99_lower:.3f} - {ci_99_upper:.3f} ‰</td>
+                <td><b>{consistency}</b></td>
+            </tr>
+            """
+
+VALIDATION_SUMMARY_TEMPLATE = """
+        <h3>⚖️ Forensische Gesamtbewertung</h3>
+        <div style="background-color: {color}; padding: 15px; border-radius: 8px; border-left: 5px solid #007bff;">
+        <h4>{icon} {conclusion}</h4>
+
+        <b>Statistische Übersicht:</b><br>
+        • Konsistente Modelle: {consistent}/{total} ({consistent_pct:.0f}%)<br>
+        • Grenzwertige Modelle: {borderline}/{total} ({borderline_pct:.0f}%)<br>
+        • Inkonsistente Modelle: {inconsistent}/{total} ({inconsistent_pct:.0f}%)
+        </div>
+
+        <h3>🧮 Wissenschaftliche Bewertungskriterien</h3>
+        <h4>📏 Konfidenzintervalle (KI)</h4>
+        <ul>
+            <li><b>99% KI:</b> Sehr hohe statistische Sicherheit - bei Übereinstimmung sind Angaben plausibel</li>
+            <li><b>95% KI:</b> Hohe statistische Sicherheit - Grenzbereich für forensische Bewertung</li>
+            <li><b>Außerhalb 95% KI:</b> Statistisch signifikante Abweichung - Angaben fraglich</li>
+        </ul>
+
+        <h4>🔬 Unsicherheitsquellen</h4>
+        <ul>
+            <li><b>Analytische Unsicherheit:</b> Messgenauigkeit der BAK-Bestimmung</li>
+            <li><b>Modell-Unsicherheit:</b> Inter-individuelle pharmakodynamische Variabilität</li>
+            <li><b>Biologische Faktoren:</b> Resorption, Elimination, Genetik</li>
+            <li><b>Temporale Faktoren:</b> Zeitliche Interpolation zwischen Datenpunkten</li>
+        </ul>
+
+        <h4>⚖️ Forensische Interpretation</h4>
+        <div style="background-color: #f9f9f9; padding: 10px; border-left: 3px solid #2196F3;">
+        """
+
+# Farbe, Symbol und Interpretation je Gesamtergebnis
+VALIDATION_CONCLUSIONS = {
+    'plausible': ("#d4edda", "✅", """
+            <b>Konsistente Ergebnisse:</b> Die gemessene BAK stimmt mit den angegebenen Konsummengen
+            innerhalb der statistischen Unsicherheit überein. Die Angaben sind <b>plausibel</b> und
+            wissenschaftlich nachvollziehbar.
+            """),
+    'false': ("#f8d7da", "❌", """
+            <b>Inkonsistente Ergebnisse:</b> Die gemessene BAK weicht signifikant von den berechneten
+            Werten ab. Die Konsumangaben sind mit hoher Wahrscheinlichkeit <b>unvollständig oder falsch</b>.
+            Mögliche Ursachen: Nicht angegebener Alkoholkonsum, falsche Mengenangaben, oder unbekannte Getränke.
+            """),
+    'borderline': ("#fff3cd", "⚠️", """
+            <b>Grenzwertige Ergebnisse:</b> Die Übereinstimmung liegt im Grenzbereich der statistischen
+            Unsicherheit. Eine eindeutige Bewertung ist <b>nicht möglich</b>. Weitere Ermittlungen oder
+            zusätzliche Messungen könnten erforderlich sein.
+            """),
+}
+
+VALIDATION_FOOTER = """
+        </div>
+
+        <h3>📚 Wissenschaftliche Grundlagen</h3>
+        <h4>🔬 Pharmakodynamische Modellierung</h4>
+        <p>Die Validierung basiert auf etablierten pharmakokinetischen Modellen mit bekannten
+        Unsicherheitsbereichen aus der forensischen Literatur:</p>
+
+        <ul>
+            <li><b>Widmark-Modell:</b> ±25% inter-individuelle Variabilität (Jones & Neri, 1991)</li>
+            <li><b>Watson-Modell:</b> ±20% durch TBW-Korrektur (Norberg et al., 2003)</li>
+            <li><b>Forrest-Modell:</b> ±23% mit Alterskorrektur (Kalant, 1996)</li>
+            <li><b>Seidl-Modell:</b> ±18% moderne Multi-Parameter-Regression (Seidl et al., 2000)</li>
+        </ul>
+
+        <h4>⚗️ Analytische Qualitätssicherung</h4>
+        <p>Berücksichtigung der methodenspezifischen Messunsicherheit nach ISO/IEC 17025:</p>
+        <ul>
+            <li><b>GC-FID:</b> ±0.002‰ (Goldstandard)</li>
+            <li><b>Enzymatisch:</b> ±0.005‰ (Klinische Routine)</li>
+            <li><b>Headspace-GC:</b> ±0.003‰ (Forensische Anwendung)</li>
+        </ul>
+
+        <h3>⚠️ Rechtliche Hinweise</h3>
+        <div style="background-color: #fff3cd; padding: 10px; border: 1px solid #ffeaa7; border-radius: 5px;">
+        <b>🚨 Disclaimer:</b> Diese wissenschaftliche Analyse dient ausschließlich informativen Zwecken.
+        Für rechtliche oder forensische Entscheidungen sind ausschließlich gerichtlich bestellte
+        Sachverständige und akkreditierte Laboratorien zuständig. Die Bewertung erfolgt nach bestem
+        wissenschaftlichen Wissen, ersetzt aber keine forensische Begutachtung.
+        </div>
+
+        <hr>
+        <p style="font-size: 10px; color: #666;">
+        <b>Software:</b> BAK-Kalkulator v2.0 - Forensisches Validierungsmodul |
+        <b>Algorithmus:</b> Multi-Model Confidence Interval Analysis |
+        <b>Standards:</b> ISO/IEC 17025, SOFT Guidelines, GTFCh Richtlinien
+        </p>
+        """
+
+def _conclusion_kind(conclusion: str) -> str:
+    """Ordnet die Gesamtaussage einer Interpretation zu"""
+    if "plausibel" in conclusion:
+        return 'plausible'
+    if "falsch" in conclusion:
+        return 'false'
+    return 'borderline'
+
+def render_validation_html(result: Dict) -> str:
+    """Erstellt das HTML des Validierungsergebnisses"""
+    parts = [VALIDATION_HEADER_TEMPLATE.format(
+        measurement=result['measurement_datetime'].strftime('%d.%m.%Y um %H:%M'),
+        measured_bac=result['measured_bac'],
+        method=result['method'],
+        uncertainty=result['analytical_uncertainty'])]
+
+    for model_name, model_result in result['model_results'].items():
+        row_color = ASSESSMENT_COLORS.get(model_result['assessment'], INCONSISTENT_COLOR)
+        parts.append(VALIDATION_ROW_TEMPLATE.format(row_color=row_color, model_name=model_name, **model_result))
+    parts.append("</table>")
+
+    # Gesamtbewertung
+    assessment = result['overall_assessment']
+    total = result['total_models']
+    color, icon, interpretation = VALIDATION_CONCLUSIONS[_conclusion_kind(result['overall_conclusion'])]
+    parts.append(VALIDATION_SUMMARY_TEMPLATE.format(
+        color=color, icon=icon, conclusion=result['overall_conclusion'], total=total,
+        consistent=assessment['consistent'], consistent_pct=assessment['consistent'] / total * 100,
+        borderline=assessment['borderline'], borderline_pct=assessment['borderline'] / total * 100,
+        inconsistent=assessment['inconsistent'], inconsistent_pct=assessment['inconsistent'] / total * 100))
+    parts.append(interpretation)
+    parts.append(VALIDATION_FOOTER)
+    return ''.join(parts)
@@ -0,0 +1,193 @@
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+
+from utils.drink_store import coerce_float, coerce_time
+
+# Sitzungsdateien (.baks): ZIP-Container mit komprimierten Einträgen.
+# session.json enthält Format-Version, Personendaten, Einstellungen, die
+# Getränke spaltenweise und die skalaren Ergebnisfelder je Modell. Die
+# Ergebnis-Arrays (BAK-Verlauf, Einzelgetränk-Beiträge) liegen als .npy in
+# eigenen Einträgen und werden erst bei load_results() gelesen, sodass die
+# Eingaben einer großen Sitzung sofort angezeigt werden können.
+
+SESSION_EXTENSION = '.baks'
+
+# Format-Version der Sitzungsdateien (ältere Versionen bleiben lesbar)
+FORMAT_VERSION = 1
+
+MANIFEST_NAME = 'session.json'
+
+# Ergebnisfelder, die als Arrays statt in session.json gespeichert werden
+ARRAY_FIELDS = ('bac_values', 'drink_contributions')
+
+# Spalten der Einzelgetränk-Beiträge und ihre Array-Typen
+CONTRIBUTION_COLUMNS = (
+    ('drink_index', 'int64'),
+    ('alcohol_grams', 'float64'),
+    ('consumption_time', 'datetime64[us]'),
+    ('peak_bac', 'float64'),
+    ('peak_time', 'datetime64[us]'),
+    ('resorption_hours', 'float64'),
+)
+
+# Markierung für Zeitpunkte in den skalaren Ergebnisfeldern
+DATETIME_TAG = '$datetime'
+
+def _encode_value(value):
+    """Macht skalare Ergebnisfelder JSON-fähig (datetime als markierter ISO-Text)"""
+    if isinstance(value, datetime):
+        return {DATETIME_TAG: value.isoformat()}
+    if isinstance(value, dict):
+        return {key: _encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if len(value) == 1 and DATETIME_TAG in value:
+            return datetime.fromisoformat(value[DATETIME_TAG])
+        return {key: _decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+def _drink_columns(drinks_data: List[Dict]) -> Dict[str, List]:
+    """Getränke spaltenweise (kompakter als eine Liste von Objekten)"""
+    return {
+        'name': [str(d.get('name', '')) for d in drinks_data],
+        'volume': [coerce_float(d.get('volume', 0)) for d in drinks_data],
+        'alcohol_content': [coerce_float(d.get('alcohol_content', 0)) for d in drinks_data],
+        'time': [coerce_time(d.get('time')).isoformat() for d in drinks_data],
+    }
+
+def _drink_rows(columns: Dict[str, List]) -> List[Dict]:
+    return [
+        {'name': name, 'volume': volume, 'alcohol_content': content, 'time': datetime.fromisoformat(time)}
+        for name, volume, content, time in zip(columns['name'], columns['volume'],
+                                               columns['alcohol_content'], columns['time'])
+    ]
+
+def _result_arrays(result: Dict) -> Dict[str, np.ndarray]:
+    """Verlauf und Einzelgetränk-Beiträge eines Modells als typisierte Arrays"""
+    bac_values = result.get('bac_values') or []
+    arrays = {
+        'bac_times': np.array([t for t, _ in bac_values], dtype='datetime64[us]'),
+        'bac_values': np.array([v for _, v in bac_values], dtype=np.float64),
+    }
+    contributions = result.get('drink_contributions') or []
+    for column, dtype in CONTRIBUTION_COLUMNS:
+        arrays[f'contrib_{column}'] = np.array([c[column] for c in contributions], dtype=dtype)
+    return arrays
+
+def _array_bytes(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+def write_session(file_path: str, person_data: Dict, drinks_data: List[Dict], settings_data: Dict,
+                  results: Optional[Dict] = None, cache_key: Optional[str] = None,
+                  session_id: Optional[str] = None, journal_seq: int = 0):
+    """Schreibt eine Sitzung (Ergebnisse optional, nur zusammen mit ihrem Cache-Schlüssel)
+
+    Die Datei wird zuerst unter einem temporären Namen geschrieben und dann
+    ersetzt, sodass ein Abbruch nie eine halbe Sitzungsdatei hinterlässt.
+    session_id und journal_seq verknüpfen die Datei mit ihrem Änderungsjournal
+    (siehe utils.session_journal).
+    """
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': datetime.now().isoformat(),
+        'person_data': person_data or {},
+        'settings_data': settings_data or {},
+        'drinks': _drink_columns(drinks_data or []),
+        'results': None,
+    }
+    if session_id:
+        manifest['journal'] = {'session_id': session_id, 'seq': journal_seq}
+    arrays = {}
+    if results and cache_key:
+        models = []
+        for index, (model, result) in enumerate(results.items()):
+            fields = {key: _encode_value(value) for key, value in result.items() if key not in ARRAY_FIELDS}
+            models.append({'name': model, 'fields': fields})
+            for name, array in _result_arrays(result).items():
+                arrays[f'results/{index}/{name}.npy'] = array
+        manifest['results'] = {'cache_key': cache_key, 'models': models}
+
+    temp_path = file_path + '.tmp'
+    try:
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')))
+            for name, array in arrays.items():
+                archive.writestr(name, _array_bytes(array))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class SessionFile:
+    """Geöffnete Sitzungsdatei: Eingaben sofort, Ergebnis-Arrays bei Bedarf"""
+
+    def __init__(self, file_path: str, manifest: Dict):
+        self.file_path = file_path
+        self.format_version = manifest['format_version']
+        self.person_data: Dict = manifest.get('person_data') or {}
+        self.settings_data: Dict = manifest.get('settings_data') or {}
+        self.drinks_data: List[Dict] = _drink_rows(manifest['drinks'])
+        saved_results = manifest.get('results') or {}
+        self.cache_key: Optional[str] = saved_results.get('cache_key')
+        self._models: List[Dict] = saved_results.get('models') or []
+        # Dateien ohne Journal-Angaben werden über ihren Zeitstempel zugeordnet
+        journal = manifest.get('journal') or {}
+        self.session_id: str = journal.get('session_id') or str(manifest.get('created', ''))
+        self.journal_seq: int = journal.get('seq', 0)
+
+    @property
+    def has_results(self) -> bool:
+        return bool(self.cache_key and self._models)
+
+    def load_results(self) -> Optional[Dict]:
+        """Liest die gespeicherten Ergebnisse (None, falls keine vorhanden)"""
+        if not self.has_results:
+            return None
+        results = {}
+        with zipfile.ZipFile(self.file_path) as archive:
+            def load(index: int, name: str) -> np.ndarray:
+                with archive.open(f'results/{index}/{name}.npy') as f:
+                    return np.load(io.BytesIO(f.read()), allow_pickle=False)
+
+            for index, model in enumerate(self._models):
+                result = {key: _decode_value(value) for key, value in model['fields'].items()}
+                result['bac_values'] = list(zip(load(index, 'bac_times').tolist(),
+                                                load(index, 'bac_values').tolist()))
+                columns = {column: load(index, f'contrib_{column}').tolist()
+                           for column, _ in CONTRIBUTION_COLUMNS}
+                result['drink_contributions'] = [
+                    dict(zip(columns, values)) for values in zip(*columns.values())
+                ]
+                results[model['name']] = result
+        return results
+
+def read_session(file_path: str) -> SessionFile:
+    """Öffnet eine Sitzungsdatei und liest nur die Eingaben"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME).decode('utf-8'))
+    except (zipfile.BadZipFile, KeyError, json.JSONDecodeError) as e:
+        raise ValueError(f"Keine gültige Sitzungsdatei: {e}")
+    version = manifest.get('format_version') if isinstance(manifest, dict) else None
+    if not isinstance(version, int) or 'drinks' not in manifest:
+        raise ValueError("Keine gültige Sitzungsdatei (Format-Version oder Getränke fehlen)")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Sitzungsdatei hat Format-Version {version}, unterstützt wird bis {FORMAT_VERSION}. "
+                         "Bitte aktualisieren Sie den BAK-Kalkulator.")
+    return SessionFile(file_path, manifest)
@@ -0,0 +1,252 @@
+import time
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from itertools import accumulate, chain
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from models import ChangeKind, DrinkChange, PersonChange, SettingsChange
+
+# Rückgängig/Wiederholen über unveränderliche Sitzungs-Snapshots. Die
+# Getränkeliste ist ein persistenter Vektor aus Blöcken: Eine Änderung kopiert
+# nur den betroffenen Block und die Blockliste, alle übrigen Blöcke (und die
+# Getränke-Dictionaries darin) werden zwischen den Snapshots geteilt.
+
+class PersistentList(Sequence):
+    """Unveränderliche Liste mit strukturell geteilten Blöcken"""
+
+    CHUNK_SIZE = 32
+
+    __slots__ = ('_chunks', '_starts', '_length')
+
+    def __init__(self, items: Iterable = (), _chunks: Optional[Tuple[tuple, ...]] = None):
+        if _chunks is None:
+            items = tuple(items)
+            size = self.CHUNK_SIZE
+            _chunks = tuple(items[i:i + size] for i in range(0, len(items), size))
+        self._chunks = _chunks
+        self._starts: Optional[List[int]] = None
+        self._length = sum(len(chunk) for chunk in _chunks)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._chunks)
+
+    def __repr__(self) -> str:
+        return f"PersistentList({list(self)!r})"
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Blocknummer und Position innerhalb des Blocks"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PersistentList index out of range")
+        if self._starts is None:
+            self._starts = [0, *accumulate(len(chunk) for chunk in self._chunks)][:-1]
+        chunk_index = bisect_right(self._starts, index) - 1
+        return chunk_index, index - self._starts[chunk_index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        chunk_index, position = self._locate(index)
+        return self._chunks[chunk_index][position]
+
+    def _with_chunks(self, chunk_index: int, new_chunks: Tuple[tuple, ...]) -> 'PersistentList':
+        """Neue Liste, in der ein Block durch new_chunks ersetzt ist"""
+        chunks = self._chunks[:chunk_index] + tuple(c for c in new_chunks if c) + self._chunks[chunk_index + 1:]
+        return PersistentList(_chunks=chunks)
+
+    def set(self, index: int, value: Any) -> 'PersistentList':
+        """Neue Liste mit ersetztem Element"""
+        chunk_index, position = self._locate(index)
+        chunk = self._chunks[chunk_index]
+        return self._with_chunks(chunk_index, (chunk[:position] + (value,) + chunk[position + 1:],))
+
+    def insert(self, index: int, value: Any) -> 'PersistentList':
+        """Neue Liste mit eingefügtem Element (volle Blöcke werden geteilt)"""
+        if index < 0:
+            index = max(index + self._length, 0)
+        if index >= self._length:
+            return self.extend((value,))
+        chunk_index, position = self._locate(index)
+        chunk = self._chunks[chunk_index]
+        chunk = chunk[:position] + (value,) + chunk[position:]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            middle = len(chunk) // 2
+            return self._with_chunks(chunk_index, (chunk[:middle], chunk[middle:]))
+        return self._with_chunks(chunk_index, (chunk,))
+
+    def append(self, value: Any) -> 'PersistentList':
+        """Neue Liste mit angehängtem Element"""
+        return self.extend((value,))
+
+    def extend(self, values: Iterable) -> 'PersistentList':
+        """Neue Liste mit angehängten Elementen (nur der letzte Block wird kopiert)"""
+        values = tuple(values)
+        if not values:
+            return self
+        size = self.CHUNK_SIZE
+        chunks = self._chunks
+        if chunks and len(chunks[-1]) < size:
+            fill = size - len(chunks[-1])
+            chunks = chunks[:-1] + (chunks[-1] + values[:fill],)
+            values = values[fill:]
+        chunks += tuple(values[i:i + size] for i in range(0, len(values), size))
+        return PersistentList(_chunks=chunks)
+
+    def delete(self, index: int) -> 'PersistentList':
+        """Neue Liste ohne das Element"""
+        chunk_index, position = self._locate(index)
+        chunk = self._chunks[chunk_index]
+        return self._with_chunks(chunk_index, (chunk[:position] + chunk[position + 1:],))
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """Unveränderlicher Stand einer Sitzung
+
+    person und settings werden nie verändert, sondern bei Änderungen durch
+    eine Kopie mit dem neuen Feld ersetzt. results verweist auf das
+    (gecachte) Berechnungsergebnis dieses Stands.
+    """
+    person: Dict
+    settings: Dict
+    drinks: PersistentList = field(default_factory=PersistentList)
+    label: str = ""
+    results: Optional[Dict] = None
+    result_key: Optional[str] = None
+
+    def with_person_change(self, change: PersonChange) -> 'SessionSnapshot':
+        return replace(self, person={**self.person, change.field: change.value},
+                       label="Personendaten geändert", results=None, result_key=None)
+
+    def with_settings_change(self, change: SettingsChange) -> 'SessionSnapshot':
+        return replace(self, settings={**self.settings, change.field: change.value},
+                       label="Einstellungen geändert", results=None, result_key=None)
+
+    def with_drink_change(self, change: DrinkChange) -> 'SessionSnapshot':
+        drinks = self.drinks
+        if change.kind == ChangeKind.RESET:
+            drinks = PersistentList(change.drinks)
+            label = "Getränke ersetzt" if change.drinks else "Alle Getränke gelöscht"
+        elif change.kind == ChangeKind.REMOVED:
+            for row in sorted(change.rows, reverse=True):
+                drinks = drinks.delete(row)
+            label = "Getränk entfernt"
+        elif change.kind == ChangeKind.ADDED:
+            rows = list(change.rows)
+            if rows == list(range(len(drinks), len(drinks) + len(rows))):
+                drinks = drinks.extend(change.drinks)
+            else:
+                for row, drink in zip(rows, change.drinks):
+                    drinks = drinks.insert(row, drink)
+            label = "Getränk hinzugefügt" if len(rows) == 1 else f"{len(rows)} Getränke hinzugefügt"
+        else:
+            for row, drink in zip(change.rows, change.drinks):
+                drinks = drinks.set(row, drink)
+            label = "Getränk bearbeitet"
+        return replace(self, drinks=drinks, label=label, results=None, result_key=None)
+
+class SessionHistory:
+    """Rückgängig/Wiederholen-Verlauf über SessionSnapshots
+
+    Aufeinanderfolgende Änderungen mit gleichem merge_key (z.B. Tippen in
+    einem Eingabefeld) werden innerhalb von merge_interval Sekunden zu einem
+    Schritt zusammengefasst.
+    """
+
+    def __init__(self, initial: SessionSnapshot, limit: int = 100, merge_interval: float = 1.0):
+        self.limit = limit
+        self.merge_interval = merge_interval
+        self._current = initial
+        self._undo: deque = deque(maxlen=limit)  # Älteste Schritte fallen heraus (FIFO)
+        self._redo: List[SessionSnapshot] = []
+        self._last_merge_key: Optional[Hashable] = None
+        self._last_record_time = 0.0
+        self._group_depth = 0
+        self._group_label = ""
+        self._group_started = False
+
+    @property
+    def current(self) -> SessionSnapshot:
+        return self._current
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo_label(self) -> str:
+        return self._current.label if self._undo else ""
+
+    def redo_label(self) -> str:
+        return self._redo[-1].label if self._redo else ""
+
+    def reset(self, snapshot: SessionSnapshot):
+        """Setzt den Verlauf auf einen neuen Ausgangsstand zurück"""
+        self._current = snapshot
+        self._undo.clear()
+        self._redo.clear()
+        self._last_merge_key = None
+
+    def record(self, snapshot: SessionSnapshot, merge_key: Optional[Hashable] = None):
+        """Übernimmt einen neuen Stand als Rückgängig-Schritt"""
+        now = time.monotonic()
+        if self._group_depth:
+            if self._group_started:
+                self._current = replace(snapshot, label=self._group_label)
+                return
+            self._group_started = True
+            snapshot = replace(snapshot, label=self._group_label)
+            merge_key = None
+        elif (merge_key is not None and merge_key == self._last_merge_key and self._undo
+              and now - self._last_record_time < self.merge_interval):
+            self._current = snapshot
+            self._last_record_time = now
+            return
+
+        self._undo.append(self._current)
+        self._redo.clear()
+        self._current = snapshot
+        self._last_merge_key = merge_key
+        self._last_record_time = now
+
+    @contextmanager
+    def group(self, label: str):
+        """Fasst alle Änderungen im Block zu einem Schritt zusammen"""
+        if self._group_depth == 0:
+            self._group_label = label
+            self._group_started = False
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                self._last_merge_key = None
+
+    def attach_results(self, results: Dict, result_key: Optional[str] = None):
+        """Verknüpft den aktuellen Stand mit seinem Berechnungsergebnis"""
+        self._current = replace(self._current, results=results, result_key=result_key)
+
+    def undo(self) -> Optional[SessionSnapshot]:
+        """Geht einen Schritt zurück und gibt den wiederhergestellten Stand zurück"""
+        if not self._undo:
+            return None
+        self._redo.append(self._current)
+        self._current = self._undo.pop()
+        self._last_merge_key = None
+        return self._current
+
+    def redo(self) -> Optional[SessionSnapshot]:
+        """Stellt einen rückgängig gemachten Schritt wieder her"""
+        if not self._redo:
+            return None
+        self._undo.append(self._current)
+        self._current = self._redo.pop()
+        self._last_merge_key = None
+        return self._current
@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from models import ChangeKind, DrinkChange, PersonChange, SettingsChange
+from utils.session_file import write_session
+from utils.session_history import PersistentList, SessionSnapshot
+
+# Änderungsjournal einer Sitzungsdatei: Jede Änderung an Person, Getränken
+# oder Einstellungen wird als kleiner JSON-Datensatz an <sitzung>.journal
+# angehängt, das Speichern kostet so O(Änderung) statt O(Sitzung). Die
+# Sitzungsdatei merkt sich die laufende Nummer (seq) des letzten
+# eingearbeiteten Datensatzes; beim Laden werden alle späteren Datensätze
+# erneut angewendet. Beim Kompaktieren wird die Sitzungsdatei im Hintergrund
+# neu geschrieben und das Journal auf die währenddessen angefallenen
+# Datensätze gekürzt. Ein Absturz zwischen beiden Schritten ist unkritisch,
+# da bereits eingearbeitete Datensätze anhand von seq übersprungen werden.
+
+JOURNAL_SUFFIX = '.journal'
+
+# Format-Version des Journals (steht in der Kopfzeile)
+JOURNAL_VERSION = 1
+
+# Ab dieser Zahl von Datensätzen bzw. Journalgröße wird kompaktiert
+COMPACT_RECORDS = 500
+COMPACT_BYTES = 1 << 20
+
+def journal_path(session_path: str) -> str:
+    """Pfad des Journals neben der Sitzungsdatei"""
+    return session_path + JOURNAL_SUFFIX
+
+def new_session_id() -> str:
+    """Kennung, die Sitzungsdatei und Journal einander zuordnet"""
+    return uuid.uuid4().hex
+
+def _encode_drink(drink: Dict) -> Dict:
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in drink.items()}
+
+def _decode_drink(drink: Dict) -> Dict:
+    drink = dict(drink)
+    if isinstance(drink.get('time'), str):
+        drink['time'] = datetime.fromisoformat(drink['time'])
+    return drink
+
+def encode_change(change) -> Dict:
+    """Datensatz für eine Personen-, Einstellungs- oder Getränkeänderung"""
+    if isinstance(change, PersonChange):
+        return {'op': 'person', 'field': change.field, 'value': change.value}
+    if isinstance(change, SettingsChange):
+        return {'op': 'settings', 'field': change.field, 'value': change.value}
+    if isinstance(change, DrinkChange):
+        return {'op': 'drinks', 'kind': change.kind.value, 'rows': list(change.rows),
+                'fields': list(change.fields), 'drinks': [_encode_drink(d) for d in change.drinks]}
+    raise TypeError(f"Unbekannte Änderung: {change!r}")
+
+def encode_state(snapshot: SessionSnapshot) -> Dict:
+    """Datensatz, der den kompletten Stand ersetzt (z.B. nach Rückgängig)"""
+    return {'op': 'state', 'person': snapshot.person, 'settings': snapshot.settings,
+            'drinks': [_encode_drink(d) for d in snapshot.drinks]}
+
+def apply_record(snapshot: SessionSnapshot, record: Dict) -> SessionSnapshot:
+    """Wendet einen Journal-Datensatz auf einen Stand an"""
+    op = record.get('op')
+    if op == 'person':
+        return snapshot.with_person_change(PersonChange(record['field'], record['value']))
+    if op == 'settings':
+        return snapshot.with_settings_change(SettingsChange(record['field'], record['value']))
+    if op == 'drinks':
+        return snapshot.with_drink_change(DrinkChange(
+            ChangeKind(record['kind']), tuple(record['rows']), tuple(record['fields']),
+            tuple(_decode_drink(d) for d in record['drinks'])
+        ))
+    if op == 'state':
+        return SessionSnapshot(person=record['person'], settings=record['settings'],
+                               drinks=PersistentList(_decode_drink(d) for d in record['drinks']),
+                               label="Sitzung wiederhergestellt")
+    raise ValueError(f"Unbekannter Journal-Datensatz: {op!r}")
+
+def replay(snapshot: SessionSnapshot, records: Iterable[Dict]) -> SessionSnapshot:
+    """Baut den Stand aus Sitzungsdatei und Journal-Datensätzen wieder auf"""
+    for record in records:
+        snapshot = apply_record(snapshot, record)
+    return snapshot
+
+def read_journal(session_path: str, session_id: Optional[str], after_seq: int = 0) -> List[Dict]:
+    """Datensätze des Journals nach after_seq (leer, wenn es zu einer anderen Sitzung gehört)
+
+    Eine beim Absturz nur halb geschriebene letzte Zeile wird ignoriert.
+    """
+    path = journal_path(session_path)
+    if not session_id or not os.path.exists(path):
+        return []
+    records = []
+    with open(path, 'rb') as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return []
+        if (not isinstance(header, dict) or header.get('session_id') != session_id
+                or header.get('journal_version', 0) > JOURNAL_VERSION):
+            return []
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if record.get('seq', 0) > after_seq:
+                records.append(record)
+    return records
+
+class SessionJournal:
+    """Anhängendes Journal einer geöffneten Sitzungsdatei
+
+    Die Sitzungsdatei muss beim Öffnen den Stand bis einschließlich seq
+    enthalten; ein vorhandenes Journal wird dabei ersetzt. Datensätze werden
+    nach jedem Anhängen geleert (flush), sodass sie einen Absturz der
+    Anwendung überstehen.
+    """
+
+    def __init__(self, session_path: str, session_id: str, seq: int = 0):
+        self.session_path = session_path
+        self.path = journal_path(session_path)
+        self.session_id = session_id
+        self.seq = seq
+        self._lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+        self._records = 0
+        self._write_journal(b'')
+        self._file = open(self.path, 'ab')
+
+    def _write_journal(self, tail: bytes):
+        """Ersetzt das Journal durch Kopfzeile + tail (atomar)"""
+        header = json.dumps({'journal_version': JOURNAL_VERSION, 'session_id': self.session_id})
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header.encode('utf-8') + b'\n' + tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _append(self, record: Dict):
+        with self._lock:
+            self.seq += 1
+            record['seq'] = self.seq
+            self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+            self._file.flush()
+            self._records += 1
+
+    def append_change(self, change):
+        """Hängt eine Personen-, Einstellungs- oder Getränkeänderung an"""
+        self._append(encode_change(change))
+
+    def append_state(self, snapshot: SessionSnapshot):
+        """Hängt einen kompletten Stand an (Rückgängig/Wiederholen)"""
+        self._append(encode_state(snapshot))
+
+    def needs_compaction(self) -> bool:
+        with self._lock:
+            return self._records >= COMPACT_RECORDS or self._file.tell() >= COMPACT_BYTES
+
+    def is_compacting(self) -> bool:
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _compact(self, snapshot: SessionSnapshot, seq: int, offset: int):
+        """Schreibt den Stand bis seq in die Sitzungsdatei und kürzt das Journal"""
+        write_session(self.session_path, snapshot.person, list(snapshot.drinks), snapshot.settings,
+                      snapshot.results, snapshot.result_key, self.session_id, seq)
+        with self._lock:
+            # Nur die Datensätze behalten, die während des Schreibens hinzukamen
+            self._file.close()
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            try:
+                self._write_journal(tail)
+            finally:
+                self._file = open(self.path, 'ab')
+            self._records = tail.count(b'\n')
+
+    def _begin(self):
+        """Erfasst seq und Journalposition des zu kompaktierenden Stands"""
+        with self._lock:
+            return self.seq, self._file.tell()
+
+    def compact(self, snapshot: SessionSnapshot):
+        """Kompaktiert sofort (snapshot ist der Stand nach dem letzten Datensatz)"""
+        self.wait()
+        self._compact(snapshot, *self._begin())
+
+    def compact_async(self, snapshot: SessionSnapshot) -> bool:
+        """Kompaktiert im Hintergrund; False, wenn bereits kompaktiert wird
+
+        snapshot ist unveränderlich und kann daher ohne Kopie im Thread
+        geschrieben werden, während weitere Datensätze angehängt werden.
+        """
+        if self.is_compacting():
+            return False
+        seq, offset = self._begin()
+
+        def run():
+            try:
+                self._compact(snapshot, seq, offset)
+            except Exception as e:
+                print(f"Fehler beim Kompaktieren des Sitzungsjournals: {e}")
+
+        self._compaction = threading.Thread(target=run, name='SessionJournalCompaction', daemon=True)
+        self._compaction.start()
+        return True
+
+    def wait(self):
+        """Wartet auf eine laufende Hintergrund-Kompaktierung"""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def has_pending_records(self) -> bool:
+        with self._lock:
+            return self._records > 0
+
+    def close(self, snapshot: Optional[SessionSnapshot] = None):
+        """Schließt das Journal (mit snapshot: offene Datensätze vorher einarbeiten)"""
+        self.wait()
+        if snapshot is not None and self.has_pending_records():
+            self.compact(snapshot)
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from bak_core.curve import contribution_arrays, single_drink_bac
+
+# Zeitreihen-Export: Die BAK-Kurven aller Modelle werden abschnittsweise in
+# voller Auflösung neu ausgewertet (dieselbe Kinetik wie das Diagramm) und
+# als Zeilenblöcke erzeugt. Es liegt immer nur ein Block im Speicher, sodass
+# auch mehrtägige Exporte im Sekundenraster konstanten Speicher benötigen.
+
+# Standardauflösung (Sekunden zwischen zwei Zeilen)
+DEFAULT_RESOLUTION_SECONDS = 60
+
+# Zeilen pro Block (ein Block wird am Stück berechnet, geschrieben und geleert)
+DEFAULT_CHUNK_ROWS = 10000
+
+# Schreibpuffer der Ausgabedatei (Bytes)
+WRITE_BUFFER_SIZE = 1 << 20
+
+def timeseries_range(results: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Zeitraum vom ersten Getränk bis zum vollständigen Abbau in allen Modellen"""
+    start, end = None, None
+    for result in results.values():
+        elimination_rate = result.get('elimination_rate') or 0.0
+        for contrib in result.get('drink_contributions', []):
+            consumption = contrib['consumption_time']
+            sober = contrib['peak_time']
+            if elimination_rate > 0:
+                sober += timedelta(hours=contrib['peak_bac'] / elimination_rate)
+            start = consumption if start is None else min(start, consumption)
+            end = sober if end is None else max(end, sober)
+    return start, end
+
+def timeseries_row_count(results: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                         start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+    """Anzahl der Zeilen, die iter_timeseries_chunks erzeugt"""
+    default_start, default_end = timeseries_range(results)
+    start = start or default_start
+    end = end or default_end
+    if start is None or end is None or end < start:
+        return 0
+    return int((end - start).total_seconds() // max(float(resolution_seconds), 0.001)) + 1
+
+def timeseries_header(results: Dict, include_contributions: bool = False) -> List[str]:
+    """Spaltenüberschriften: Zeit, je Modell eine Spalte, optional je Getränk"""
+    header = ['Zeit'] + [f"{model} (‰)" for model in results]
+    if include_contributions:
+        for model, result in results.items():
+            header.extend(f"{model} Getränk {contrib['drink_index'] + 1} (‰)"
+                          for contrib in result.get('drink_contributions', []))
+    return header
+
+def iter_timeseries_chunks(results: Dict, resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                           include_contributions: bool = False, start: Optional[datetime] = None,
+                           end: Optional[datetime] = None,
+                           chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Erzeugt die Zeitreihe blockweise als (datetime64-Zeiten, Werte-Matrix)
+
+    Die Matrix hat eine Zeile je Zeitpunkt und die Spalten aus
+    timeseries_header (ohne die Zeitspalte).
+    """
+    default_start, default_end = timeseries_range(results)
+    start = start or default_start
+    end = end or default_end
+    total_rows = timeseries_row_count(results, resolution_seconds, start, end)
+    if not total_rows:
+        return
+
+    resolution_seconds = max(float(resolution_seconds), 0.001)
+    chunk_rows = max(int(chunk_rows), 1)
+
+    # Getränkedaten je Modell einmalig als Spalten-Arrays (Stunden ab start)
+    models = []
+    for result in results.values():
+        contributions = result.get('drink_contributions', [])
+        arrays = contribution_arrays(contributions, start) if contributions else None
+        models.append((arrays, result.get('elimination_rate') or 0.0))
+
+    origin = np.datetime64(start, 'ms')
+    for first_row in range(0, total_rows, chunk_rows):
+        rows = np.arange(first_row, min(first_row + chunk_rows, total_rows))
+        offsets = rows * resolution_seconds
+        t = offsets / 3600.0
+        times = origin + np.round(offsets * 1000).astype('timedelta64[ms]')
+
+        totals, details = [], []
+        for arrays, elimination_rate in models:
+            if arrays is None:
+                totals.append(np.zeros(len(rows)))
+                continue
+            # Matrix Getränke × Zeitpunkte, nur für diesen Block
+            contribution = single_drink_bac(
+                t[np.newaxis, :],
+                arrays['consumption'][:, np.newaxis],
+                arrays['peak'][:, np.newaxis],
+                arrays['peak_bac'][:, np.newaxis],
+                arrays['resorption'][:, np.newaxis],
+                elimination_rate
+            )
+            totals.append(contribution.sum(axis=0))
+            if include_contributions:
+                details.append(contribution)
+
+        columns = np.vstack(totals + details) if totals else np.zeros((0, len(rows)))
+        yield times, columns.T
+
+def write_timeseries_csv(file_path: str, results: Dict,
+                         resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+                         include_contributions: bool = False, start: Optional[datetime] = None,
+                         end: Optional[datetime] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         progress: Optional[Callable[[float], None]] = None) -> int:
+    """Schreibt die Zeitreihe blockweise als CSV (Semikolon, ISO-Zeitstempel)
+
+    Jeder Block wird formatiert, in den gepufferten Writer geschrieben und
+    geleert; progress erhält den Anteil der bereits geschriebenen Zeit (0..1).
+    Gibt die Anzahl der Datenzeilen zurück.
+    """
+    default_start, default_end = timeseries_range(results)
+    start = start or default_start
+    end = end or default_end
+    span = (end - start).total_seconds() if start and end else 0.0
+
+    header = timeseries_header(results, include_contributions)
+    row_format = ';'.join(['%s'] + ['%.4f'] * (len(header) - 1)) + '\n'
+    written = 0
+
+    with open(file_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(';'.join(header) + '\n')
+        for times, values in iter_timeseries_chunks(results, resolution_seconds, include_contributions,
+                                                    start, end, chunk_rows):
+            stamps = np.datetime_as_string(times, unit='s')
+            f.write(''.join(row_format % (stamp, *row) for stamp, row in zip(stamps.tolist(), values.tolist())))
+            f.flush()
+            written += len(times)
+            if progress is not None:
+                done = (written - 1) * resolution_seconds
+                progress(min(done / span, 1.0) if span > 0 else 1.0)
+    return written